@@ -1,12 +1,16 @@
+import time
+_STARTED = time.perf_counter() # 시작 시간 측정 기준 (bench_startup.py)
 
-from PyQt6.QtCore import Qt, QTimer, QDateTime, QObject, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, QDateTime, QObject, pyqtSignal, QAbstractTableModel, QModelIndex, QStandardPaths
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
+    QTabWidget, QTableView, QHeaderView, QFrame,
     QGroupBox, QGridLayout, QCheckBox, QLineEdit, QSpinBox
 )
+import os
 import sys
+from collections import deque
 
 # 이 파일은 PyQt6로 만든 간단한 데스크탑 UI 예제입니다.
 # 한국어 주석을 추가하여 각 클래스와 주요 메서드의 목적과 동작을 설명합니다.
@@ -19,6 +23,7 @@ class AppController(QObject):
     # 전략 시작/정지 요청을 전달하는 시그널
     startStrategy = pyqtSignal(int)
     stopStrategy = pyqtSignal(int)
+    liquidateStrategy = pyqtSignal(int)
     scheduleUpdated = pyqtSignal(dict)
     settingsSaved = pyqtSignal(object)
 
@@ -29,9 +34,29 @@ class AppController(QObject):
         super().__init__(parent)
         # 현재 실행 중인 전략 번호(없으면 None)
         self._running_strategy: int | None = None
+        # 전략별 이미지 감지 스레드와 이를 함께 먹이는 공유 캡처 서비스
+        self.detectors = {}
+        self.capture = None
+        # 모든 전략이 공유하는 주문 전송 스레드 (전략별 중복 제거, 감지→주문 지연 계측. 쿨다운은 감지 엔진이 적용)
+        self.dispatcher = None
+        # 전략 번호 → 신호화면 좌표(x, y, w, h)를 돌려주는 함수 (MainWindow에서 AdminTab.get_coordinates로 설정)
+        self.region_provider = None
+        # True면 감지(매칭)를 전략별 워커 프로세스에서 실행하고 프레임은 공유 메모리로 전달
+        # (UI 작업이 감지 지연에 영향을 주지 않고, 세 전략이 여러 코어로 나뉨)
+        self.use_worker_process = False
+        # 폴더를 지정하면 감지 스레드 종료 시 단계별 계측 결과를 stats_strat{n}.json으로 저장
+        self.stats_dir = None
+        # 폴더를 지정하면 전략별 감시 영역 프레임을 record_dir/strat{n}_날짜_시각에 기록 (backtest.py로 재평가)
+        self.record_dir = None
+        # 모든 로그 이벤트를 파일로 남기는 저널 (main()에서 EventJournal을 붙임)
+        self.journal = None
+        # 예약실행 탭의 시각으로 전략 시작/종료/청산을 실행하는 스케줄러 (처음 예약이 들어올 때 생성)
+        self.scheduler = None
         # 내부 핸들러 연결: 시그널이 emit되면 해당 메서드가 호출됨
         self.startStrategy.connect(self._on_start_strategy)
         self.stopStrategy.connect(self._on_stop_strategy)
+        self.liquidateStrategy.connect(self._on_liquidate_strategy)
+        self.scheduleUpdated.connect(self._on_schedule_updated)
 
     def now_str(self) -> str:
         # 현재 시간을 'hh:mm:ss' 형식의 문자열로 반환
@@ -43,9 +68,119 @@ class AppController(QObject):
         self.statusChanged.emit(f"★{n}전략 실행중★")
         # 로그는 딕셔너리 형태로 UI가 읽을 수 있게 전달
         self.logAppended.emit({"time": self.now_str(),"strat": f"{n}전략","prog": "시작","result": "실행 시작","note": ""})
+        self._start_detector(n)
+
+    def _start_detector(self, n: int):
+        # 전략 n의 신호화면 영역을 공유 캡처 서비스에 등록하고 감지 스레드 시작
+        det = self.detectors.get(n)
+        if det is not None and det.isRunning():
+            return
+        region = self.region_provider(n) if self.region_provider else None
+        if region is None:
+            self.logAppended.emit({"time": self.now_str(),"strat": f"{n}전략","prog": "감시","result": "좌표 없음","note": f"신호화면{n}"})
+            return
+        # 영상 처리 모듈(cv2 등)은 무거우므로 처음 감시를 시작할 때 불러옴
+        from auto_trade_detector import ImageDetectionThread
+        from capture_service import CaptureService
+        if self.capture is None:
+            self.capture = CaptureService()
+        if self.dispatcher is None:
+            from order_dispatcher import OrderDispatcher
+            self.dispatcher = OrderDispatcher(log=self.logAppended.emit)
+        stats_path = os.path.join(self.stats_dir, f"stats_strat{n}.json") if self.stats_dir else None
+        source = self.capture.add_region(region) # 여러 전략이 한 번의 캡처를 공유
+        if self.record_dir:
+            from frame_archive import RecordingFrameSource
+            session = QDateTime.currentDateTime().toString("yyyyMMdd_hhmmss")
+            source = RecordingFrameSource(source, os.path.join(self.record_dir, f"strat{n}_{session}"))
+        if self.use_worker_process:
+            from detector_worker import ProcessDetector
+            det = ProcessDetector(
+                templates=[{"name": "매수", "template": "buy_signal.png", "hotkey": ['f1'], "threshold": 0.85}],
+                frame_source=source,
+                stats_path=stats_path,
+                dispatcher=self.dispatcher,
+                strategy=f"{n}전략",
+            )
+        else:
+            det = ImageDetectionThread(
+                template_path="buy_signal.png",
+                region=region,
+                hotkey=['f1'], # F1키 매수
+                threshold=0.85,
+                frame_source=source,
+                stats_path=stats_path,
+                dispatcher=self.dispatcher,
+                strategy=f"{n}전략",
+            )
+        det.log_signal.connect(self.logAppended.emit)
+        self.detectors[n] = det
+        det.start()
+
+    def _stop_detector(self, n: int):
+        det = self.detectors.pop(n, None)
+        if det is not None:
+            det.stop()
+
+    def stage_stats(self, n: int | None = None) -> dict:
+        # 실행 중인 감지 스레드의 단계별 소요 시간 {전략 번호: {단계: {"count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}}}
+        dets = self.detectors if n is None else {n: self.detectors[n]} if n in self.detectors else {}
+        return {k: det.stats() for k, det in dets.items()}
+
+    def stats_text(self) -> str:
+        # 상태 영역 표시용 요약: 전략별 캡처/매칭/한 프레임 전체의 p50/p99(ms)
+        from stage_timer import summary_text
+        parts = []
+        for k, snap in sorted(self.stage_stats().items()):
+            text = summary_text(snap, ["capture", "match", "frame"])
+            if text:
+                parts.append(f"{k}전략 {text}")
+        return "\n".join(parts)
+
+    def shutdown(self):
+        # 프로그램 종료 시 모든 감지 스레드와 캡처 서비스 정리
+        for n in list(self.detectors):
+            self._stop_detector(n)
+        if self.capture is not None:
+            self.capture.stop()
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.journal is not None:
+            self.journal.close() # 남은 로그까지 기록 후 종료
+
+    def _on_schedule_updated(self, entries: dict):
+        # 예약 항목 {n: {"run": "HHMMSS", "keep": "HHMMSS", "close": "HHMM", "liquidate": bool}}을 스케줄러 작업으로 반영
+        # 시그널 emit은 스케줄러 스레드에서 일어나지만 컨트롤러 슬롯은 GUI 스레드에서 실행됨(큐 연결)
+        from scheduler import Scheduler, parse_clock
+        if self.scheduler is None:
+            self.scheduler = Scheduler(on_fire=self._on_schedule_fired)
+        for n, e in entries.items():
+            liquidate = e.get("liquidate", False)
+            self.scheduler.set_job(("run", n), parse_clock(e.get("run")), lambda n=n: self.startStrategy.emit(n))
+            self.scheduler.set_job(("keep", n), parse_clock(e.get("keep")), lambda n=n: self.stopStrategy.emit(n))
+            # 청 체크 시 청산 후 종료, 아니면 해당 시각에 종료만
+            signal = self.liquidateStrategy if liquidate else self.stopStrategy
+            self.scheduler.set_job(("close", n), parse_clock(e.get("close")), lambda n=n, sig=signal: sig.emit(n))
+
+    def _on_schedule_fired(self, key, jitter_ms: float):
+        # 예약 실행 로그 (실제 실행 시각과 예정 시각의 차이)
+        kind, n = key
+        self.logAppended.emit({"time": self.now_str(),"strat": f"{n}전략","prog": "예약","result": {"run": "실행", "keep": "종료(유지)", "close": "종료(청)"}[kind],"note": f"오차 {jitter_ms:.1f}ms"})
+
+    def schedule_jitter(self) -> dict:
+        # 예약 작업별 마지막 실행 오차(ms)
+        return dict(self.scheduler.last_jitter) if self.scheduler else {}
+
+    def _on_liquidate_strategy(self, n: int):
+        # 보유계약 청산 요청 후 전략 종료
+        self.logAppended.emit({"time": self.now_str(),"strat": f"{n}전략","prog": "청산","result": "청산 요청","note": ""})
+        self.stopStrategy.emit(n)
 
     def _on_stop_strategy(self, n: int):
         # 요청된 전략이 현재 실행 중이면 실행 상태를 해제
+        self._stop_detector(n)
         if self._running_strategy == n:
             self._running_strategy = None
             self.statusChanged.emit("★대기중★")
@@ -53,33 +188,100 @@ class AppController(QObject):
         self.logAppended.emit({"time": self.now_str(),"strat": f"{n}전략","prog": "종료","result": "정지 요청","note": ""})
 
 
-class LogTable(QTableWidget):
-    def __init__(self, parent=None):
-        super().__init__(0, 5, parent)
-        # 로그 테이블: 시간, 전략, 진행(진.), 결과, 기타(기.) 컬럼
-        self.setHorizontalHeaderLabels(["시간", "전략", "진.", "결과", "기."])
+class LogModel(QAbstractTableModel):
+    # 로그 행을 보관하는 테이블 모델: 최대 max_rows개까지만 유지(오래된 행부터 삭제)
+    # 셀 위젯을 만들지 않고 화면에 보이는 셀만 data()로 그려짐
+    HEADERS = ["시간", "전략", "진.", "결과", "기."]
+
+    def __init__(self, max_rows=5000, parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self._rows = deque()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            # 결과 컬럼(인덱스3)은 왼쪽 정렬, 나머지는 가운데 정렬
+            if index.column() == 3:
+                return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def append_rows(self, rows):
+        # 여러 행을 한 번에 추가 (삭제/삽입 알림도 각각 한 번씩만 발생)
+        rows = rows[-self.max_rows:]
+        if not rows:
+            return
+        overflow = len(self._rows) + len(rows) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+
+class LogTable(QTableView):
+    # 로그 테이블: 시간, 전략, 진행(진.), 결과, 기타(기.) 컬럼
+    # add_row는 대기열에만 쌓고, flush_ms마다 모아서 한 번에 모델에 반영 → 감지 스레드가 로그를 쏟아내도 UI가 멈추지 않음
+    def __init__(self, parent=None, max_rows=5000, flush_ms=100):
+        super().__init__(parent)
+        self.log_model = LogModel(max_rows, self)
+        self.setModel(self.log_model)
         header = self.horizontalHeader()
+        header.setResizeContentsPrecision(0) # 내용 맞춤 폭은 보이는 행만 보고 계산
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        self.verticalHeader().setVisible(False)
+        vheader = self.verticalHeader()
+        vheader.setVisible(False)
+        vheader.setSectionResizeMode(QHeaderView.ResizeMode.Fixed) # 행 높이 고정 (행마다 높이 계산 안 함)
+        vheader.setDefaultSectionSize(self.fontMetrics().height() + 6)
         self.setAlternatingRowColors(True)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.setShowGrid(True)
 
+        self._pending = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
     def add_row(self, time_str, strat, prog, result, note=""):
-        row = self.rowCount()
-        self.insertRow(row)
-        for col, val in enumerate([time_str, strat, prog, result, note]):
-            item = QTableWidgetItem(val)
-            # 결과 컬럼(인덱스3)은 왼쪽 정렬, 나머지는 가운데 정렬
-            align = Qt.AlignmentFlag.AlignCenter if col != 3 else (Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-            item.setTextAlignment(align)
-            self.setItem(row, col, item)
-        self.scrollToBottom()
+        self._pending.append((time_str, strat, prog, result, note))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        # 대기 중인 행을 한 번에 반영. 사용자가 위쪽 기록을 보고 있으면 스크롤 위치를 유지
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum()
+        self.log_model.append_rows(rows)
+        if at_bottom:
+            self.scrollToBottom()
 
 
 class MainTab(QWidget):
@@ -106,6 +308,11 @@ class MainTab(QWidget):
             top.addWidget(b)
 
         lay.addLayout(top)
+        # 감지 단계별 소요 시간 요약 (감시 중일 때만 표시, 1초마다 갱신)
+        self.stats = QLabel("")
+        self.stats.setStyleSheet("color: #666; font-size: 10px;")
+        self.stats.setVisible(False)
+        lay.addWidget(self.stats)
         line = QFrame(); line.setFrameShape(QFrame.Shape.HLine); line.setFrameShadow(QFrame.Shadow.Sunken)
         lay.addWidget(line)
 
@@ -121,11 +328,17 @@ class MainTab(QWidget):
 
         self.controller.statusChanged.connect(self.status.setText)
         self.controller.logAppended.connect(self._append_log)
+        self.stats_timer = QTimer(self); self.stats_timer.timeout.connect(self._update_stats); self.stats_timer.start(1000)
 
         samples = [("08:15:33", "1전략", "감시시작", "0", ""), ("05:29:00", "1전략", "감시종료", "", "")]
         for r in samples:
             self.table.add_row(*r)
 
+    def _update_stats(self):
+        text = self.controller.stats_text() if self.controller.detectors else ""
+        self.stats.setText(text)
+        self.stats.setVisible(bool(text))
+
     def _append_log(self, payload: dict):
         # 컨트롤러에서 전달된 로그 페이로드를 테이블에 추가
         self.table.add_row(payload.get("time",""), payload.get("strat",""), payload.get("prog",""), payload.get("result",""), payload.get("note",""))
@@ -167,17 +380,25 @@ class ScheduleTab(QWidget):
             lbl = QLabel(h); lbl.setStyleSheet("font-weight:600")
             grid.addWidget(lbl, 0, c)
 
+        # 전략 번호 → (실행, 종료(유지), 종료(청) 시각, 청 체크박스)
+        self.rows = {}
+
         # 한 행(row)당 실행시간, 종료(유지) 수치, 종료(청) 시각, 청(체크박스)을 배치하는 내부 함수
         def row_widgets(row_idx: int, name: str):
             grid.addWidget(QLabel(name), row_idx, 0)
             t_exec = QLineEdit(); t_exec.setMaxLength(6); t_exec.setPlaceholderText("HHMMSS")
-            t_keep = QLineEdit(); t_keep.setMaxLength(6)
+            t_keep = QLineEdit(); t_keep.setMaxLength(6); t_keep.setPlaceholderText("HHMMSS")
             t_close = QLineEdit(); t_close.setMaxLength(4); t_close.setPlaceholderText("HHMM")
             cb = QCheckBox()
             grid.addWidget(t_exec, row_idx, 1)
             grid.addWidget(t_keep, row_idx, 2)
             grid.addWidget(t_close, row_idx, 3)
             grid.addWidget(cb, row_idx, 4)
+            self.rows[row_idx] = (t_exec, t_keep, t_close, cb)
+            # 입력을 마치거나 체크를 바꾸면 실행 중에도 예약을 바로 갱신
+            for le in (t_exec, t_keep, t_close):
+                le.editingFinished.connect(lambda n=row_idx: self._emit_schedule(n))
+            cb.toggled.connect(lambda _, n=row_idx: self._emit_schedule(n))
 
         row_widgets(1, "1전략")
         row_widgets(2, "2전략")
@@ -196,6 +417,14 @@ class ScheduleTab(QWidget):
         root.addWidget(hts_box)
         root.addStretch(1)
 
+    def schedule(self, n: int) -> dict:
+        # 전략 n의 예약 항목 (빈 칸은 예약 없음)
+        t_exec, t_keep, t_close, cb = self.rows[n]
+        return {"run": t_exec.text(), "keep": t_keep.text(), "close": t_close.text(), "liquidate": cb.isChecked()}
+
+    def _emit_schedule(self, n: int):
+        self.controller.scheduleUpdated.emit({n: self.schedule(n)})
+
 
 class SettingsTab(QWidget):
     def __init__(self, controller: AppController, parent=None):
@@ -245,10 +474,15 @@ class AdminTab(QWidget):
         grid.addWidget(QLabel("LimitSP"), 0, 0)
         self.le_limit = QLineEdit("100"); grid.addWidget(self.le_limit, 0, 1)
 
+        # 화면 좌표 입력칸: {"주문화면1": [X, Y, W, H, 기타], ...}
+        self.coord_edits = {}
+
         def row(label: str, r: int):
             grid.addWidget(QLabel(label), r, 0)
+            edits = []
             for c in range(1, 6):
-                grid.addWidget(QLineEdit(), r, c)
+                le = QLineEdit(); grid.addWidget(le, r, c); edits.append(le)
+            self.coord_edits[label] = edits
 
         headers = ["X", "Y", "W", "H"]
         for i, h in enumerate(headers, start=1):
@@ -257,6 +491,18 @@ class AdminTab(QWidget):
 
         root.addWidget(auth_box); root.addWidget(cfg_box); root.addStretch(1)
 
+    def get_coordinates(self, key: str):
+        # "strat1_signal" → 신호화면1, "strat2_order" → 주문화면2 의 (x, y, w, h). 비어있거나 잘못되면 None
+        n, kind = key.replace("strat", "").split("_")
+        label = ("신호화면" if kind == "signal" else "주문화면") + n
+        try:
+            x, y, w, h = (int(le.text()) for le in self.coord_edits[label][:4])
+        except (KeyError, ValueError):
+            return None
+        if w <= 0 or h <= 0:
+            return None
+        return (x, y, w, h)
+
 
 class MainWindow(QWidget):
     def __init__(self):
@@ -276,14 +522,18 @@ class MainWindow(QWidget):
         self.date_label.setFont(QFont("Helvetica", 12))
         root.addWidget(self.time_label); root.addWidget(self.date_label)
 
-        tabs = QTabWidget()
+        self.tabs = QTabWidget()
         # 탭 추가(메인, 전략, 예약실행, 설정, 관리자)
-        tabs.addTab(MainTab(self.controller), "메인")
-        tabs.addTab(StrategyTab(self.controller), "전략설정")
-        tabs.addTab(ScheduleTab(self.controller), "예약실행")
-        tabs.addTab(SettingsTab(self.controller), "설정")
-        tabs.addTab(AdminTab(self.controller), "관리자")
-        root.addWidget(tabs, 1)
+        # 시작 속도를 위해 메인 탭만 바로 만들고, 나머지는 빈 자리만 두었다가 처음 볼 때 생성
+        self._tab_classes = [(MainTab, "메인"), (StrategyTab, "전략설정"), (ScheduleTab, "예약실행"),
+                             (SettingsTab, "설정"), (AdminTab, "관리자")]
+        self._built = {}
+        for i, (cls, label) in enumerate(self._tab_classes):
+            self.tabs.addTab(QWidget() if i else self.tab(0), label)
+        self.tabs.currentChanged.connect(self.tab)
+        root.addWidget(self.tabs, 1)
+        # 좌표는 관리자 탭에 있으므로 필요할 때 탭을 만들어서 읽음
+        self.controller.region_provider = lambda n: self.tab_admin.get_coordinates(f"strat{n}_signal")
 
         btn_bar = QHBoxLayout()
         for label in ["저장", "원격", "화면", "설명", "종료"]:
@@ -291,6 +541,39 @@ class MainWindow(QWidget):
         root.addLayout(btn_bar)
 
         self.timer = QTimer(self); self.timer.timeout.connect(self.update_clock); self.timer.start(1000); self.update_clock()
+        self.first_paint = None # 첫 화면 표시 시각 (time.perf_counter)
+
+    def tab(self, index: int) -> QWidget:
+        # index번 탭 위젯 (아직 만들지 않았으면 지금 만들어 빈 자리와 교체)
+        widget = self._built.get(index)
+        if widget is None:
+            cls, label = self._tab_classes[index]
+            widget = self._built[index] = cls(self.controller)
+            if self.tabs.count() > index: # 생성자에서 메인 탭을 만들 때는 아직 자리가 없음
+                current = self.tabs.currentIndex()
+                self.tabs.blockSignals(True)
+                placeholder = self.tabs.widget(index)
+                self.tabs.removeTab(index)
+                self.tabs.insertTab(index, widget, label)
+                self.tabs.setCurrentIndex(current)
+                self.tabs.blockSignals(False)
+                placeholder.deleteLater()
+        return widget
+
+    @property
+    def tab_admin(self):
+        return self.tab(4)
+
+    @property
+    def tab_schedule(self):
+        return self.tab(2)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint is None:
+            self.first_paint = time.perf_counter()
+            # 첫 화면을 그린 뒤 영상 처리 모듈을 백그라운드에서 미리 불러옴 (첫 전략 시작 지연 감소)
+            QTimer.singleShot(0, preload_vision)
 
     def update_clock(self):
         now = QDateTime.currentDateTime()
@@ -299,9 +582,56 @@ class MainWindow(QWidget):
         self.date_label.setText(now.toString(f"yyyy.MM.dd({day_ko})"))
 
 
+def preload_vision():
+    # cv2/numpy/mss 및 감지 모듈을 백그라운드 스레드에서 import (전략 시작 시 import 대기를 없앰)
+    # 시작 전에 전략을 누르면 import 잠금 때문에 끝날 때까지 기다렸다가 진행됨
+    import threading
+
+    def load():
+        try:
+            import auto_trade_detector, capture_service # noqa: F401
+            import mss # noqa: F401
+        except ImportError as e:
+            print(f"영상 처리 모듈 미리 불러오기 실패: {e}")
+
+    threading.Thread(target=load, name="PreloadVision", daemon=True).start()
+
+
+def report_startup(win, app):
+    # bench_startup.py용: 첫 화면 표시까지의 구간별 시간을 JSON 한 줄로 출력하고 종료
+    import json
+
+    def check():
+        if win.first_paint is None:
+            QTimer.singleShot(1, check)
+            return
+        print(json.dumps({"wall": time.time(), "first_paint_ms": (win.first_paint - _STARTED) * 1000.0,
+                          "shown_ms": (win.constructed - _STARTED) * 1000.0}), flush=True)
+        app.quit()
+
+    QTimer.singleShot(0, check)
+
+
+def journal_dir() -> str:
+    # 이벤트 저널 폴더: --journal-dir 경로, 없으면 사용자 데이터 폴더/journal (실행 위치와 무관)
+    # 예: Windows %LOCALAPPDATA%/futures/journal, 리눅스 ~/.local/share/futures/journal
+    if "--journal-dir" in sys.argv[:-1]:
+        return sys.argv[sys.argv.index("--journal-dir") + 1]
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+    return os.path.join(base, "journal")
+
+
 def main():
     app = QApplication(sys.argv)
+    app.setApplicationName("futures") # 사용자 데이터 폴더 이름
     win = MainWindow(); win.show()
+    win.constructed = time.perf_counter()
+    if "--startup-report" in sys.argv:
+        report_startup(win, app) # 시작 시간 측정만 하므로 저널은 만들지 않음
+    else:
+        from event_journal import EventJournal
+        win.controller.journal = EventJournal(journal_dir()).attach(win.controller) # 로그를 events-날짜-번호.log에 기록
+    app.aboutToQuit.connect(win.controller.shutdown)
     sys.exit(app.exec())
 
 
@@ -1,115 +1,366 @@
+import argparse
+import json
+import os
+import sys
+import threading
 import time
-import cv2
-import numpy as np
-import pyautogui
-import mss # 고속 캡처 라이브러리
 from PyQt6.QtCore import QThread, pyqtSignal
 
-# 윈도우 활성화를 위한 API
-import win32gui, win32con
+from frame_source import MssFrameSource
+from multi_monitor import MultiMonitorEngine, MultiMonitorFrameSource, parse_monitors
+from matcher import MATCH_EXHAUSTIVE, MATCH_MODES
+from fft_match import FFT_MODES, FFT_OFF
+from detection_engine import DetectionEngine, TemplateSpec
+from rate_controller import RateController
+from stage_timer import StageTimer
+from order_dispatcher import OrderDispatcher, PyAutoGuiSender, StubSender, WindowFocuser
+
+
+def detection_loop(det, on_reload, on_detect, on_error):
+    """캡처 → 매칭 → 주문 요청 → 대기 루프 (ImageDetectionThread/HeadlessDetector 공용)
+
+    det: frame_source/engine/rate/dispatcher/timer/strategy/is_running/frames/stop_event 속성을 가진 감지기
+    대기는 det.stop_event.wait()로 하므로 stop()에서 stop_event를 설정하면 바로 깨어남
+    on_reload(경로), on_detect(결과 목록, 발사한 결과 목록), on_error(예외): 이벤트 출력 콜백
+    """
+    timer = det.timer
+    with det.frame_source as source: # 기본은 mss 사용으로 속도 향상
+        while det.is_running:
+            try:
+                t0 = time.perf_counter()
+                t_ns = start_ns = timer.now()
+                # 1. 고속 화면 캡처 (틱당 한 번, 모든 템플릿이 공유)
+                img_np = source.grab()
+                if img_np is None: # 재생/합성 소스의 프레임 소진
+                    break
+                t_ns = timer.lap("capture", t_ns)
+
+                # 2. 모든 템플릿을 같은 프레임에 대해 멀티 스케일 매칭
+                results = det.engine.process(img_np)
+                timer.lap("process", t_ns)
+                det.frames += 1
+                for path in det.engine.reloaded:
+                    on_reload(path)
+
+                fired = [r for r in results or [] if r["fire"]]
+                if fired:
+                    on_detect(results, fired)
+                    # 3. 주문 전송 요청 (창 활성화/키 입력은 주문 전송 스레드에서 처리 → 감지 루프는 막히지 않음)
+                    # 창 활성화는 전송기의 WindowFocuser가 처리 (창 핸들 캐시, 관리자 권한 필수)
+                    t_ns = timer.now()
+                    detected_at = source.frame_time or t0
+                    for r in fired:
+                        det.dispatcher.submit(det.strategy, r["name"], r["hotkey"], detected_at, r)
+                    timer.lap("hotkey", t_ns)
+                timer.lap("frame", start_ns)
+
+                # CPU 점유율 낮추기: 처리 시간을 뺀 나머지만 대기
+                near = det.engine.closeness >= det.rate.near_ratio
+                delay = det.rate.next_delay(time.perf_counter() - t0, results is not None, near)
+                if delay > 0:
+                    det.stop_event.wait(delay)
+
+            except Exception as e:
+                on_error(e)
+                det.engine.reset()
+                det.stop_event.wait(det.rate.error_wait()) # 오류 대기(최대 수 초) 중에도 stop()이면 바로 종료
+    det.engine.close()
+
 
 class ImageDetectionThread(QThread):
     # 로그 메시지와 상태를 본체(GUI)로 보내는 신호
     log_signal = pyqtSignal(dict) 
     
-    def __init__(self, template_path, region, hotkey, scales=[0.9, 1.0, 1.1], threshold=0.87, target_window_name="주문"):
+    def __init__(self, template_path=None, region=None, hotkey=None, scales=[0.9, 1.0, 1.1], threshold=0.87, target_window_name="주문", frame_source=None,
+                 hotkey_sender=None, cooldown=3.0, interval=0.2, grayscale=False, match_mode=MATCH_EXHAUSTIVE,
+                 change_gate=False, diff_tile=32, templates=None, scale_workers=0, roi_window=0, roi_decay=0.8,
+                 color_prefilter=False, stats_path=None, dispatcher=None, strategy="이미지", fft=FFT_OFF, monitors=None):
         super().__init__()
         self.template_path = template_path
         self.region = region # (x, y, w, h) 또는 None
         self.hotkey = hotkey # 예: ['f1'] 또는 ['ctrl', '1']
         self.scales = scales
         self.threshold = threshold
-        self.target_window_name = target_window_name # 활성화할 창 이름
+        self.target_window_name = target_window_name # 주문 전에 활성화할 창 이름 (None이면 창 전환 없음)
         self.is_running = True
-        self.cooldown = 3.0 # 중복 주문 방지 대기 시간
-        
-        # 템플릿 이미지 미리 로드
-        self.template = cv2.imread(template_path)
-        if self.template is None:
-            print(f"이미지 로드 실패: {template_path}")
+        self.stop_event = threading.Event() # stop()이 설정 → 감지 루프의 대기를 깨움
+        self.frames = 0 # 처리한 프레임 수
+        self.cooldown = cooldown # 중복 주문 방지 대기 시간
+        self.interval = interval # 목표 프레임 간격(초). 0이면 대기 없이 최대 속도
+        # 적응형 폴링: 처리 시간을 뺀 만큼만 대기, 변화 없으면 간격을 늘리고 점수가 threshold에 가까우면 조임
+        # 달성 fps 등은 self.rate.stats()로 확인
+        self.rate = RateController(interval)
+        # 프레임 공급자 (없으면 mss 실시간 캡처). 재생/합성 소스를 넣으면 화면 없이도 구동 가능
+        # monitors("all" 또는 [1, 2])를 주면 모니터별로 캡처해 병렬 매칭 (region은 가상 데스크톱 좌표로 각 모니터를 자름)
+        if frame_source is None:
+            frame_source = MultiMonitorFrameSource(monitors, region) if monitors is not None else MssFrameSource(region)
+        self.frame_source = frame_source
+        # 단축키 전송 함수 (없으면 pyautogui.hotkey, PAUSE=0). 벤치마크/테스트에서는 스텁을 넣어 사용
+        self.hotkey_sender = hotkey_sender if hotkey_sender is not None else PyAutoGuiSender()
+        # 주문 전송기: 감지 루프는 큐에 넣기만 하고 키 입력은 전송 스레드에서 처리
+        # 여러 전략이 하나를 공유하려면 dispatcher를 넘김 (이 경우 종료는 소유자가 담당)
+        self.strategy = strategy # 주문 중복 제거/쿨다운 단위 (전략, 템플릿)의 전략 이름
+        self._own_dispatcher = dispatcher is None
+        # 쿨다운은 엔진(DetectionEngine.last_trigger)이 템플릿별로 적용하므로 전송기는 중복 제거와 창 전환만 담당
+        focuser = WindowFocuser(target_window_name) if target_window_name else None
+        self.dispatcher = dispatcher if dispatcher is not None else OrderDispatcher(
+            self.hotkey_sender, focuser=focuser, log=self.log_signal.emit)
+        # 단계별 소요 시간 계측 (capture/grab/copy/diff/convert/resize/match/hotkey/frame)
+        # self.stats()로 언제든 조회, stats_path를 주면 종료 시 JSON으로 저장
+        self.timer = StageTimer()
+        self.frame_source.timer = self.timer
+        self.stats_path = stats_path
+
+        # 감시할 템플릿 목록: templates=[TemplateSpec 또는 dict, ...]로 매수/매도 등을 한 번의 캡처로 함께 감시
+        # 지정하지 않으면 template_path/hotkey/scales/threshold로 템플릿 하나를 감시 (기존 방식)
+        if templates is None:
+            templates = [TemplateSpec("이미지", template_path, hotkey, threshold, scales)]
+        specs = [t if isinstance(t, TemplateSpec) else TemplateSpec.from_dict(t) for t in templates]
+
+        # 템플릿 이미지 미리 로드 (스케일별 변형은 캐시에서 한 번만 생성, 파일이 다시 캡처되면 자동 재로드)
+        # grayscale=True면 그레이스케일로 매칭 (채널 1개라 더 빠름)
+        # match_mode="pyramid"면 축소 화면으로 후보를 찾고 원본 해상도로 확인 (전체 화면 캡처 시 유리)
+        # change_gate=True면 이전 프레임과 같을 때 매칭 생략, 바뀐 타일 주변만 매칭
+        # scale_workers>0이면 직전 감지 스케일을 먼저 시도한 뒤 나머지 스케일을 스레드 풀에서 병렬 평가
+        # roi_window>0이면 최근 감지 위치 주변 roi_window(px) 창을 먼저 찾고, 못 찾을 때만 전체 영역 탐색
+        # color_prefilter=True면 템플릿의 주요 색 덩어리가 있는 후보 영역에서만 매칭
+        # fft="on"이면 영역 전체 매칭을 주파수 영역 NCC로, "auto"면 크기별 실측 시간으로 공간/FFT 중 빠른 쪽 선택
+        engine_opts = dict(grayscale=grayscale, match_mode=match_mode, cooldown=cooldown, change_gate=change_gate,
+                           diff_tile=diff_tile, scale_workers=scale_workers, roi_window=roi_window, roi_decay=roi_decay,
+                           color_prefilter=color_prefilter, fft=fft)
+        if isinstance(self.frame_source, MultiMonitorFrameSource):
+            # 모니터별 엔진을 병렬 평가, 감지 좌표는 전역(가상 데스크톱) 좌표, 모니터별 시간은 grab@N/process@N
+            self.engine = MultiMonitorEngine(specs, timer=self.timer, **engine_opts)
+        else:
+            self.engine = DetectionEngine(specs, timer=self.timer, **engine_opts)
+        for path in self.engine.failed:
+            print(f"이미지 로드 실패: {path}")
+        if not self.engine.specs:
             self.is_running = False
 
-    def focus_window(self):
-        """주문 창을 찾아 맨 앞으로 가져옴"""
-        hwnd = win32gui.FindWindow(None, self.target_window_name) # 정확한 창 이름 필요 (또는 EnumWindows로 검색)
-        if hwnd:
+    def run(self):
+        self.log_signal.emit({"time": "시스템", "strat": "감시", "prog": "시작", "result": "스레드ON", "note": ""})
+        detection_loop(self, self._on_reload, self._on_detect, self._on_error)
+        if self._own_dispatcher:
+            self.dispatcher.close()
+        if self.stats_path:
             try:
-                if win32gui.IsIconic(hwnd): # 최소화 되어있으면 복구
-                    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                win32gui.SetForegroundWindow(hwnd)
-                time.sleep(0.1) # 창이 뜨는 딜레이 확보
-                return True
-            except:
-                pass
-        return False
+                self.timer.dump(self.stats_path, {"rate": self.rate.stats(), "dispatch": self.dispatcher.stats()})
+            except OSError as e:
+                print(f"계측 저장 실패: {e}")
+
+    def _on_reload(self, path):
+        self.log_signal.emit({"time": "시스템", "strat": self.strategy, "prog": "템플릿", "result": "재로드", "note": path})
+
+    def _on_detect(self, results, fired):
+        # 매칭 성공 로그 (템플릿별 결과를 한 이벤트로 전달)
+        single = len(self.engine.specs) == 1
+        best = max(fired, key=lambda r: r["score"])
+        self.log_signal.emit({
+            "time": "감지", 
+            "strat": self.strategy, 
+            "prog": f"정확도{best['score']:.2f}", 
+            "result": "발견" if single else "발견:" + ",".join(r["name"] for r in fired), 
+            "note": " / ".join(f"배율:{r['scale']}" if single else f"{r['name']} 배율:{r['scale']}" for r in fired),
+            "hits": results,
+        })
+
+    def _on_error(self, e):
+        self.log_signal.emit({"time": "에러", "strat": self.strategy, "prog": "예외", "result": "중단", "note": str(e)})
+
+    def stats(self):
+        """단계별 소요 시간 스냅샷 {단계: {"count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}} (주문 전송 지연 포함)"""
+        return {**self.timer.snapshot(), **self.dispatcher.timer.snapshot()}
+
+    def stop(self):
+        self.is_running = False
+        self.stop_event.set()
+        self.frame_source.interrupt() # 공유 캡처 프레임을 기다리는 중이면 깨움
+        self.wait()
+
+# ---------------------------------------------------------------------------
+# 헤드리스 실행 (QApplication/이벤트 루프 없이 DetectionEngine만 사용)
+# README의 python auto_trade_detector.py --template ... 형식과 --config(여러 템플릿/영역) 지원
+# 감지/주문/처리량 이벤트는 한 줄에 하나씩 JSON으로 stdout에 출력
+
+
+class HeadlessDetector(threading.Thread):
+    """Qt 없이 도는 감지기 (ImageDetectionThread와 같은 detection_loop 사용, 이벤트는 JSON dict로 출력)"""
+
+    def __init__(self, name, frame_source, engine, rate, dispatcher, emit):
+        super().__init__(name=f"Detector-{name}", daemon=True)
+        self.detector_name = name
+        self.strategy = name # 주문 중복 제거/쿨다운 단위의 전략 이름
+        self.frame_source = frame_source
+        self.engine = engine
+        self.rate = rate
+        self.dispatcher = dispatcher
+        self.emit = emit # dict를 받아 출력하는 함수
+        self.timer = engine.timer
+        self.frame_source.timer = self.timer
+        self.frames = 0
+        self.hits = 0
+        self.is_running = True
+        self.stop_event = threading.Event()
 
     def run(self):
-        self.log_signal.emit({"time": "시스템", "strat": "감시", "prog": "시작", "result": "스레드ON", "note": ""})
-        
-        with mss.mss() as sct: # mss 사용으로 속도 향상
-            last_trigger_time = 0
-            
-            while self.is_running:
-                try:
-                    # 1. 고속 화면 캡처
-                    if self.region:
-                        monitor = {"top": self.region[1], "left": self.region[0], "width": self.region[2], "height": self.region[3]}
-                        img_np = np.array(sct.grab(monitor))
-                    else:
-                        img_np = np.array(sct.grab(sct.monitors[1])) # 전체 화면
-
-                    # mss는 BGRA를 반환하므로 BGR로 변환 (OpenCV용)
-                    screen_img = cv2.cvtColor(img_np, cv2.COLOR_BGRA2BGR)
-
-                    # 2. 멀티 스케일 매칭
-                    found = False
-                    h_t, w_t = self.template.shape[:2]
-
-                    for scale in self.scales:
-                        # 리사이징 (속도 최적화를 위해 너무 작거나 큰 스케일 제외 가능)
-                        curr_w, curr_h = int(w_t * scale), int(h_t * scale)
-                        if curr_w < 10 or curr_h < 10: continue
-
-                        resized_tpl = cv2.resize(self.template, (curr_w, curr_h))
-                        
-                        # 템플릿 매칭 수행
-                        res = cv2.matchTemplate(screen_img, resized_tpl, cv2.TM_CCOEFF_NORMED)
-                        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-
-                        if max_val >= self.threshold:
-                            now = time.time()
-                            if (now - last_trigger_time) > self.cooldown:
-                                found = True
-                                # 매칭 성공 로그
-                                self.log_signal.emit({
-                                    "time": "감지", 
-                                    "strat": "이미지", 
-                                    "prog": f"정확도{max_val:.2f}", 
-                                    "result": "발견", 
-                                    "note": f"배율:{scale}"
-                                })
-
-                                # 3. 창 활성화 및 주문 전송
-                                # 주의: 여기서 창 활성화 로직을 수행하거나, 메인 스레드로 요청해야 안전함
-                                # 간단한 구현을 위해 여기서 수행 (관리자 권한 필수)
-                                
-                                # pyautogui.hotkey(*self.hotkey) # 창 활성화 없이 누르기 (위험)
-                                
-                                # 안전한 방식: 창 찾기 시도 -> 키 입력
-                                # 실제 사용 시에는 창 이름을 정확히 설정해야 합니다.
-                                # self.focus_window() 
-                                pyautogui.hotkey(*self.hotkey)
-                                
-                                last_trigger_time = now
-                            break # 스케일 루프 탈출
-                    
-                    if not found:
-                        time.sleep(0.2) # CPU 점유율 낮추기
-                    
-                except Exception as e:
-                    self.log_signal.emit({"time": "에러", "strat": "이미지", "prog": "예외", "result": "중단", "note": str(e)})
-                    time.sleep(1)
+        detection_loop(self, self._on_reload, self._on_detect, self._on_error)
+
+    def _on_reload(self, path):
+        self.emit({"event": "reload", "detector": self.detector_name, "template": path})
+
+    def _on_detect(self, results, fired):
+        self.hits += len(fired)
+        self.emit({"event": "detect", "detector": self.detector_name, "ts": time.time(),
+                   "hits": [{k: r[k] for k in ("name", "score", "scale", "loc", "monitor") if k in r} for r in fired]})
+
+    def _on_error(self, e):
+        self.emit({"event": "error", "detector": self.detector_name, "error": str(e)})
 
     def stop(self):
         self.is_running = False
-        self.wait()
\ No newline at end of file
+        self.stop_event.set()
+        self.frame_source.interrupt()
+
+    def stats(self):
+        snap = self.timer.snapshot()
+        return {"event": "stats", "detector": self.detector_name, "frames": self.frames, "hits": self.hits,
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.rate.stats().items()},
+                "p50_ms": {k: round(v["p50_ms"], 2) for k, v in snap.items()},
+                "p99_ms": {k: round(v["p99_ms"], 2) for k, v in snap.items()}}
+
+
+def parse_region(text):
+    """"x,y,w,h" → (x, y, w, h)"""
+    return tuple(int(v) for v in text.split(","))
+
+
+def load_detector_configs(args):
+    """명령행 또는 --config JSON → 감지기 설정 목록
+
+    config 형식:
+    {"interval": 0.2, "cooldown": 3.0,
+     "detectors": [{"name": "1전략", "region": [x, y, w, h], "monitors": "all" 또는 [1, 2] (선택),
+                    "templates": [{"name": "buy", "template": "buy_signal.png", "hotkey": "f1", "threshold": 0.85}],
+                    "options": {"grayscale": true, "match_mode": "pyramid", "fft": "auto"}}]}
+    """
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            cfg = json.load(f)
+        defaults = {"interval": cfg.get("interval", args.interval), "cooldown": cfg.get("cooldown", args.cooldown)}
+        out = []
+        for i, d in enumerate(cfg["detectors"]):
+            region = d.get("region")
+            out.append({"name": d.get("name", f"detector{i + 1}"), "region": tuple(region) if region else None,
+                        "monitors": d.get("monitors"), "templates": d["templates"], "options": d.get("options", {}),
+                        "interval": d.get("interval", defaults["interval"]), "cooldown": d.get("cooldown", defaults["cooldown"])})
+        return out
+    if not args.template:
+        sys.exit("--template 또는 --config가 필요합니다")
+    return [{"name": "이미지", "region": parse_region(args.region) if args.region else None,
+             "monitors": parse_monitors(args.monitors) if args.monitors else None, "templates": [{"name": "이미지", "template": args.template, "hotkey": args.hotkey,
+                            "threshold": args.threshold, "scales": [float(v) for v in args.scales.split(",")]}],
+             "options": {"grayscale": args.grayscale, "match_mode": args.match_mode, "fft": args.fft},
+             "interval": args.interval, "cooldown": args.cooldown}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 이미지 감지기")
+    parser.add_argument("--template", default=None, help="템플릿 이미지")
+    parser.add_argument("--hotkey", default="f1", help='감지 시 보낼 단축키 (예: "ctrl+alt+1")')
+    parser.add_argument("--threshold", type=float, default=0.87)
+    parser.add_argument("--scales", default="0.9,1.0,1.1")
+    parser.add_argument("--cooldown", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.2)
+    parser.add_argument("--region", default=None, help='감시 영역 "x,y,w,h" (없으면 전체 화면)')
+    parser.add_argument("--monitors", default=None, help='모니터별 캡처/병렬 매칭 "all" 또는 "1,2" (--region은 전역 좌표로 자름)')
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--match-mode", default=MATCH_EXHAUSTIVE, choices=MATCH_MODES, help="exhaustive 또는 pyramid")
+    parser.add_argument("--fft", default=FFT_OFF, choices=FFT_MODES, help="주파수 영역 매칭 (auto면 크기별 실측으로 선택)")
+    parser.add_argument("--config", default=None, help="여러 템플릿/영역 설정 JSON")
+    parser.add_argument("--replay", default=None, help="화면 대신 재생할 PNG 폴더/동영상/기록 세션")
+    parser.add_argument("--dry-run", action="store_true", help="단축키를 실제로 보내지 않음")
+    parser.add_argument("--stats-every", type=float, default=5.0, help="처리량 통계 출력 주기(초), 0이면 끔")
+    parser.add_argument("--duration", type=float, default=0, help="지정한 초 후 종료 (0이면 Ctrl+C까지)")
+    args = parser.parse_args()
+
+    configs = load_detector_configs(args)
+    out_lock = threading.Lock()
+
+    def emit(event):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with out_lock:
+            print(line, flush=True)
+
+    # 쿨다운은 감지기별 엔진이 각 설정의 cooldown으로 적용 (공유 전송기는 중복 제거만 함)
+    dispatcher = OrderDispatcher(StubSender() if args.dry_run else PyAutoGuiSender(),
+                                 log=lambda d: emit({"event": "order", "detector": d["strat"], "keys": d["prog"],
+                                                     "result": d["result"], "note": d["note"]}))
+
+    # 프레임 소스: 재생 > 여러 영역이면 공유 캡처 > mss 직접 캡처
+    capture = None
+    if not args.replay and len(configs) > 1:
+        from capture_service import CaptureService
+        capture = CaptureService() # 감지기가 grab()할 때만 캡처하므로 각자의 interval을 따름
+
+    def make_source(cfg):
+        if args.replay:
+            if os.path.exists(os.path.join(args.replay, "index.bin")):
+                from frame_archive import ArchiveFrameSource
+                return ArchiveFrameSource(args.replay)
+            from frame_source import ReplayFrameSource
+            return ReplayFrameSource(args.replay)
+        if cfg["monitors"] is not None:
+            return MultiMonitorFrameSource(cfg["monitors"], cfg["region"])
+        if capture is not None and cfg["region"]:
+            return capture.add_region(cfg["region"])
+        return MssFrameSource(cfg["region"])
+
+    detectors = []
+    for cfg in configs:
+        specs = [TemplateSpec.from_dict(t) for t in cfg["templates"]]
+        if cfg["monitors"] is not None and not args.replay:
+            engine = MultiMonitorEngine(specs, cooldown=cfg["cooldown"], timer=StageTimer(), **cfg["options"])
+        else:
+            engine = DetectionEngine(specs, cooldown=cfg["cooldown"], timer=StageTimer(), **cfg["options"])
+        for path in engine.failed:
+            emit({"event": "error", "detector": cfg["name"], "error": f"이미지 로드 실패: {path}"})
+        if not engine.specs:
+            continue
+        detectors.append(HeadlessDetector(cfg["name"], make_source(cfg), engine, RateController(cfg["interval"]),
+                                          dispatcher, emit))
+    if not detectors:
+        sys.exit(1)
+
+    for det in detectors:
+        det.start()
+    emit({"event": "start", "detectors": [d.detector_name for d in detectors]})
+    started = time.monotonic()
+    next_stats = started + args.stats_every if args.stats_every > 0 else None
+    try:
+        while any(d.is_alive() for d in detectors):
+            if args.duration and time.monotonic() - started >= args.duration:
+                break
+            if next_stats is not None and time.monotonic() >= next_stats:
+                for det in detectors:
+                    emit(det.stats())
+                next_stats += args.stats_every
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for det in detectors:
+            det.stop()
+        for det in detectors:
+            det.join(timeout=2.0)
+        if capture is not None:
+            capture.stop()
+        dispatcher.close()
+        for det in detectors:
+            emit(det.stats())
+        emit({"event": "stop", "elapsed_s": round(time.monotonic() - started, 3),
+              "orders": {k: v for k, v in dispatcher.stats().items() if k != "stages"}})
+
+
+if __name__ == "__main__":
+    main()
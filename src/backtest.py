@@ -0,0 +1,137 @@
+"""
+backtest.py
+- FrameRecorder로 기록한 세션(frames.bin + index.bin)을 감지기와 같은 매칭 코드(DetectionEngine)로 오프라인 재평가
+- 프레임 구간을 여러 프로세스에 나눠 CPU가 허용하는 최대 속도로 처리
+- 감지(threshold 이상)된 모든 프레임의 템플릿/점수/배율/위치/기록 시각을 보고하고,
+  쿨다운을 적용했을 때 실제로 주문이 나갔을 감지(fire)도 표시
+- Usage:
+    python backtest.py sessions/20251014_0900 --template buy_signal.png --threshold 0.85 --scales 0.9,1.0,1.1
+    python backtest.py sessions/20251014_0900 --config templates.json --workers 4 --out hits.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fft_match import FFT_MODES, FFT_OFF
+from frame_archive import FrameArchive
+from matcher import MATCH_EXHAUSTIVE, MATCH_MODES
+
+
+def run_range(path, specs, engine_opts, start, stop):
+    """워커 프로세스: [start, stop) 구간 프레임을 평가 → (감지 목록, 템플릿별 최고 점수, 처리 프레임 수)"""
+    from detection_engine import DetectionEngine, TemplateSpec
+
+    archive = FrameArchive(path)
+    opts = dict(engine_opts)
+    opts["cooldown"] = 0.0 # 쿨다운은 전체 결과를 합친 뒤 시간순으로 적용
+    engine = DetectionEngine([TemplateSpec.from_dict(d) for d in specs], **opts)
+    hits = []
+    best = {}
+    try:
+        for i in range(start, min(stop, len(archive))):
+            results = engine.process(archive.read(i), now=0.0)
+            for r in results or []:
+                if r["best"] > best.get(r["name"], -1.0):
+                    best[r["name"]] = r["best"]
+                if r["hit"]:
+                    hits.append({"frame": i, "ts": float(archive.index[i]["ts"]), "name": r["name"],
+                                 "score": float(r["score"]), "scale": r["scale"], "loc": list(r["loc"])})
+    finally:
+        engine.close()
+    return hits, best, max(0, min(stop, len(archive)) - start)
+
+
+def apply_cooldown(hits, cooldown):
+    """시간순 감지 목록에 템플릿별 쿨다운을 적용해 fire 표시 (감지 스레드와 같은 규칙)"""
+    last = {}
+    for h in hits:
+        prev = last.get(h["name"])
+        h["fire"] = prev is None or (h["ts"] - prev) > cooldown
+        if h["fire"]:
+            last[h["name"]] = h["ts"]
+    return hits
+
+
+def backtest(path, specs, workers=None, chunk=500, cooldown=3.0, **engine_opts):
+    """세션 전체를 재평가한 보고서 dict"""
+    total = len(FrameArchive(path))
+    workers = workers or os.cpu_count() or 1
+    ranges = [(s, min(s + chunk, total)) for s in range(0, total, chunk)]
+    t0 = time.perf_counter()
+    hits, best, frames = [], {}, 0
+    if workers == 1:
+        parts = [run_range(path, specs, engine_opts, s, e) for s, e in ranges]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(run_range, path, specs, engine_opts, s, e) for s, e in ranges]
+            parts = [f.result() for f in futures]
+    for part_hits, part_best, n in parts:
+        hits.extend(part_hits)
+        frames += n
+        for name, score in part_best.items():
+            best[name] = max(best.get(name, -1.0), score)
+    elapsed = time.perf_counter() - t0
+    hits.sort(key=lambda h: (h["ts"], h["frame"]))
+    apply_cooldown(hits, cooldown)
+    return {
+        "session": path,
+        "frames": frames,
+        "elapsed_s": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+        "templates": specs,
+        "options": engine_opts,
+        "best": best,
+        "hit_count": len(hits),
+        "fire_count": sum(1 for h in hits if h["fire"]),
+        "hits": hits,
+    }
+
+
+def parse_list(text, conv):
+    return [conv(v) for v in text.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("session", help="FrameRecorder 세션 폴더")
+    parser.add_argument("--template", default="buy_signal.png")
+    parser.add_argument("--threshold", type=float, default=0.87)
+    parser.add_argument("--scales", default="0.9,1.0,1.1")
+    parser.add_argument("--config", default=None, help='템플릿 목록 JSON ([{"name", "template", "threshold", "scales"}, ...])')
+    parser.add_argument("--cooldown", type=float, default=3.0)
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--match-mode", default=MATCH_EXHAUSTIVE, choices=MATCH_MODES, help="exhaustive 또는 pyramid")
+    parser.add_argument("--fft", default=FFT_OFF, choices=FFT_MODES, help="주파수 영역 매칭 (auto면 크기별 실측으로 선택)")
+    parser.add_argument("--color-prefilter", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk", type=int, default=500, help="프로세스에 한 번에 넘길 프레임 수")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 stdout)")
+    args = parser.parse_args()
+
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            specs = json.load(f)
+    else:
+        specs = [{"name": os.path.splitext(os.path.basename(args.template))[0], "template": args.template,
+                  "threshold": args.threshold, "scales": parse_list(args.scales, float)}]
+    opts = {"grayscale": args.grayscale, "match_mode": args.match_mode, "fft": args.fft, "color_prefilter": args.color_prefilter}
+
+    report = backtest(args.session, specs, args.workers, args.chunk, args.cooldown, **opts)
+    print(f"[backtest] {report['frames']} frames in {report['elapsed_s']:.1f}s ({report['fps']:.1f} fps, "
+          f"{report['workers']} workers): hits={report['hit_count']} fires={report['fire_count']} best={report['best']}",
+          file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+bench_detector.py
+- ImageDetectionThread의 캡처 → 매칭 → 단축키 구간 지연을 합성 프레임으로 측정하는 벤치마크
+- 영역 크기, 템플릿 크기, scales 목록, threshold 조합별로 p50/p95/p99 프레임 지연, fps, 첫 감지까지 시간을 보고
+- 결과는 JSON으로 저장되어 릴리스 간 비교(--compare)로 회귀를 잡을 수 있음
+- Usage:
+    python bench_detector.py --template buy_signal.png --sizes 800x600,1920x1080 --out bench.json
+    python bench_detector.py --compare bench_old.json --out bench_new.json
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from auto_trade_detector import ImageDetectionThread
+from frame_source import FrameSource, SyntheticFrameSource
+from order_dispatcher import OrderDispatcher, StubSender
+
+
+class TimedSource(FrameSource):
+    """다른 프레임 소스를 감싸 grab 호출/반환 시각을 기록"""
+
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.calls = [] # grab 호출 시각 (직전 프레임 처리 완료 시점)
+        self.frame_times = [] # 프레임 반환 시각
+
+    def open(self):
+        self.inner.open()
+
+    def grab(self):
+        self.calls.append(time.perf_counter())
+        frame = self.inner.grab()
+        if frame is not None:
+            self.frame_index = self.inner.frame_index
+            self.frame_time = time.perf_counter()
+            self.frame_times.append(self.frame_time)
+        return frame
+
+    def close(self):
+        self.inner.close()
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000.0) if len(values) else None
+
+
+def run_case(template, size, tpl_scale, scales, threshold, frames, signal_every, bank_size=4, positions=None,
+             **detector_opts):
+    """한 가지 조합으로 감지 루프를 동기 실행하고 지표를 반환 (detector_opts는 ImageDetectionThread에 그대로 전달)"""
+    synth = SyntheticFrameSource(template, size=size, frames=frames, signal_every=signal_every, scale=tpl_scale,
+                                 bank_size=bank_size, positions=positions)
+    source = TimedSource(synth)
+    sender = StubSender()
+
+    tpl_file = template
+    if tpl_scale != 1.0:
+        # 감지기는 파일 경로를 받으므로 크기 변경한 템플릿을 임시 파일로 저장
+        fd, tpl_file = tempfile.mkstemp(prefix=f"bench_tpl_{tpl_scale}_", suffix=".png")
+        os.close(fd)
+        cv2.imwrite(tpl_file, synth.template)
+
+    det = ImageDetectionThread(template_path=tpl_file, region=None, hotkey=["f1"], scales=scales,
+                               threshold=threshold, frame_source=source, hotkey_sender=sender,
+                               cooldown=0.0, interval=0.0,
+                               dispatcher=OrderDispatcher(sender, threaded=False), # 전송 시각으로 프레임을 찾도록 동기 전송
+                               **detector_opts)
+    t_start = time.perf_counter()
+    try:
+        det.run() # QThread를 띄우지 않고 현재 스레드에서 루프를 그대로 실행
+    finally:
+        if tpl_file != template:
+            os.remove(tpl_file)
+    t_end = time.perf_counter()
+
+    # 프레임 i의 처리 시간 = 다음 grab 호출 시각 - 프레임 i 반환 시각
+    done = source.calls[1:len(source.frame_times) + 1]
+    lat = np.array(done) - np.array(source.frame_times[:len(done)])
+
+    signal_frames = [i for i in range(frames) if synth.is_signal_frame(i)]
+    # 동기 전송이므로 전송 시각 직전에 반환된 프레임이 그 주문을 낸 프레임
+    sent = [(bisect.bisect_right(source.frame_times, t) - 1, t) for _, t in sender.sent]
+    hit_frames = {idx for idx, _ in sent}
+    ttfd = None
+    if signal_frames:
+        first = signal_frames[0]
+        hits = [t for idx, t in sent if idx >= first]
+        if hits:
+            ttfd = (hits[0] - source.frame_times[first]) * 1000.0
+
+    return {
+        "size": f"{size[0]}x{size[1]}",
+        "template": f"{synth.template.shape[1]}x{synth.template.shape[0]}",
+        "scales": list(scales),
+        "threshold": threshold,
+        "options": detector_opts,
+        "frames": len(source.frame_times),
+        "p50_ms": percentile_ms(lat, 50),
+        "p95_ms": percentile_ms(lat, 95),
+        "p99_ms": percentile_ms(lat, 99),
+        "fps": len(source.frame_times) / (t_end - t_start),
+        "ttfd_ms": ttfd,
+        "hits": len(hit_frames & set(signal_frames)),
+        "signals": len(signal_frames),
+        "false_hits": len(hit_frames - set(signal_frames)),
+        "stages": {k: round(v["p50_ms"], 3) for k, v in det.stats().items()}, # 단계별 p50(ms)
+        "fft_paths": {k: v for m in det.engine.matchers.values() for k, v in m.fft_choices().items()}, # fft="auto"의 선택
+    }
+
+
+def case_key(r):
+    return (r["size"], r["template"], tuple(r["scales"]), r["threshold"],
+            json.dumps(r.get("options", {}), sort_keys=True))
+
+
+def compare(old_results, new_results, tolerance):
+    """이전 결과 대비 p95가 tolerance 비율 이상 느려진 조합 목록"""
+    old = {case_key(r): r for r in old_results}
+    regressions = []
+    for r in new_results:
+        prev = old.get(case_key(r))
+        if prev and prev["p95_ms"] and r["p95_ms"] > prev["p95_ms"] * (1.0 + tolerance):
+            regressions.append({"case": case_key(r), "old_p95_ms": prev["p95_ms"], "new_p95_ms": r["p95_ms"]})
+    return regressions
+
+
+def parse_list(text, conv):
+    return [conv(v) for v in text.split(",") if v]
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    default_tpl = os.path.join(here, "buy_signal.png")
+    if not os.path.exists(default_tpl):
+        default_tpl = os.path.join(here, "template_test.png")
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--template", default=default_tpl, help="합성에 사용할 템플릿 이미지")
+    parser.add_argument("--sizes", default="640x360,1280x720,1920x1080", help="영역 크기 목록 WxH,...")
+    parser.add_argument("--template-scales", default="0.5,1.0", help="템플릿 자체 크기 배율 목록")
+    parser.add_argument("--scales", action="append", default=None, help='감지기 scales 목록 (반복 지정 가능, 예: "0.9,1.0,1.1")')
+    parser.add_argument("--thresholds", default="0.87", help="threshold 목록")
+    parser.add_argument("--match-modes", default="exhaustive", help="매칭 모드 목록 (exhaustive,pyramid)")
+    parser.add_argument("--fft-modes", default="off", help="FFT 매칭 목록 (off,on,auto)")
+    parser.add_argument("--change-gate", action="store_true", help="변경 감지 게이트 사용")
+    parser.add_argument("--scale-workers", type=int, default=0, help="스케일 병렬 평가 스레드 수 (0이면 순차)")
+    parser.add_argument("--roi-window", type=int, default=0, help="최근 감지 위치 우선 탐색 창 여유(px), 0이면 끔")
+    parser.add_argument("--color-prefilter", action="store_true", help="색 마스크 전처리 사용")
+    parser.add_argument("--bank-size", type=int, default=4, help="합성 배경 장수 (1이면 배경 고정 → 신호 부분만 변경)")
+    parser.add_argument("--fixed-position", action="store_true", help="신호를 항상 같은 위치(중앙)에 합성")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--signal-every", type=int, default=10)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 stdout)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="회귀로 판단할 p95 증가 비율")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(v) for v in s.split("x")) for s in args.sizes.split(",")]
+    scale_sets = [parse_list(s, float) for s in (args.scales or ["1.0", "0.9,1.0,1.1"])]
+
+    results = []
+    for size in sizes:
+        for tpl_scale in parse_list(args.template_scales, float):
+            for scales in scale_sets:
+                for threshold in parse_list(args.thresholds, float):
+                    for mode, fft in itertools.product(parse_list(args.match_modes, str), parse_list(args.fft_modes, str)):
+                        opts = {"match_mode": mode}
+                        if fft != "off":
+                            opts["fft"] = fft
+                        if args.change_gate:
+                            opts["change_gate"] = True
+                        if args.scale_workers:
+                            opts["scale_workers"] = args.scale_workers
+                        if args.roi_window:
+                            opts["roi_window"] = args.roi_window
+                        if args.color_prefilter:
+                            opts["color_prefilter"] = True
+                        positions = [(size[0] // 2, size[1] // 2)] if args.fixed_position else None
+                        r = run_case(args.template, size, tpl_scale, scales, threshold, args.frames, args.signal_every,
+                                     args.bank_size, positions, **opts)
+                        results.append(r)
+                        print(f"[bench] {r['size']} tpl={r['template']} scales={r['scales']} th={threshold} {opts}: "
+                              f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms fps={r['fps']:.1f} "
+                              f"hits={r['hits']}/{r['signals']}", file=sys.stderr)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare(json.load(f)["results"], results, args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
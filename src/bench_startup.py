@@ -0,0 +1,64 @@
+"""
+bench_startup.py
+- 프로그램(app.py)을 새 프로세스로 여러 번 띄워 첫 화면 표시(first paint)까지 걸리는 시간을 측정
+- 프로세스 시작부터 첫 화면까지(인터프리터 시작 포함)와 app.py 모듈 로드 이후 구간을 나눠 보고
+- HTS 재시작 후 빠르게 다시 띄울 수 있는지 릴리스마다 확인하는 용도
+- Usage:
+    python bench_startup.py --runs 5
+    python bench_startup.py --runs 5 --offscreen --out startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def run_once(app_path, env):
+    """app.py --startup-report 한 번 실행 → 구간별 시간(ms)"""
+    start = time.time()
+    out = subprocess.run([sys.executable, app_path, "--startup-report"], env=env, capture_output=True,
+                         text=True, timeout=60, cwd=os.path.dirname(app_path))
+    for line in out.stdout.splitlines():
+        if line.startswith("{"):
+            r = json.loads(line)
+            r["process_to_paint_ms"] = (r.pop("wall") - start) * 1000.0
+            return r
+    raise RuntimeError(f"시작 보고를 받지 못함: {out.stderr.strip()[-500:]}")
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(here, "app.py"))
+    parser.add_argument("--offscreen", action="store_true", help="화면 없이 실행 (QT_QPA_PLATFORM=offscreen)")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 stdout)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    runs = [run_once(args.app, env) for _ in range(args.runs)]
+    summary = {}
+    for key in ("process_to_paint_ms", "first_paint_ms", "shown_ms"):
+        values = np.array([r[key] for r in runs])
+        summary[key] = {"p50": float(np.median(values)), "min": float(values.min()), "max": float(values.max())}
+    print(f"[startup] first paint p50={summary['process_to_paint_ms']['p50']:.0f}ms "
+          f"(after module load {summary['first_paint_ms']['p50']:.0f}ms) over {args.runs} runs", file=sys.stderr)
+
+    text = json.dumps({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "runs": runs, "summary": summary},
+                      ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
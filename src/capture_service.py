@@ -0,0 +1,251 @@
+import time
+import threading
+import numpy as np
+
+from frame_source import FrameSource, MssFrameSource
+
+# 공유 캡처 서비스
+# - 활성화된 모든 신호 영역(신호화면1..3)의 외접 사각형을 한 번만 캡처해 링 버퍼 슬롯에 보관
+# - 고정 주기로 캡처하지 않고 소비자가 grab()으로 요청할 때만 캡처 → 감지기별 RateController 간격/유휴 감속을 그대로 따름
+#   (요청 이후에 시작한 캡처의 프레임만 넘기므로 여러 감지기가 동시에 요청하면 한 번의 캡처를 함께 사용)
+# - 전략별 감지기는 SharedRegionSource를 프레임 소스로 받아, 공유 프레임에서 자기 영역만 잘라낸 NumPy 뷰(복사 없음)를 사용
+# - 감지기가 쓰는 중인 슬롯은 참조 카운트로 보호하여 캡처 스레드가 덮어쓰지 않음
+# - 캡처 오류는 각 소비자의 grab()에서 예외로 다시 발생시켜 감지기가 로그를 남기게 함
+#   (캡처를 시작하지 못해 스레드가 끝나면 다음 grab()에서 다시 시작을 시도)
+
+
+def union_rect(regions):
+    """(x, y, w, h) 목록의 외접 사각형"""
+    x0 = min(r[0] for r in regions)
+    y0 = min(r[1] for r in regions)
+    x1 = max(r[0] + r[2] for r in regions)
+    y1 = max(r[1] + r[3] for r in regions)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def contains(outer, inner):
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2] and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+class _Slot:
+    """링 버퍼 슬롯 하나 (외접 사각형 크기의 BGRA 프레임)"""
+
+    def __init__(self, bbox):
+        self.bbox = bbox
+        self.array = np.empty((bbox[3], bbox[2], 4), np.uint8)
+        self.refs = 0 # 이 슬롯의 뷰를 쓰고 있는 소비자 수
+        self.frame_time = None
+        self.gen = 0 # 이 프레임을 만든 캡처 번호
+
+
+class SharedRegionSource(FrameSource):
+    """CaptureService의 공유 프레임에서 한 영역을 잘라 주는 프레임 소스"""
+
+    def __init__(self, service, region):
+        super().__init__()
+        self.service = service
+        self.region = region
+        self._need = 0 # 기다리는 캡처 번호 (이 번호 이상인 캡처의 프레임만 사용)
+        self._errors_seen = 0
+        self._slot = None
+        self.closed = False
+
+    def open(self):
+        self.closed = False
+        self._errors_seen = self.service.error_seq
+        self.service.attach(self)
+
+    def grab(self):
+        svc = self.service
+        with svc.cond:
+            # 캡처 요청 후 이 영역을 포함하는 새 프레임이 올 때까지 대기 (서비스가 멈추거나 interrupt()되면 None)
+            self._need = svc.started + 1
+            svc.cond.notify_all()
+            while not self.closed and (svc.latest.gen < self._need or not contains(svc.latest.bbox, self.region)):
+                if svc.latest.gen >= self._need:
+                    # 이 영역이 추가되기 전에 시작한 캡처 → 다시 요청
+                    self._need = svc.started + 1
+                    svc.cond.notify_all()
+                if svc.error_seq != self._errors_seen:
+                    # 아직 전달하지 않은 캡처 오류 → 감지기에서 로그를 남기도록 예외로 전달
+                    self._errors_seen = svc.error_seq
+                    raise svc.error
+                if not svc.running:
+                    if not svc.failed:
+                        return None
+                    svc._start() # 오류로 멈춘 캡처를 다시 시도
+                svc.cond.wait(0.5)
+            if self.closed:
+                return None
+
+            slot = svc.latest
+            if self._slot is not slot:
+                if self._slot is not None:
+                    self._slot.refs -= 1
+                slot.refs += 1
+                self._slot = slot
+            self._need = 0
+            self.frame_time = slot.frame_time
+            self.frame_index += 1
+
+        bx, by = slot.bbox[:2]
+        x, y, w, h = self.region
+        return slot.array[y - by:y - by + h, x - bx:x - bx + w] # 복사 없는 뷰
+
+    def interrupt(self):
+        """다른 스레드에서 대기 중인 grab()을 깨워 None을 반환하게 함"""
+        with self.service.cond:
+            self.closed = True
+            self.service.cond.notify_all()
+
+    def close(self):
+        with self.service.cond:
+            self.closed = True
+            if self._slot is not None:
+                self._slot.refs -= 1
+                self._slot = None
+            self.service.cond.notify_all()
+        self.service.detach(self)
+
+
+class CaptureService:
+    """활성 영역들의 외접 사각형을 한 번에 캡처하는 백그라운드 서비스
+
+    source를 주지 않으면 mss로 외접 사각형만 캡처. 다른 FrameSource(재생/합성)를 주면
+    그 프레임을 데스크톱 전체(원점 0,0)로 보고 외접 사각형을 잘라 사용
+    """
+
+    def __init__(self, slots=4, source=None):
+        self.min_slots = slots
+        self.source = source
+        self.cond = threading.Condition()
+        self.running = False
+        self.seq = 0 # 지금까지 발행한 프레임 수
+        self.started = 0 # 지금까지 시작한 캡처 수 (소비자 요청 번호와 비교)
+        self.latest = _Slot((0, 0, 0, 0))
+        self._slots = []
+        self._consumers = []
+        self._thread = None
+        self.error = None # 마지막 캡처 오류
+        self.error_seq = 0 # 지금까지 발생한 캡처 오류 수 (소비자별로 전달 여부 판단)
+        self.failed = False # 캡처 스레드가 오류로 끝났으면 True (다음 grab()에서 재시작)
+
+    def add_region(self, region):
+        """영역 하나에 대한 프레임 소스 생성 (감지기의 frame_source로 전달)"""
+        return SharedRegionSource(self, tuple(region))
+
+    def attach(self, consumer):
+        with self.cond:
+            self._consumers.append(consumer)
+            if not self.running:
+                self._start()
+
+    def _start(self):
+        # cond를 잡은 상태에서 호출
+        self.running = True
+        self.failed = False
+        self._thread = threading.Thread(target=self._loop, name="CaptureService", daemon=True)
+        self._thread.start()
+
+    def _fail(self, e):
+        # cond를 잡은 상태에서 호출
+        self.error = e
+        self.error_seq += 1
+        self.cond.notify_all()
+
+    def detach(self, consumer):
+        thread = None
+        with self.cond:
+            if consumer in self._consumers:
+                self._consumers.remove(consumer)
+            if not self._consumers and self.running:
+                # 마지막 소비자가 빠지면 캡처 중지
+                self.running = False
+                thread = self._thread
+                self.cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.failed = False
+            self.cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def _free_slot(self, bbox, needed):
+        """덮어써도 되는 슬롯 (외접 사각형이 바뀌었으면 새로 할당)"""
+        if self._slots and self._slots[0].bbox != bbox:
+            self._slots = [] # 쓰는 중인 옛 슬롯은 소비자가 참조를 놓으면 해제됨
+        while len(self._slots) < needed:
+            self._slots.append(_Slot(bbox))
+        for slot in self._slots:
+            if slot.refs == 0 and slot is not self.latest:
+                return slot
+        slot = _Slot(bbox) # 모든 슬롯이 사용 중이면 하나 추가
+        self._slots.append(slot)
+        return slot
+
+    def _loop(self):
+        try:
+            self._run()
+        except Exception as e:
+            # 캡처 소스를 열지 못하는 등 계속할 수 없는 오류 → 소비자에게 전달하고 종료
+            with self.cond:
+                self.failed = True
+                self._fail(e)
+        finally:
+            with self.cond:
+                if self._thread is threading.current_thread():
+                    self.running = False
+                self.cond.notify_all()
+
+    def _run(self):
+        own_source = self.source is None
+        source = MssFrameSource() if own_source else self.source
+        with source:
+            while True:
+                with self.cond:
+                    # 아직 시작하지 않은 캡처를 기다리는 소비자가 있을 때까지 대기
+                    while (self.running and self._thread is threading.current_thread()
+                           and not any(c._need > self.started for c in self._consumers)):
+                        self.cond.wait(0.5)
+                    if not self.running or self._thread is not threading.current_thread():
+                        break
+                    self.started += 1
+                    gen = self.started
+                    regions = [c.region for c in self._consumers]
+                if regions:
+                    bbox = union_rect(regions)
+                    try:
+                        if own_source:
+                            source.region = bbox
+                            frame = source.grab()
+                        else:
+                            frame = source.grab()
+                            if frame is None:
+                                break
+                            frame = frame[bbox[1]:bbox[1] + bbox[3], bbox[0]:bbox[0] + bbox[2]]
+                    except Exception as e:
+                        with self.cond:
+                            self._fail(e)
+                        time.sleep(1)
+                        continue
+
+                    with self.cond:
+                        slot = self._free_slot(bbox, max(self.min_slots, len(regions) + 2))
+                    # 복사는 락 밖에서 (이 슬롯은 참조 0이고 latest가 아니므로 아무도 읽지 않음)
+                    if frame.ndim == 3 and frame.shape[2] == 4:
+                        np.copyto(slot.array, frame)
+                    else:
+                        slot.array[..., :3] = frame if frame.ndim == 3 else frame[..., None]
+                        slot.array[..., 3] = 255
+                    slot.frame_time = source.frame_time
+                    slot.gen = gen
+                    with self.cond:
+                        self.latest = slot
+                        self.seq += 1
+                        self.cond.notify_all()
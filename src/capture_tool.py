@@ -1,13 +1,53 @@
 import sys
-from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QLabel, QFileDialog
-from PyQt6.QtCore import Qt, QPoint, QRect
-from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication
+from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QLabel, QFileDialog, QCheckBox
+from PyQt6.QtCore import Qt, QPoint, QRect, QThread, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication, QImage
+
+def qimage_to_bgr(image):
+    """QImage → numpy BGR 배열 (복사본)"""
+    import numpy as np
+    image = image.convertToFormat(QImage.Format.Format_RGB32) # 메모리상 B, G, R, A 순서
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    arr = np.frombuffer(ptr, np.uint8).reshape(image.height(), image.bytesPerLine() // 4, 4)
+    return arr[:, :image.width(), :3].copy()
+
+class OptimizeThread(QThread):
+    """템플릿 최적화를 GUI 스레드 밖에서 실행 (수 초 걸릴 수 있음)"""
+    progress_signal = pyqtSignal(str) # 진행 상황 문자열
+    done_signal = pyqtSignal(str) # 저장 결과 문자열
+
+    def __init__(self, full, rect, filename):
+        super().__init__()
+        self.full = full
+        self.rect = rect
+        self.filename = filename
+
+    def run(self):
+        from template_optimizer import optimize_template, save_result, summary
+        x, y, w, h = self.rect
+        try:
+            result = optimize_template(self.full, self.rect, progress=self.report)
+            save_result(result, self.filename, self.full[y:y + h, x:x + w], (self.full.shape[1], self.full.shape[0]))
+        except Exception as e:
+            print(f"❌ 최적화 실패: {e}")
+            self.done_signal.emit(f"'{self.filename}' 최적화 실패: {e}")
+            return
+        text = summary(result)
+        print(f"✅ 저장 완료: {self.filename} ({text})")
+        self.done_signal.emit(f"'{self.filename}' 저장 완료\n{text}")
+
+    def report(self, evaluated, total):
+        self.progress_signal.emit(f"'{self.filename}' 최적화 중... ({evaluated}/{total})")
 
 class SnippingWidget(QWidget):
     """화면을 어둡게 덮고 마우스로 영역을 선택하는 위젯"""
-    def __init__(self, parent=None, filename="capture.png"):
+    def __init__(self, parent=None, filename="capture.png", optimize=False, on_saved=None):
         super().__init__(parent)
         self.filename = filename
+        self.optimize = optimize # True면 저장 전에 현재 화면에서 유일한 가장 작은 부분 패치로 줄임 (template_optimizer)
+        self.on_saved = on_saved # 저장 후 결과 문자열을 받는 함수 (최적화 중에는 진행 상황도 받음)
+        self.worker = None # 최적화 스레드
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setStyleSheet("background-color: black;")
         self.setWindowOpacity(0.3) # 화면을 30% 투명하게 (어둡게)
@@ -65,10 +105,34 @@ class SnippingWidget(QWidget):
         if w > 0 and h > 0:
             # 원본 화면(밝은 화면)을 캡처해야 하므로 오버레이가 사라진 뒤 찰칵
             screen = QGuiApplication.primaryScreen()
+            if self.optimize:
+                self.save_optimized(screen, x1, y1, w, h)
+                return
             # grabWindow(0)은 전체 스크린
             screenshot = screen.grabWindow(0, x1, y1, w, h)
             screenshot.save(self.filename)
             print(f"✅ 저장 완료: {self.filename}")
+            if self.on_saved:
+                self.on_saved(f"'{self.filename}' 저장 완료")
+
+    def save_optimized(self, screen, x, y, w, h):
+        """전체 화면을 한 번 찍고 스닙 안에서 유일한 최소 패치를 찾아 저장 (패치 + 같은 이름 .json + 원본 *_full.png)
+
+        화면 캡처는 GUI 스레드에서, 최적화/저장은 OptimizeThread에서 진행
+        """
+        full = qimage_to_bgr(screen.grabWindow(0).toImage()) # 유일성은 화면 전체에 대해 평가
+        ratio = full.shape[1] / screen.geometry().width() # 고DPI 화면: 논리 좌표 → 물리 픽셀
+        rect = (round(x * ratio), round(y * ratio), round(w * ratio), round(h * ratio))
+        print(f"⏳ 템플릿 최적화 중... ({rect[2]}x{rect[3]})")
+        self.worker = OptimizeThread(full, rect, self.filename)
+        if self.on_saved:
+            self.worker.progress_signal.connect(self.on_saved)
+            self.worker.done_signal.connect(self.on_saved)
+        self.worker.start()
+
+    def busy(self):
+        """최적화가 진행 중인지"""
+        return self.worker is not None and self.worker.isRunning()
 
 class CaptureTool(QWidget):
     def __init__(self):
@@ -96,11 +160,22 @@ class CaptureTool(QWidget):
         btn_sell.setStyleSheet("background-color: #ccccff; padding: 10px; font-weight: bold;")
         layout.addWidget(btn_sell)
 
+        # 캡처 후 현재 화면에서 유일한 가장 작은 부분만 남김 (매칭이 빨라지고 오탐이 줄어듦)
+        self.chk_optimize = QCheckBox("최소 패치로 최적화 (원본은 *_full.png)")
+        self.chk_optimize.setChecked(False)
+        layout.addWidget(self.chk_optimize)
+
         self.setLayout(layout)
+        self.snipper = None
 
     def start_snip(self, filename):
+        # 이전 캡처의 최적화가 끝나기 전에는 새 캡처를 받지 않음 (최적화 스레드를 가진 위젯 유지)
+        if self.snipper is not None and self.snipper.busy():
+            self.lbl_info.setText("이전 캡처 최적화 중입니다. 잠시 후 다시 누르세요.")
+            return
         # 캡처 위젯 실행 (파일명 전달)
-        self.snipper = SnippingWidget(filename=filename)
+        self.snipper = SnippingWidget(filename=filename, optimize=self.chk_optimize.isChecked(),
+                                      on_saved=self.lbl_info.setText)
         self.lbl_info.setText(f"'{filename}' 저장 중...\n마우스로 드래그하세요!")
 
 if __name__ == '__main__':
@@ -0,0 +1,95 @@
+import cv2
+import numpy as np
+
+# 색 마스크 전처리: 매수/매도 화살표처럼 색이 뚜렷한 템플릿에서 주요 색 범위를 뽑아
+# 프레임을 inRange로 이진화 → 템플릿 크기 이상인 연결 요소만 후보로 남겨 그 주변에서만 matchTemplate 수행
+# 신호가 드문 큰 영역에서 전체 정규화 상관을 돌리는 것보다 훨씬 저렴
+# 색 범위는 HSV로 잡음 (BGR 상자 범위는 어두운 차트 배경까지 삼켜 신호 덩어리가 배경과 합쳐짐)
+
+
+class ColorPrefilter:
+    """템플릿의 주요 색(채도 높은 픽셀의 지배적 색상) 범위로 후보 영역을 찾음"""
+
+    KERNEL = np.ones((3, 3), np.uint8)
+
+    def __init__(self, template, min_saturation=80, min_value=60, hue_margin=10, color_margin=30,
+                 min_fraction=0.03, max_candidates=20):
+        self.max_candidates = max_candidates # 후보가 이보다 많으면 전처리 포기 → 전체 탐색
+        self.usable = False
+        self.ranges = [] # [(HSV 하한, HSV 상한), ...]
+
+        hsv = cv2.cvtColor(template, cv2.COLOR_BGR2HSV)
+        colored = (hsv[..., 1] >= min_saturation) & (hsv[..., 2] >= min_value)
+        if colored.mean() < min_fraction:
+            return # 무채색 템플릿은 전처리 불가
+
+        # 지배적 색상(hue) 찾기 (빨강은 0/179 경계를 넘나들므로 원형으로 이웃 합산)
+        hist = np.bincount(hsv[..., 0][colored], minlength=180).astype(np.float64)
+        smooth = sum(np.roll(hist, k) for k in range(-hue_margin, hue_margin + 1))
+        dominant = int(np.argmax(smooth))
+        dist = np.abs(((hsv[..., 0].astype(np.int16) - dominant + 90) % 180) - 90)
+        main = colored & (dist <= hue_margin)
+
+        # HSV 범위: 색상은 지배적 색상 ±hue_margin, 채도/명도는 주요 색 픽셀 분포의 아래쪽에서 여유를 두되
+        # min_saturation/min_value 아래로는 내리지 않음 (어둡거나 무채색인 배경 제외)
+        pixels = hsv[main].astype(np.int16)
+        s_lo = max(min_saturation, int(np.percentile(pixels[:, 1], 2)) - color_margin)
+        v_lo = max(min_value, int(np.percentile(pixels[:, 2], 2)) - color_margin)
+        h_lo, h_hi = dominant - hue_margin, dominant + hue_margin
+        # 빨강처럼 0/179 경계를 넘으면 두 구간으로 나눔
+        if h_lo < 0:
+            hue_ranges = [(0, h_hi), (h_lo + 180, 179)]
+        elif h_hi > 179:
+            hue_ranges = [(h_lo, 179), (0, h_hi - 180)]
+        else:
+            hue_ranges = [(h_lo, h_hi)]
+        self.ranges = [(np.array([a, s_lo, v_lo], np.uint8), np.array([b, 255, 255], np.uint8)) for a, b in hue_ranges]
+
+        # 후보 크기 판단 기준: 템플릿에 같은 마스크를 적용했을 때 가장 큰 색 덩어리
+        # (글자처럼 조각난 신호도 프레임에서 같은 모양으로 조각나므로 조각 하나 단위로 비교)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(self.mask(template), connectivity=8)
+        if n < 2:
+            return
+        _, _, self.blob_w, self.blob_h, self.blob_area = (int(v) for v in stats[1 + int(np.argmax(stats[1:, 4]))])
+        self.usable = True
+
+    def mask(self, frame):
+        """주요 색 범위에 드는 픽셀 마스크 (BGR/BGRA 모두 지원)"""
+        code = cv2.COLOR_BGRA2BGR if frame.ndim == 3 and frame.shape[2] == 4 else None
+        bgr = cv2.cvtColor(frame, code) if code is not None else frame
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+        out = None
+        for lower, upper in self.ranges:
+            m = cv2.inRange(hsv, lower, upper)
+            out = m if out is None else cv2.bitwise_or(out, m)
+        return cv2.dilate(out, self.KERNEL) # 안티앨리어싱으로 한두 픽셀 끊긴 곳을 이어 줌
+
+    def candidates(self, frame, tpl_w, tpl_h, min_scale=1.0, max_scale=1.0, max_coverage=0.5):
+        """매칭할 후보 영역 [(x, y, w, h), ...]. 후보가 없으면 [], 너무 많거나 사용 불가면 None(전체 탐색)
+
+        tpl_w, tpl_h는 가장 큰 스케일의 템플릿 크기, min_scale/max_scale은 scales 범위
+        후보 영역 합이 프레임의 max_coverage를 넘으면 전처리 이득이 없으므로 None
+        """
+        if not self.usable:
+            return None
+        n, labels, stats, _ = cv2.connectedComponentsWithStats(self.mask(frame), connectivity=8)
+
+        min_w = self.blob_w * min_scale * 0.5
+        min_h = self.blob_h * min_scale * 0.5
+        h_f, w_f = frame.shape[:2]
+        rects = []
+        covered = 0
+        for i in range(1, n):
+            bx, by, bw, bh, area = stats[i]
+            if bw < min_w or bh < min_h or area < self.blob_area * min_scale * min_scale * 0.3:
+                continue # 템플릿 색 덩어리보다 훨씬 작거나 듬성듬성한 잡음
+            # 큰 덩어리(신호가 주변 같은 색과 붙은 경우 포함)도 버리지 않고 그 범위 전체를 후보로 둠
+            # 색 덩어리를 포함하는 모든 템플릿 위치가 들어가도록 템플릿 크기만큼 넓히고 프레임 안으로 자름
+            x0, x1 = max(0, min(bx, bx + bw - tpl_w)), min(w_f, max(bx + bw, bx + tpl_w))
+            y0, y1 = max(0, min(by, by + bh - tpl_h)), min(h_f, max(by + bh, by + tpl_h))
+            if x1 - x0 >= tpl_w and y1 - y0 >= tpl_h:
+                rects.append((x0, y0, x1 - x0, y1 - y0))
+                covered += (x1 - x0) * (y1 - y0)
+            if len(rects) > self.max_candidates or covered > max_coverage * w_f * h_f:
+                return None
+        return rects
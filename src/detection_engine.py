@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from frame_source import BufferPool, to_bgr, to_gray
+from template_cache import TemplateCache
+from matcher import TemplateMatcher, MATCH_EXHAUSTIVE
+from fft_match import FFT_OFF
+from frame_diff import FrameDiffGate
+
+# 다중 템플릿 감지 엔진 (Qt와 무관)
+# - 한 틱에 화면을 한 번만 캡처/색변환하고, 등록된 모든 템플릿(매수/매도 등)을 같은 프레임에 대해 평가
+# - 템플릿마다 단축키, threshold, scales, 쿨다운 상태를 따로 가짐
+# - 감지 스레드(ImageDetectionThread)와 벤치마크/헤드리스 실행이 이 엔진을 공유
+
+
+class TemplateSpec:
+    """감시할 템플릿 하나의 설정"""
+
+    def __init__(self, name, path, hotkey, threshold=0.87, scales=(0.9, 1.0, 1.1)):
+        self.name = name # 예: "buy", "sell"
+        self.path = path
+        self.hotkey = list(hotkey) if hotkey else [] # 예: ['f1'] 또는 ['ctrl', '1']
+        self.threshold = threshold
+        self.scales = list(scales)
+
+    @classmethod
+    def from_dict(cls, d):
+        """{"name":..., "template":..., "hotkey":"ctrl+1" 또는 [...], "threshold":..., "scales":[...]}"""
+        hotkey = d.get("hotkey", [])
+        if isinstance(hotkey, str):
+            hotkey = [k.strip() for k in hotkey.split("+") if k.strip()]
+        path = d.get("template") or d.get("path")
+        return cls(d.get("name") or path, path, hotkey, d.get("threshold", 0.87), d.get("scales", (0.9, 1.0, 1.1)))
+
+
+class DetectionEngine:
+    """여러 템플릿을 한 프레임에 대해 평가"""
+
+    def __init__(self, specs, grayscale=False, match_mode=MATCH_EXHAUSTIVE, cooldown=3.0,
+                 change_gate=False, diff_tile=32, scale_workers=0, roi_window=0, roi_decay=0.8,
+                 color_prefilter=False, timer=None, fft=FFT_OFF):
+        self.specs = list(specs)
+        self.grayscale = grayscale
+        self.color_prefilter = color_prefilter
+        self.color_img = None # 그레이 매칭 시 색 전처리에 쓰는 컬러 프레임
+        self.cooldown = cooldown # 템플릿별 중복 주문 방지 대기 시간
+        self.timer = timer # StageTimer (None이면 계측 안 함)
+        self.caches = {}
+        self.matchers = {}
+        # 스케일 병렬 평가용 스레드 풀 (모든 템플릿이 공유, 0이면 순차 평가)
+        self.executor = ThreadPoolExecutor(scale_workers, thread_name_prefix="scale") if scale_workers > 0 else None
+        self.failed = [] # 로드 실패한 템플릿 경로
+        for spec in self.specs:
+            cache = TemplateCache(spec.path)
+            if cache.template is None:
+                self.failed.append(spec.path)
+                continue
+            self.caches[spec.name] = cache
+            self.matchers[spec.name] = TemplateMatcher(cache, spec.scales, spec.threshold, grayscale, match_mode,
+                                                       executor=self.executor, roi_window=roi_window, roi_decay=roi_decay,
+                                                       prefilter=color_prefilter, timer=timer, fft=fft)
+        self.specs = [s for s in self.specs if s.name in self.matchers]
+        self.last_trigger = {s.name: 0.0 for s in self.specs}
+        self.reloaded = [] # 마지막 process()에서 다시 읽은 템플릿 경로
+        self.closeness = 0.0 # 마지막 process()의 템플릿별 (최고 점수 / threshold) 중 최댓값
+
+        # 변경 감지 게이트: 이전 프레임과 같으면 매칭 생략, 바뀐 타일 주변만 매칭
+        self.diff_gate = FrameDiffGate(diff_tile) if change_gate else None
+        # 색변환 결과 버퍼 (한 process() 안에서만 쓰므로 하나씩 재사용)
+        self._bgr_pool = BufferPool(1)
+        self._gray_pool = BufferPool(1)
+
+    def reset(self):
+        """다음 프레임을 전체 영역에서 다시 매칭"""
+        if self.diff_gate is not None:
+            self.diff_gate.reset()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def max_template_size(self):
+        sizes = [m.max_template_size() for m in self.matchers.values()]
+        return max((w for w, _ in sizes), default=0), max((h for _, h in sizes), default=0)
+
+    def prepare(self, img_np):
+        """캡처 프레임 → (매칭용 화면, 매칭 영역). 변경이 없으면 (None, [])"""
+        # 템플릿 파일이 다시 캡처되었으면 캐시 갱신 (새 템플릿은 프레임 전체에서 다시 찾음)
+        self.reloaded = [c.path for c in self.caches.values() if c.reload_if_changed()]
+        if self.reloaded:
+            self.reset()
+
+        # 변경 감지: 바뀐 곳이 없으면 매칭 생략
+        timer = self.timer
+        t = timer.now() if timer is not None else 0
+        rects = None
+        if self.diff_gate is not None:
+            rects = self.diff_gate.update(img_np, *self.max_template_size())
+            if timer is not None:
+                t = timer.lap("diff", t)
+            if rects == []:
+                return None, []
+
+        # mss는 BGRA를 반환하므로 BGR로 변환 (OpenCV용) - 모든 템플릿이 같은 변환 결과를 공유
+        # 변환 결과는 재사용 버퍼에 씀. 그레이 매칭은 BGRA에서 바로 그레이로 (BGR 중간 단계 생략)
+        self.color_img = None
+        if self.grayscale and (img_np.ndim == 2 or not self.color_prefilter):
+            screen_img = to_gray(img_np, self._gray_pool)
+        else:
+            screen_img = to_bgr(img_np, self._bgr_pool)
+            if self.grayscale:
+                self.color_img = screen_img
+                screen_img = to_gray(screen_img, self._gray_pool)
+        if timer is not None:
+            timer.lap("convert", t)
+        return screen_img, rects
+
+    def process(self, img_np, now=None):
+        """한 프레임을 모든 템플릿으로 평가
+
+        반환: None(변경 없음으로 생략) 또는 템플릿별 결과 목록
+        [{"name", "hit", "fire", "score", "scale", "loc", "hotkey", "best"}, ...]
+        best는 감지 여부와 상관없이 이번 프레임에서 나온 최고 점수
+        fire는 threshold 이상이면서 해당 템플릿의 쿨다운이 지난 경우 True
+        """
+        screen_img, rects = self.prepare(img_np)
+        if screen_img is None:
+            self.closeness = 0.0
+            return None
+
+        now = time.time() if now is None else now
+        results = []
+        self.closeness = 0.0
+        for spec in self.specs:
+            matcher = self.matchers[spec.name]
+            hit = matcher.match_frame(screen_img, rects, self.color_img)
+            r = {"name": spec.name, "hit": hit is not None, "fire": False, "score": None, "scale": None,
+                 "loc": None, "hotkey": spec.hotkey, "best": matcher.best_score}
+            if spec.threshold > 0:
+                self.closeness = max(self.closeness, matcher.best_score / spec.threshold)
+            if hit is not None:
+                r["score"], r["scale"], r["loc"] = hit
+                if (now - self.last_trigger[spec.name]) > self.cooldown:
+                    r["fire"] = True
+                    self.last_trigger[spec.name] = now
+            results.append(r)
+        return results
@@ -0,0 +1,275 @@
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from frame_source import MssFrameSource
+from matcher import MATCH_EXHAUSTIVE
+from rate_controller import RateController
+from stage_timer import StageTimer
+from order_dispatcher import OrderDispatcher, PyAutoGuiSender
+
+# 프로세스 분리 감지기
+# - 매칭(DetectionEngine)은 별도 워커 프로세스에서 실행 → GUI 프로세스의 GIL/이벤트 루프 부하가 감지 지연에 끼어들지 않음
+# - 캡처는 GUI 프로세스(공유 캡처 서비스 등)에서 하고 프레임은 multiprocessing.shared_memory 링 버퍼로 전달
+# - 파이프로는 ("frame", 슬롯, 번호, 모양)만 보내고, 워커는 ("result", 번호, 결과, ...)로 응답
+#   응답이 온 슬롯만 다시 쓰므로 워커가 읽는 중인 슬롯은 덮어쓰지 않음 (슬롯이 모두 차 있으면 빌 때까지 캡처를 미룸)
+# - 워커의 단계별 계측(diff/convert/match 등)은 stats_every초마다 ("stats", 스냅샷)으로 부모에 전달
+# - ProcessDetector는 ImageDetectionThread와 같은 log_signal을 가지므로 AppController에서 그대로 바꿔 쓸 수 있음
+
+
+class SharedFrameRing:
+    """shared_memory 위의 고정 크기 프레임 슬롯 묶음"""
+
+    def __init__(self, slot_bytes, slots=3, name=None):
+        self.slot_bytes = slot_bytes
+        self.slots = slots
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes * slots)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def view(self, slot, shape):
+        """슬롯을 주어진 모양의 uint8 배열로 보기 (복사 없음)"""
+        return np.ndarray(shape, np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def write(self, slot, frame):
+        np.copyto(self.view(slot, frame.shape), frame)
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def worker_main(conn, specs, engine_opts, stats_every=1.0):
+    """워커 프로세스 본체: 공유 메모리 프레임을 받아 DetectionEngine으로 평가하고 결과를 파이프로 돌려줌"""
+    from detection_engine import DetectionEngine, TemplateSpec # 워커에서만 필요한 무거운 모듈
+
+    timer = StageTimer()
+    engine = DetectionEngine([TemplateSpec.from_dict(d) for d in specs], timer=timer, **engine_opts)
+    last_stats = time.perf_counter()
+    if engine.failed:
+        conn.send(("error", f"이미지 로드 실패: {', '.join(engine.failed)}"))
+    ring = None
+    try:
+        while True:
+            msg = conn.recv()
+            kind = msg[0]
+            if kind == "stop":
+                break
+            if kind == "attach":
+                # 프레임 크기가 바뀌어 부모가 링을 새로 만든 경우
+                if ring is not None:
+                    ring.close()
+                ring = SharedFrameRing(msg[2], msg[3], name=msg[1])
+                continue
+            if kind == "frame":
+                _, gen, slot, seq, shape = msg
+                t0 = time.perf_counter()
+                try:
+                    results = engine.process(ring.view(slot, shape))
+                except Exception as e:
+                    engine.reset()
+                    conn.send(("error", str(e), gen, slot))
+                    continue
+                for path in engine.reloaded:
+                    conn.send(("reload", path))
+                now = time.perf_counter()
+                conn.send(("result", gen, slot, results, engine.closeness, now - t0))
+                if now - last_stats >= stats_every:
+                    conn.send(("stats", timer.snapshot()))
+                    last_stats = now
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        engine.close()
+        if ring is not None:
+            ring.close()
+
+
+class ProcessDetector(QThread):
+    """워커 프로세스에 매칭을 맡기는 감지기 (ImageDetectionThread와 같은 인터페이스)"""
+    log_signal = pyqtSignal(dict)
+
+    def __init__(self, templates, region=None, frame_source=None, hotkey_sender=None, interval=0.2,
+                 slots=3, stats_path=None, dispatcher=None, strategy="이미지", **engine_opts):
+        super().__init__()
+        from detection_engine import TemplateSpec
+        # 워커로 넘길 수 있도록 템플릿 설정은 dict로 보관
+        self.specs = [{"name": t.name, "template": t.path, "hotkey": t.hotkey, "threshold": t.threshold,
+                       "scales": t.scales} if isinstance(t, TemplateSpec) else dict(t) for t in templates]
+        self.engine_opts = dict(engine_opts)
+        self.engine_opts.setdefault("match_mode", MATCH_EXHAUSTIVE)
+        self.frame_source = frame_source if frame_source is not None else MssFrameSource(region)
+        self.hotkey_sender = hotkey_sender if hotkey_sender is not None else PyAutoGuiSender()
+        # 주문은 전송 스레드가 처리 (ImageDetectionThread와 같은 방식, 공유 dispatcher는 소유자가 종료)
+        self.strategy = strategy
+        self._own_dispatcher = dispatcher is None
+        self.dispatcher = dispatcher if dispatcher is not None else OrderDispatcher(self.hotkey_sender, log=self.log_signal.emit)
+        self.slots = slots
+        self.rate = RateController(interval)
+        self.is_running = True
+        self.proc = None
+        self._gen = 0 # 공유 메모리 링 세대 번호
+        self._frame_times = {} # {(세대, 슬롯): 해당 슬롯에 보낸 프레임의 캡처 시각} - 감지→주문 지연 계측용
+        # 부모 쪽 단계(capture/write/hotkey/frame)는 직접 계측, 워커 쪽 단계는 마지막으로 받은 스냅샷을 보관
+        self.timer = StageTimer()
+        self.frame_source.timer = self.timer
+        self.worker_stats = {}
+        self.stats_path = stats_path
+
+    def _start_worker(self):
+        # Windows는 spawn 방식이므로 worker_main은 모듈 최상위 함수여야 함
+        ctx = mp.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(target=worker_main, args=(child_conn, self.specs, self.engine_opts),
+                                name="DetectorWorker", daemon=True)
+        self.proc.start()
+        child_conn.close()
+        return parent_conn
+
+    def _release(self, gen, slot, free):
+        # 현재 링의 슬롯만 반납 (링을 새로 만들기 전에 보낸 프레임의 응답은 무시)
+        if gen == self._gen:
+            free.append(slot)
+
+    def _handle(self, msg, free):
+        """워커 메시지 처리. 감지 결과면 (변경 여부, closeness), 아니면 None"""
+        kind = msg[0]
+        if kind == "result":
+            _, gen, slot, results, closeness, elapsed = msg
+            self._release(gen, slot, free)
+            self.timer.add("worker", int(elapsed * 1e9))
+            fired = [r for r in results or [] if r["fire"]]
+            if fired:
+                best = max(fired, key=lambda r: r["score"])
+                self.log_signal.emit({
+                    "time": "감지", "strat": self.strategy, "prog": f"정확도{best['score']:.2f}",
+                    "result": "발견:" + ",".join(r["name"] for r in fired),
+                    "note": " / ".join(f"{r['name']} 배율:{r['scale']}" for r in fired),
+                    "hits": results, "worker_ms": elapsed * 1000.0,
+                })
+                t = self.timer.now()
+                detected_at = self._frame_times.get((gen, slot))
+                for r in fired:
+                    self.dispatcher.submit(self.strategy, r["name"], r["hotkey"], detected_at, r)
+                self.timer.lap("hotkey", t)
+            return results is not None, closeness
+        if kind == "stats":
+            self.worker_stats = msg[1]
+        elif kind == "reload":
+            self.log_signal.emit({"time": "시스템", "strat": self.strategy, "prog": "템플릿", "result": "재로드", "note": msg[1]})
+        elif kind == "error":
+            if len(msg) > 3:
+                self._release(msg[2], msg[3], free)
+            self.log_signal.emit({"time": "에러", "strat": self.strategy, "prog": "워커", "result": "예외", "note": msg[1]})
+        return None
+
+    def _drain(self, conn, free, slots, timeout=5.0):
+        """워커에 보낸 프레임의 결과가 모두 돌아올 때까지 처리 (최대 timeout초, stop()되면 중단)"""
+        deadline = time.perf_counter() + timeout
+        while self.is_running and len(free) < slots and self.proc.is_alive():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            if conn.poll(min(remaining, 0.5)): # 워커가 죽었는지 주기적으로 확인
+                self._handle(conn.recv(), free)
+
+    def run(self):
+        self.log_signal.emit({"time": "시스템", "strat": "감시", "prog": "시작", "result": "워커ON", "note": ""})
+        conn = self._start_worker()
+        ring = None
+        free = []
+        seq = 0
+        changed, near = True, 0.0
+        try:
+            with self.frame_source as source:
+                while self.is_running and self.proc.is_alive():
+                    # 워커가 모든 슬롯을 쓰는 중이면 결과가 와서 슬롯이 빌 때까지 기다린 뒤 캡처
+                    # (버릴 프레임을 캡처하지 않고, 보내는 프레임이 대기하는 동안 낡지 않도록)
+                    while ring is not None and not free and self.is_running and self.proc.is_alive():
+                        if conn.poll(0.5):
+                            got = self._handle(conn.recv(), free)
+                            if got is not None:
+                                changed, near = got
+                    if not self.is_running:
+                        break
+                    t0 = time.perf_counter()
+                    t_ns = start_ns = self.timer.now()
+                    img_np = source.grab()
+                    if img_np is None:
+                        break
+                    t_ns = self.timer.lap("capture", t_ns)
+
+                    # 프레임 크기에 맞는 공유 메모리 링 준비 (처음 또는 크기가 커졌을 때)
+                    if ring is None or img_np.nbytes > ring.slot_bytes:
+                        if ring is not None:
+                            ring.close(unlink=True)
+                        ring = SharedFrameRing(img_np.nbytes, self.slots)
+                        self._gen += 1
+                        conn.send(("attach", ring.name, ring.slot_bytes, ring.slots))
+                        free = list(range(ring.slots))
+
+                    # 빈 슬롯에 프레임 전달 (위에서 슬롯이 빌 때까지 기다렸으므로 stop() 중이 아니면 항상 있음)
+                    if free:
+                        slot = free.pop(0)
+                        ring.write(slot, img_np)
+                        self._frame_times[(self._gen, slot)] = source.frame_time or t0
+                        seq += 1
+                        conn.send(("frame", self._gen, slot, seq, img_np.shape))
+                        self.timer.lap("write", t_ns)
+
+                    # 도착한 결과 처리 (결과를 기다리며 막히지 않도록 poll)
+                    while conn.poll():
+                        got = self._handle(conn.recv(), free)
+                        if got is not None:
+                            changed, near = got
+                    self.timer.lap("frame", start_ns)
+
+                    # 다음 캡처까지 대기 (대기 중 도착한 결과는 바로 처리하되 RateController 간격은 지킴)
+                    delay = self.rate.next_delay(time.perf_counter() - t0, changed, near >= self.rate.near_ratio)
+                    deadline = time.perf_counter() + delay
+                    while self.is_running:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0 or not conn.poll(remaining):
+                            break
+                        got = self._handle(conn.recv(), free)
+                        if got is not None:
+                            changed, near = got
+
+                # 프레임 소스가 끝난 경우 워커에 보낸 프레임의 결과까지 받고 종료
+                if ring is not None:
+                    self._drain(conn, free, ring.slots)
+        except Exception as e:
+            self.log_signal.emit({"time": "에러", "strat": self.strategy, "prog": "예외", "result": "중단", "note": str(e)})
+        finally:
+            try:
+                conn.send(("stop",))
+            except (OSError, BrokenPipeError):
+                pass
+            self.proc.join(timeout=2.0)
+            if self.proc.is_alive():
+                self.proc.terminate()
+            conn.close()
+            if ring is not None:
+                ring.close(unlink=True)
+            if self._own_dispatcher:
+                self.dispatcher.close()
+            if self.stats_path:
+                try:
+                    self.timer.dump(self.stats_path, {"rate": self.rate.stats(), "worker": self.worker_stats,
+                                                      "dispatch": self.dispatcher.stats()})
+                except OSError as e:
+                    print(f"계측 저장 실패: {e}")
+
+    def stats(self):
+        """부모 단계와 워커 단계를 합친 스냅샷 (워커 단계는 최대 stats_every초 늦을 수 있음)"""
+        return {**self.worker_stats, **self.timer.snapshot(), **self.dispatcher.timer.snapshot()}
+
+    def stop(self):
+        self.is_running = False
+        self.frame_source.interrupt()
+        self.wait()
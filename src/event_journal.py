@@ -0,0 +1,165 @@
+import os
+import glob
+import json
+import time
+import queue
+import threading
+
+# 이벤트 저널: AppController.logAppended로 나가는 모든 로그를 파일에 남김
+# - write()는 큐에 넣기만 하므로 GUI/감지 스레드가 디스크 I/O로 막히지 않음 (큐가 가득 차면 버리고 dropped 증가)
+# - 백그라운드 스레드가 flush_interval마다(또는 batch_size개가 모이면) 한 번에 기록
+# - 파일 형식: 한 줄에 한 이벤트 "ts_ms<TAB>strat<TAB>json\n" (UTF-8, 덧붙이기 전용)
+#   앞의 두 필드만 보고 시간/전략을 거를 수 있어 읽을 때 필요한 줄만 JSON 해석
+# - 파일 이름: events-YYYYMMDD-NNN.log (날짜가 바뀌거나 max_bytes를 넘으면 다음 파일로 교체)
+
+
+def _day_of(ts_ms):
+    return time.strftime("%Y%m%d", time.localtime(ts_ms / 1000.0))
+
+
+class EventJournal:
+    """로그 이벤트를 백그라운드에서 일괄 기록하는 저널"""
+
+    def __init__(self, directory="journal", max_bytes=16 * 1024 * 1024, flush_interval=0.5,
+                 batch_size=500, queue_size=100000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0 # 큐가 가득 차 버린 이벤트 수
+        self.written = 0
+        self._queue = queue.Queue(queue_size)
+        self._file = None
+        self._day = None
+        self._part = 0
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._loop, name="EventJournal", daemon=True)
+        self._thread.start()
+
+    def attach(self, controller):
+        """AppController.logAppended 구독"""
+        controller.logAppended.connect(self.write)
+        return self
+
+    def write(self, event):
+        """이벤트 기록 요청 (즉시 반환)"""
+        try:
+            self._queue.put_nowait((int(time.time() * 1000), event))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """남은 이벤트를 모두 기록하고 파일을 닫음"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _open(self, day):
+        # 같은 날짜의 마지막 파일에 이어 쓰고, 가득 찼으면 다음 번호로
+        self._day = day
+        parts = sorted(glob.glob(os.path.join(self.directory, f"events-{day}-*.log")))
+        self._part = int(parts[-1][-7:-4]) if parts else 0
+        path = os.path.join(self.directory, f"events-{day}-{self._part:03d}.log")
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            self._part += 1
+            path = os.path.join(self.directory, f"events-{day}-{self._part:03d}.log")
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self, day):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if day == self._day:
+            self._part += 1
+            path = os.path.join(self.directory, f"events-{day}-{self._part:03d}.log")
+            self._file = open(path, "ab")
+            self._size = self._file.tell()
+        else:
+            self._open(day)
+
+    def _write_batch(self, batch):
+        chunk = []
+        for ts_ms, event in batch:
+            day = _day_of(ts_ms)
+            if day != self._day or self._size >= self.max_bytes:
+                if chunk:
+                    self._file.write(b"".join(chunk))
+                    chunk = []
+                self._rotate(day)
+            strat = str(event.get("strat", "")).replace("\t", " ")
+            line = f"{ts_ms}\t{strat}\t{json.dumps(event, ensure_ascii=False, default=str)}\n".encode("utf-8")
+            chunk.append(line)
+            self._size += len(line)
+        if chunk:
+            self._file.write(b"".join(chunk))
+        self._file.flush()
+        self.written += len(batch)
+
+    def _loop(self):
+        stop = False
+        try:
+            while not stop:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                # 첫 이벤트를 받은 뒤 잠깐 모아서 한 번에 기록
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        self._write_batch(batch)
+                    except OSError as e:
+                        self.dropped += len(batch)
+                        print(f"저널 기록 실패: {e}")
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_events(directory="journal", day=None, strat=None, start=None, end=None):
+    """저널에서 이벤트를 읽음 → (ts_ms, event) 생성기
+
+    day: "YYYYMMDD" (없으면 start 기준 날짜, 그것도 없으면 오늘)
+    strat: 전략 이름(예: "1전략")이 같은 이벤트만
+    start/end: epoch 초 범위 (start 이상, end 미만)
+    """
+    if day is None:
+        day = _day_of((start if start is not None else time.time()) * 1000)
+    lo = None if start is None else int(start * 1000)
+    hi = None if end is None else int(end * 1000)
+    want = None if strat is None else strat.encode("utf-8")
+    for path in sorted(glob.glob(os.path.join(directory, f"events-{day}-*.log"))):
+        with open(path, "rb") as f:
+            for line in f:
+                # 앞의 두 필드만 잘라 비교하고, 통과한 줄만 JSON 해석
+                try:
+                    ts_b, strat_b, payload = line.split(b"\t", 2)
+                    ts_ms = int(ts_b)
+                except ValueError:
+                    continue # 비정상 종료로 잘린 마지막 줄
+                if lo is not None and ts_ms < lo:
+                    continue
+                if hi is not None and ts_ms >= hi:
+                    continue
+                if want is not None and strat_b != want:
+                    continue
+                try:
+                    event = json.loads(payload)
+                except ValueError:
+                    continue
+                yield ts_ms, event
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# 주파수 영역 정규화 상호상관 (TM_CCOEFF_NORMED와 같은 척도)
+# - 분자: 평균을 뺀 템플릿과 화면의 상호상관을 DFT 곱으로 계산 (채널별 합)
+#   화면 스펙트럼은 한 프레임(영역)당 한 번만 구해 모든 스케일이 공유하고,
+#   템플릿 스펙트럼은 (템플릿 해시, 스케일, 그레이, DFT 크기)별로 캐시
+# - 분모: 창마다의 화면 분산을 적분 영상(cv2.integral2)으로 구함 (창 크기와 무관하게 O(1))
+# - 큰 영역(전체 모니터 캡처)과 큰 템플릿에서 공간 영역 matchTemplate보다 유리할 수 있으므로
+#   CostChooser가 크기 조합별로 두 방식을 실제로 재 보고 빠른 쪽을 고름
+# - 스케일 병렬 작업이 같은 인스턴스를 함께 쓰므로 템플릿 캐시와 비용 표는 각자의 잠금 안에서만 바꿈
+
+FFT_OFF = "off"
+FFT_ON = "on"
+FFT_AUTO = "auto"
+FFT_MODES = (FFT_OFF, FFT_ON, FFT_AUTO)
+
+
+class FftMatcher:
+    """DFT 기반 TM_CCOEFF_NORMED 계산기 (템플릿 스펙트럼 캐시 보유)"""
+
+    def __init__(self, max_templates=32):
+        self.max_templates = max_templates
+        self._templates = OrderedDict() # {(키, DFT 크기): (채널별 스펙트럼, 템플릿 제곱합)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def dft_size(screen):
+        return cv2.getOptimalDFTSize(screen.shape[0]), cv2.getOptimalDFTSize(screen.shape[1])
+
+    @staticmethod
+    def _channels(img):
+        return [img] if img.ndim == 2 else cv2.split(img)
+
+    def frame_data(self, screen, size):
+        """화면 영역의 채널별 스펙트럼과 적분 영상 (match_frame 동안 영역별로 재사용)"""
+        spectra, integrals = [], []
+        for ch in self._channels(screen):
+            padded = np.zeros(size, np.float32)
+            padded[:ch.shape[0], :ch.shape[1]] = ch
+            spectra.append(cv2.dft(padded, flags=cv2.DFT_COMPLEX_OUTPUT))
+            integrals.append(cv2.integral2(ch, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F))
+        return spectra, integrals
+
+    def template_data(self, tpl, key, size):
+        """평균을 뺀 템플릿의 채널별 스펙트럼과 제곱합 (캐시)"""
+        cache_key = (key, size)
+        with self._lock:
+            data = self._templates.get(cache_key)
+            if data is not None:
+                self._templates.move_to_end(cache_key)
+                return data
+        spectra, norm2 = [], 0.0
+        for ch in self._channels(tpl):
+            zero_mean = ch.astype(np.float32) - float(ch.mean())
+            norm2 += float((zero_mean.astype(np.float64) ** 2).sum())
+            padded = np.zeros(size, np.float32)
+            padded[:ch.shape[0], :ch.shape[1]] = zero_mean
+            spectra.append(cv2.dft(padded, flags=cv2.DFT_COMPLEX_OUTPUT))
+        data = (spectra, norm2)
+        with self._lock:
+            self._templates[cache_key] = data
+            if len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return data
+
+    def match(self, screen, tpl, key, frame=None):
+        """영역 전체 매칭 → (최고 점수, (x, y)). frame은 frame_data() 결과 (없으면 새로 계산)"""
+        H, W = screen.shape[:2]
+        h, w = tpl.shape[:2]
+        if H < h or W < w:
+            return -1.0, (0, 0)
+        size = self.dft_size(screen)
+        spectra, integrals = frame if frame is not None else self.frame_data(screen, size)
+        t_spectra, t_norm2 = self.template_data(tpl, key, size)
+        out_h, out_w = H - h + 1, W - w + 1
+        n = float(h * w)
+
+        # 분자: 채널별 상호상관의 합
+        num = None
+        for f_img, f_tpl in zip(spectra, t_spectra):
+            prod = cv2.mulSpectrums(f_img, f_tpl, 0, conjB=True)
+            corr = cv2.idft(prod, flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE)[:out_h, :out_w]
+            num = corr if num is None else num + corr
+
+        # 분모: 창별 화면 분산(채널 합) x 템플릿 제곱합
+        var = np.zeros((out_h, out_w), np.float64)
+        for s1, s2 in integrals:
+            box1 = s1[h:h + out_h, w:w + out_w] - s1[:out_h, w:w + out_w] - s1[h:h + out_h, :out_w] + s1[:out_h, :out_w]
+            box2 = s2[h:h + out_h, w:w + out_w] - s2[:out_h, w:w + out_w] - s2[h:h + out_h, :out_w] + s2[:out_h, :out_w]
+            var += box2 - box1 * box1 / n
+        denom = np.sqrt(np.maximum(var, 0.0) * t_norm2)
+        res = np.where(denom > 1e-6 * max(t_norm2, 1.0), num / np.maximum(denom, 1e-12), 0.0).astype(np.float32)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        return max_val, max_loc
+
+
+class CostChooser:
+    """(영역 크기, 템플릿 크기) 조합별로 공간/FFT 방식의 실측 시간을 비교해 빠른 쪽을 선택
+
+    각 방식을 probes번씩 재 본 뒤 중앙값이 작은 쪽을 사용하고, reprobe번마다 진 쪽을 한 번 다시 잼
+    키는 최근에 쓴 max_keys개만 보관 (변경 영역/ROI로 영역 크기가 계속 바뀌어도 표가 커지지 않음)
+    """
+
+    SPATIAL = "spatial"
+    FFT = "fft"
+
+    def __init__(self, probes=2, reprobe=500, max_keys=64):
+        self.probes = probes
+        self.reprobe = reprobe
+        self.max_keys = max_keys
+        self._costs = OrderedDict() # {키: {"spatial": [ms...], "fft": [ms...], "calls": n}} - 최근 사용 순
+        self._lock = threading.Lock()
+
+    def choose(self, key):
+        with self._lock:
+            c = self._costs.get(key)
+            if c is None:
+                c = self._costs[key] = {self.SPATIAL: [], self.FFT: [], "calls": 0}
+                if len(self._costs) > self.max_keys:
+                    self._costs.popitem(last=False)
+            else:
+                self._costs.move_to_end(key)
+            c["calls"] += 1
+            for path in (self.SPATIAL, self.FFT):
+                if len(c[path]) < self.probes:
+                    return path
+            best = self._best(c)
+            if self.reprobe and c["calls"] % self.reprobe == 0:
+                return self.FFT if best == self.SPATIAL else self.SPATIAL
+            return best
+
+    def _best(self, c):
+        if c is None or not c[self.SPATIAL] or not c[self.FFT]:
+            return None
+        return self.SPATIAL if np.median(c[self.SPATIAL]) <= np.median(c[self.FFT]) else self.FFT
+
+    def best(self, key):
+        with self._lock:
+            return self._best(self._costs.get(key))
+
+    def choices(self):
+        """측정이 끝난 키별 선택 {키: "spatial"|"fft"}"""
+        with self._lock:
+            picks = {key: self._best(c) for key, c in self._costs.items()}
+        return {key: best for key, best in picks.items() if best is not None}
+
+    def record(self, key, path, ms):
+        with self._lock:
+            c = self._costs.get(key)
+            if c is None: # 측정 중에 다른 키에 밀려남
+                return
+            samples = c[path]
+            samples.append(ms)
+            del samples[:-self.probes * 2] # 최근 값만 유지
+
+    def timed(self, key, path, fn, *args):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        self.record(key, path, (time.perf_counter() - t0) * 1000.0)
+        return out
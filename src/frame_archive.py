@@ -0,0 +1,175 @@
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+
+from frame_source import FrameSource
+
+# 세션 프레임 기록/재생
+# - 감시 영역 프레임을 PNG(무손실, 빠른 압축 수준)로 인코딩해 frames.bin 하나에 이어 붙이고
+#   index.bin에 (오프셋, 길이, 캡처 시각, 높이, 너비, 채널)을 고정 크기 레코드로 추가
+# - 두 파일 모두 덧붙이기만 하므로 프로그램이 비정상 종료돼도 이미 기록된 프레임은 그대로 읽을 수 있음
+# - 읽을 때는 두 파일을 메모리 맵으로 열어 임의 프레임을 바로 디코딩 → 여러 프로세스가 구간을 나눠 읽기 쉬움
+# - 인코딩/디스크 쓰기는 백그라운드 스레드에서 하므로 감지 루프는 큐에 넣는 비용만 부담
+# - 종료 시에는 남은 프레임을 close_timeout초까지만 기록하고 나머지는 버림 (감지기 정지가 인코딩을 기다리지 않도록)
+
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4"), ("ts", "<f8"),
+                        ("h", "<u2"), ("w", "<u2"), ("c", "<u1")])
+
+
+class FrameRecorder:
+    """프레임을 압축해 세션 폴더(frames.bin + index.bin)에 기록"""
+
+    def __init__(self, path, compression=1, queue_size=256, close_timeout=1.0):
+        self.path = path
+        self.compression = compression # PNG 압축 수준 (0~9, 낮을수록 빠름)
+        self.close_timeout = close_timeout # close()가 남은 프레임 기록을 기다리는 최대 시간(초)
+        self.dropped = 0 # 큐가 가득 차 버린 프레임 수 (디스크/CPU가 밀릴 때)
+        self.lost = 0 # close() 시간 안에 기록하지 못해 버린 프레임 수
+        self.count = 0
+        self._deadline = None # close() 후 이 시각(time.monotonic)이 지나면 남은 프레임은 버림
+        os.makedirs(path, exist_ok=True)
+        self._data = open(os.path.join(path, "frames.bin"), "ab")
+        self._index = open(os.path.join(path, "index.bin"), "ab")
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._loop, name="FrameRecorder", daemon=True)
+        self._thread.start()
+
+    def add(self, frame, ts=None):
+        """프레임 기록 요청 (즉시 반환). ts는 epoch 초, 없으면 현재 시각"""
+        try:
+            # 캡처 버퍼가 재사용될 수 있으므로 복사본을 넘김
+            self._queue.put_nowait((time.time() if ts is None else ts, frame.copy()))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """남은 프레임을 close_timeout초까지 기록하고 종료 (못 쓴 프레임은 lost로 세고 버림)"""
+        if self._thread.is_alive():
+            self._deadline = time.monotonic() + self.close_timeout
+            self._queue.put(None) # 기한이 지나면 기록 스레드가 큐를 빠르게 비우므로 오래 막히지 않음
+            self._thread.join()
+        self._data.close()
+        self._index.close()
+        if self.lost:
+            print(f"프레임 기록 종료: {self.lost}개 기록 못 함 ({self.path})")
+
+    def _loop(self):
+        params = [cv2.IMWRITE_PNG_COMPRESSION, self.compression]
+        offset = self._data.seek(0, os.SEEK_END)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._deadline is not None and time.monotonic() > self._deadline:
+                self.lost += 1
+                continue
+            ts, frame = item
+            ok, buf = cv2.imencode(".png", frame, params)
+            if not ok:
+                self.dropped += 1
+                continue
+            rec = np.zeros(1, INDEX_DTYPE)
+            h, w = frame.shape[:2]
+            rec[0] = (offset, len(buf), ts, h, w, 1 if frame.ndim == 2 else frame.shape[2])
+            self._data.write(buf.tobytes())
+            self._index.write(rec.tobytes())
+            offset += len(buf)
+            self.count += 1
+            if self._queue.empty():
+                self._data.flush()
+                self._index.flush()
+
+
+class FrameArchive:
+    """FrameRecorder로 기록한 세션 읽기 (메모리 맵)"""
+
+    def __init__(self, path):
+        self.path = path
+        index_path = os.path.join(path, "index.bin")
+        data_path = os.path.join(path, "frames.bin")
+        if not os.path.exists(index_path):
+            raise IOError(f"기록 세션 없음: {path}")
+        # 비정상 종료로 잘린 마지막 레코드는 버림
+        n = os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+        self.index = np.memmap(index_path, INDEX_DTYPE, "r", shape=(n,)) if n else np.zeros(0, INDEX_DTYPE)
+        data_size = os.path.getsize(data_path)
+        if n:
+            self.index = self.index[self.index["offset"] + self.index["length"] <= data_size]
+        self.data = np.memmap(data_path, np.uint8, "r") if data_size else np.zeros(0, np.uint8)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def timestamps(self):
+        return np.asarray(self.index["ts"])
+
+    def read(self, i):
+        """i번째 프레임 디코딩 (기록할 때의 채널 수 그대로)"""
+        rec = self.index[i]
+        start = int(rec["offset"])
+        buf = self.data[start:start + int(rec["length"])]
+        return cv2.imdecode(np.asarray(buf), cv2.IMREAD_UNCHANGED)
+
+
+class ArchiveFrameSource(FrameSource):
+    """기록 세션을 프레임 소스로 재생 (최대 속도). start/stop으로 구간 지정"""
+
+    def __init__(self, path, start=0, stop=None):
+        super().__init__()
+        self.path = path
+        self.start = start
+        self.stop = stop
+        self.archive = None
+        self.ts = None # 마지막 프레임의 기록 시각 (epoch 초)
+        self._pos = start
+
+    def open(self):
+        self.archive = FrameArchive(self.path)
+        self._pos = self.start
+
+    def grab(self):
+        end = len(self.archive) if self.stop is None else min(self.stop, len(self.archive))
+        if self._pos >= end:
+            return None
+        frame = self.archive.read(self._pos)
+        self.ts = float(self.archive.index[self._pos]["ts"])
+        self._pos += 1
+        self.frame_time = time.perf_counter()
+        self.frame_index += 1
+        return frame
+
+
+class RecordingFrameSource(FrameSource):
+    """다른 프레임 소스를 감싸 grab한 프레임을 FrameRecorder에 함께 기록"""
+
+    def __init__(self, inner, path, compression=1):
+        super().__init__()
+        self.inner = inner
+        self.path = path
+        self.compression = compression
+        self.recorder = None
+
+    def open(self):
+        self.inner.open()
+        self.recorder = FrameRecorder(self.path, self.compression)
+
+    def grab(self):
+        frame = self.inner.grab()
+        if frame is not None:
+            self.recorder.add(frame)
+            self.frame_time = self.inner.frame_time
+            self.frame_index = self.inner.frame_index
+        return frame
+
+    def interrupt(self):
+        self.inner.interrupt()
+
+    def close(self):
+        self.inner.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
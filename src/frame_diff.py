@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+
+# 변경 감지 게이트: 캡처와 매칭 사이에서 이전 프레임과 비교
+# - 바뀐 곳이 없으면 매칭을 통째로 건너뜀 (장이 조용할 때 CPU 절약)
+# - 바뀐 타일이 있으면 그 타일들 + 템플릿 크기 여유만큼만 매칭하도록 사각형 목록을 돌려줌
+#   (HTS 차트는 보통 오른쪽 끝 얇은 띠만 갱신됨)
+
+
+class FrameDiffGate:
+    """이전 프레임과 타일 단위로 비교해 매칭할 영역을 결정"""
+
+    def __init__(self, tile=32, tolerance=0):
+        self.tile = tile # 타일 한 변(px)
+        self.tolerance = tolerance # 이 값 이하의 픽셀 차이는 무시 (안티앨리어싱/깜빡임 대비)
+        self._prev = None
+
+    def reset(self):
+        """다음 프레임을 전체 매칭하도록 이전 프레임을 버림"""
+        self._prev = None
+
+    def _store(self, frame):
+        if self._prev is None or self._prev.shape != frame.shape:
+            self._prev = frame.copy()
+        else:
+            np.copyto(self._prev, frame) # 버퍼 재사용
+
+    def dirty_mask(self, frame):
+        """바뀐 타일 표시 맵 (타일 행 x 타일 열, uint8)"""
+        diff = cv2.absdiff(frame, self._prev)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        changed = (diff > self.tolerance).view(np.uint8)
+        rows = np.arange(0, changed.shape[0], self.tile)
+        cols = np.arange(0, changed.shape[1], self.tile)
+        tiles = np.maximum.reduceat(np.maximum.reduceat(changed, rows, axis=0), cols, axis=1)
+        return tiles
+
+    def update(self, frame, margin_w=0, margin_h=0):
+        """프레임을 넣고 매칭할 영역을 반환
+
+        None: 처음이거나 크기가 바뀌어 전체를 매칭해야 함
+        []: 변경 없음 → 매칭 생략
+        [(x, y, w, h), ...]: 바뀐 타일을 템플릿 크기(margin)만큼 넓혀 합친 영역
+        """
+        if self._prev is None or self._prev.shape != frame.shape:
+            self._store(frame)
+            return None
+
+        # 빠른 경로: 프레임 전체 최대 차이만 먼저 확인
+        if cv2.norm(frame, self._prev, cv2.NORM_INF) <= self.tolerance:
+            return []
+
+        tiles = self.dirty_mask(frame)
+        self._store(frame)
+
+        # 템플릿이 바뀐 픽셀에 조금이라도 걸치는 위치를 모두 포함하도록 타일 단위로 팽창 후 연결 영역 추출
+        grow_x = -(-max(0, margin_w - 1) // self.tile)
+        grow_y = -(-max(0, margin_h - 1) // self.tile)
+        if grow_x or grow_y:
+            kernel = np.ones((2 * grow_y + 1, 2 * grow_x + 1), np.uint8)
+            tiles = cv2.dilate(tiles, kernel)
+        n, labels, stats, _ = cv2.connectedComponentsWithStats(tiles, connectivity=8)
+
+        h_f, w_f = frame.shape[:2]
+        rects = []
+        for i in range(1, n):
+            tx, ty, tw, th = stats[i][:4]
+            x0, y0 = tx * self.tile, ty * self.tile
+            x1, y1 = min(w_f, (tx + tw) * self.tile), min(h_f, (ty + th) * self.tile)
+            rects.append((x0, y0, x1 - x0, y1 - y0))
+        return rects
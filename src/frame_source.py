@@ -0,0 +1,317 @@
+import os
+import glob
+import time
+import cv2
+import numpy as np
+
+# 감지 스레드에 화면 프레임을 공급하는 캡처 백엔드 모음
+# - MssFrameSource: mss로 실제 화면을 캡처 (기존 동작)
+# - ReplayFrameSource: PNG 시퀀스/동영상 파일을 기록 속도 또는 최대 속도로 재생
+# - SyntheticFrameSource: 노이즈 배경에 템플릿(buy_signal.png 등)을 알려진 위치에 붙여 넣어 생성
+# 모든 백엔드는 grab()에서 numpy 프레임(BGR, BGRA 또는 그레이)을 반환하고, 더 이상 프레임이 없으면 None을 반환
+# 반환한 프레임은 소스가 버퍼를 재사용할 수 있으므로 다음 grab() 이후까지 보관하려면 복사해야 함
+# (FrameRecorder, FrameDiffGate, CaptureService는 이미 복사해서 보관)
+
+
+class BufferPool:
+    """같은 크기의 프레임 버퍼를 돌려 쓰는 풀 - 매 프레임 새 배열을 할당하지 않기 위함
+
+    get()이 돌려준 버퍼는 size번 뒤의 get()에서 다시 쓰임. 크기가 바뀌면 이전 버퍼는 버림
+    """
+
+    def __init__(self, size=2):
+        self.size = size
+        self._key = None
+        self._buffers = []
+        self._next = 0
+
+    def get(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype))
+        if key != self._key:
+            self._key = key
+            self._buffers = []
+            self._next = 0
+        if len(self._buffers) < self.size:
+            self._buffers.append(np.empty(shape, dtype))
+            return self._buffers[-1]
+        buf = self._buffers[self._next]
+        self._next = (self._next + 1) % self.size
+        return buf
+
+
+def to_bgr(frame, pool=None):
+    """BGRA/그레이 프레임을 OpenCV 매칭용 BGR로 변환 (이미 BGR이면 그대로 반환)
+
+    pool(BufferPool)을 주면 결과를 풀의 버퍼에 씀 (새 배열 할당 없음)
+    """
+    if frame.ndim == 3 and frame.shape[2] == 3:
+        return frame
+    code = cv2.COLOR_GRAY2BGR if frame.ndim == 2 else cv2.COLOR_BGRA2BGR
+    dst = pool.get(frame.shape[:2] + (3,)) if pool is not None else None
+    return cv2.cvtColor(frame, code, dst=dst)
+
+
+def to_gray(frame, pool=None):
+    """BGR/BGRA 프레임을 그레이로 변환 (이미 그레이면 그대로 반환). pool은 to_bgr과 같음"""
+    if frame.ndim == 2:
+        return frame
+    code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    dst = pool.get(frame.shape[:2]) if pool is not None else None
+    return cv2.cvtColor(frame, code, dst=dst)
+
+
+class FrameSource:
+    """프레임 공급자 공통 인터페이스"""
+
+    def __init__(self):
+        self.frame_time = None # 마지막 프레임의 캡처 시각 (time.perf_counter 기준)
+        self.frame_index = -1
+        self.timer = None # StageTimer를 넣으면 소스 내부 단계(grab/copy 등)도 기록
+
+    def open(self):
+        pass
+
+    def grab(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def interrupt(self):
+        """다른 스레드에서 대기 중인 grab()을 깨움 (대기하지 않는 소스는 할 일 없음)"""
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class MssFrameSource(FrameSource):
+    """mss를 이용한 실시간 화면 캡처
+
+    mss가 받아 온 BGRA 버퍼를 복사 없이 numpy 배열로 감싸서 반환 (output="bgra")
+    output="bgr"/"gray"면 BufferPool의 버퍼에 바로 변환해 반환 (프레임마다 새 배열을 만들지 않음,
+    반환한 버퍼는 pool_size번 뒤의 grab()에서 덮어씀)
+    """
+
+    OUTPUTS = ("bgra", "bgr", "gray")
+
+    def __init__(self, region=None, monitor_index=1, output="bgra", pool_size=2):
+        super().__init__()
+        if output not in self.OUTPUTS:
+            raise ValueError(f"알 수 없는 출력 형식: {output}")
+        self.region = region # (x, y, w, h) 또는 None(전체 화면). 바꾸면 다음 grab()부터 반영
+        self.monitor_index = monitor_index
+        self.output = output
+        self.pool = BufferPool(pool_size)
+        self._sct = None
+        self._monitor = None
+        self._monitor_key = None
+
+    def open(self):
+        import mss # 고속 캡처 라이브러리 (실제 캡처할 때만 필요)
+        self._sct = mss.mss()
+        self._monitor_key = None
+
+    def monitor(self):
+        """mss에 넘길 캡처 영역 dict (영역이 바뀔 때만 새로 만듦)"""
+        key = (self.region, self.monitor_index)
+        if key != self._monitor_key:
+            if self.region:
+                x, y, w, h = self.region
+                self._monitor = {"top": y, "left": x, "width": w, "height": h}
+            else:
+                self._monitor = self._sct.monitors[self.monitor_index] # 전체 화면
+            self._monitor_key = key
+        return self._monitor
+
+    def _convert(self, shot):
+        # mss 버퍼(bytearray)를 그대로 감싼 뷰 - 복사 없음
+        view = np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4)
+        if self.output == "bgr":
+            return to_bgr(view, self.pool)
+        if self.output == "gray":
+            return to_gray(view, self.pool)
+        return view
+
+    def grab(self):
+        monitor = self.monitor()
+        timer = self.timer
+        if timer is not None:
+            t = timer.now()
+            shot = self._sct.grab(monitor)
+            t = timer.lap("grab", t)
+            img_np = self._convert(shot)
+            timer.lap("copy", t)
+        else:
+            img_np = self._convert(self._sct.grab(monitor))
+        self.frame_time = time.perf_counter()
+        self.frame_index += 1
+        return img_np
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+class ReplayFrameSource(FrameSource):
+    """PNG 시퀀스(폴더/글롭 패턴) 또는 동영상 파일을 재생
+
+    speed: "max"면 지연 없이 최대 속도, "recorded"(=1.0) 또는 숫자면 기록된 간격을 배속으로 재현
+    PNG 파일명이 밀리초 타임스탬프(예: 1700000000123.png)면 그 간격을, 아니면 fps 간격을 사용
+    """
+
+    VIDEO_EXTS = (".mp4", ".avi", ".mkv", ".mov", ".wmv")
+
+    def __init__(self, path, speed="max", fps=5.0, loop=False):
+        super().__init__()
+        self.path = path
+        self.speed = 1.0 if speed == "recorded" else speed
+        self.fps = fps
+        self.loop = loop
+        self._files = None
+        self._cap = None
+        self._pos = 0
+        self._t0_wall = None
+        self._t0_frame = None
+
+    def open(self):
+        if os.path.splitext(self.path)[1].lower() in self.VIDEO_EXTS:
+            self._cap = cv2.VideoCapture(self.path)
+            if not self._cap.isOpened():
+                raise IOError(f"동영상 열기 실패: {self.path}")
+        else:
+            pattern = os.path.join(self.path, "*.png") if os.path.isdir(self.path) else self.path
+            self._files = sorted(glob.glob(pattern))
+            if not self._files:
+                raise IOError(f"재생할 프레임 없음: {self.path}")
+        self._pos = 0
+        self._t0_wall = None
+
+    def _file_timestamp(self, idx):
+        # 파일명이 숫자(ms)면 기록 시각으로 사용
+        stem = os.path.splitext(os.path.basename(self._files[idx]))[0]
+        if stem.isdigit():
+            return int(stem) / 1000.0
+        return idx / self.fps
+
+    def _read_next(self):
+        if self._cap is not None:
+            ok, frame = self._cap.read()
+            if not ok:
+                if not self.loop:
+                    return None, None
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self._t0_wall = None
+                ok, frame = self._cap.read()
+                if not ok:
+                    return None, None
+            t = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            return frame, t
+
+        if self._pos >= len(self._files):
+            if not self.loop:
+                return None, None
+            self._pos = 0
+            self._t0_wall = None
+        idx = self._pos
+        self._pos += 1
+        frame = cv2.imread(self._files[idx], cv2.IMREAD_UNCHANGED)
+        return frame, self._file_timestamp(idx)
+
+    def grab(self):
+        frame, t = self._read_next()
+        if frame is None:
+            return None
+
+        # 기록 속도 재현: 첫 프레임 기준으로 경과 시간을 맞춰 대기
+        if self.speed != "max":
+            now = time.perf_counter()
+            if self._t0_wall is None:
+                self._t0_wall, self._t0_frame = now, t
+            else:
+                due = self._t0_wall + (t - self._t0_frame) / float(self.speed)
+                if due > now:
+                    time.sleep(due - now)
+
+        self.frame_time = time.perf_counter()
+        self.frame_index += 1
+        return frame
+
+    def close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class SyntheticFrameSource(FrameSource):
+    """노이즈 배경 위에 템플릿을 알려진 위치에 합성한 프레임 생성기
+
+    signal_every 프레임마다 템플릿을 붙여 넣으며, 붙인 위치는 last_positions에 [(x, y), ...]로 기록
+    배경은 미리 bank_size장 만들어 두고 순환 사용 (생성 비용이 측정을 왜곡하지 않도록)
+    """
+
+    def __init__(self, template, size=(800, 600), frames=None, signal_every=10, positions=None,
+                 scale=1.0, noise=40, channels=4, bank_size=4, seed=0):
+        super().__init__()
+        tpl = cv2.imread(template) if isinstance(template, str) else template
+        if tpl is None:
+            raise IOError(f"이미지 로드 실패: {template}")
+        if scale != 1.0:
+            tpl = cv2.resize(tpl, (max(1, int(tpl.shape[1] * scale)), max(1, int(tpl.shape[0] * scale))))
+        self.template = to_bgr(tpl)
+        self.width, self.height = size
+        self.frames = frames # None이면 무한
+        self.signal_every = signal_every # 0/None이면 신호 없음
+        self.positions = positions # None이면 난수 위치
+        self.noise = noise
+        self.channels = channels
+        self.last_positions = []
+        self._rng = np.random.default_rng(seed)
+
+        h_t, w_t = self.template.shape[:2]
+        if w_t > self.width or h_t > self.height:
+            raise ValueError("템플릿이 프레임보다 큽니다")
+
+        # 차트 배경처럼 어두운 바탕 + 약한 노이즈
+        self._bank = []
+        for _ in range(max(1, bank_size)):
+            bg = self._rng.integers(0, noise + 1, size=(self.height, self.width, 3), dtype=np.uint8)
+            self._bank.append(bg)
+
+    def _position(self, n):
+        h_t, w_t = self.template.shape[:2]
+        if self.positions:
+            x, y = self.positions[n % len(self.positions)]
+            return min(max(0, x), self.width - w_t), min(max(0, y), self.height - h_t)
+        x = int(self._rng.integers(0, self.width - w_t + 1))
+        y = int(self._rng.integers(0, self.height - h_t + 1))
+        return x, y
+
+    def is_signal_frame(self, idx):
+        return bool(self.signal_every) and idx % self.signal_every == self.signal_every - 1
+
+    def grab(self):
+        idx = self.frame_index + 1
+        if self.frames is not None and idx >= self.frames:
+            return None
+
+        frame = self._bank[idx % len(self._bank)].copy()
+        self.last_positions = []
+        if self.is_signal_frame(idx):
+            h_t, w_t = self.template.shape[:2]
+            x, y = self._position(idx // self.signal_every)
+            frame[y:y + h_t, x:x + w_t] = self.template
+            self.last_positions.append((x, y))
+
+        if self.channels == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA) # mss와 같은 BGRA 형식
+
+        self.frame_time = time.perf_counter()
+        self.frame_index = idx
+        return frame
@@ -0,0 +1,360 @@
+import threading
+import cv2
+from concurrent.futures import as_completed, wait
+
+from color_prefilter import ColorPrefilter
+from fft_match import FFT_AUTO, FFT_MODES, FFT_OFF, FFT_ON, CostChooser, FftMatcher
+
+# 템플릿 매칭 코어 (Qt와 무관) - 감지 스레드/벤치마크/헤드리스 실행이 같은 코드를 사용
+# 매칭 모드
+# - "exhaustive": 영역 전체를 원본 해상도로 matchTemplate (기존 방식)
+# - "pyramid": 축소한 화면/템플릿으로 후보 위치를 찾은 뒤, 후보 주변 작은 창만 원본 해상도로 확인
+#   최종 점수는 원본 해상도 TM_CCOEFF_NORMED 값이므로 기존 방식과 같은 척도
+# 스케일 순서: 직전에 감지된 스케일을 먼저 시도하고, executor가 있으면 나머지 스케일을 스레드 풀에 나눠
+# 평가 (OpenCV는 연산 중 GIL을 놓으므로 병렬 효과 있음). 하나라도 threshold를 넘으면 남은 작업은 취소하고
+# 실행 중인 작업이 끝날 때까지 기다림 (match_frame이 끝난 뒤 재사용되는 화면 버퍼를 작업이 읽지 않도록)
+# 작업은 최고 점수를 반환값으로 돌려주고 best_score는 호출한 스레드에서만 갱신
+# ROI 추적: 최근 감지 위치 주변 작은 창을 먼저 찾고, 없을 때만 전체 영역으로 넘어감 (RoiTracker)
+# 색 전처리: 템플릿의 주요 색 덩어리가 있는 후보 영역에서만 매칭 (ColorPrefilter)
+# FFT 경로: 영역 전체 매칭을 주파수 영역 NCC(FftMatcher)로 계산. fft="auto"면 크기 조합별 실측 시간으로
+# 공간/FFT 중 빠른 쪽을 자동 선택 (CostChooser). 화면 스펙트럼은 match_frame 동안 모든 스케일이 공유
+
+MATCH_EXHAUSTIVE = "exhaustive"
+MATCH_PYRAMID = "pyramid"
+MATCH_MODES = (MATCH_EXHAUSTIVE, MATCH_PYRAMID)
+
+
+def match_exhaustive(screen, tpl):
+    """영역 전체 매칭 → (최고 점수, (x, y))"""
+    if screen.shape[0] < tpl.shape[0] or screen.shape[1] < tpl.shape[1]:
+        return -1.0, (0, 0)
+    res = cv2.matchTemplate(screen, tpl, cv2.TM_CCOEFF_NORMED)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+    return max_val, max_loc
+
+
+def top_candidates(res, count, supp_w, supp_h):
+    """점수 맵에서 상위 count개 위치 (주변 supp_w x supp_h는 억제하며 차례로 선택)"""
+    res = res.copy()
+    out = []
+    for _ in range(count):
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        if max_val <= -1.0:
+            break
+        out.append((max_val, max_loc))
+        x, y = max_loc
+        res[max(0, y - supp_h):y + supp_h + 1, max(0, x - supp_w):x + supp_w + 1] = -1.0
+    return out
+
+
+def refine(screen, tpl, candidates, factor):
+    """축소 좌표 후보 주변의 원본 해상도 작은 창에서만 매칭 → (최고 점수, (x, y))"""
+    h_t, w_t = tpl.shape[:2]
+    h_s, w_s = screen.shape[:2]
+    margin = factor * 2 # 축소로 생기는 위치 오차 보정
+    best_val, best_loc = -1.0, (0, 0)
+    for _, (cx, cy) in candidates:
+        x0 = max(0, cx * factor - margin)
+        y0 = max(0, cy * factor - margin)
+        x1 = min(w_s, cx * factor + margin + w_t)
+        y1 = min(h_s, cy * factor + margin + h_t)
+        val, loc = match_exhaustive(screen[y0:y1, x0:x1], tpl)
+        if val > best_val:
+            best_val, best_loc = val, (x0 + loc[0], y0 + loc[1])
+    return best_val, best_loc
+
+
+def intersect(a, b):
+    """두 사각형 (x, y, w, h)의 교집합. 없으면 None"""
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+class RoiTracker:
+    """최근 감지 위치(cv2.minMaxLoc 결과)와 스케일을 기억해 다음 프레임의 우선 탐색 창을 제공
+
+    감지될 때마다 해당 위치의 가중치를 1로 되돌리고, 창에서 못 찾은 프레임마다 decay를 곱해
+    min_weight 아래로 떨어지면 잊음
+    """
+
+    def __init__(self, window=48, decay=0.8, max_tracks=4, min_weight=0.2):
+        self.window = window # 감지 위치 주변으로 넓힐 여유(px)
+        self.decay = decay
+        self.max_tracks = max_tracks
+        self.min_weight = min_weight
+        self.tracks = [] # [[x, y, w_t, h_t, scale, weight], ...]
+
+    def windows(self, bounds):
+        """탐색 창 목록 [(x, y, w, h), ...] - bounds(화면 전체 사각형) 안으로 자름"""
+        out = []
+        for x, y, w_t, h_t, _, _ in self.tracks:
+            rect = intersect((x - self.window, y - self.window, w_t + 2 * self.window, h_t + 2 * self.window), bounds)
+            if rect is not None:
+                out.append(rect)
+        return out
+
+    def hit(self, loc, size, scale):
+        """감지 위치 갱신 (기존 창 안이면 그 추적을 이동, 아니면 새로 추가)"""
+        for t in self.tracks:
+            if abs(t[0] - loc[0]) <= self.window and abs(t[1] - loc[1]) <= self.window:
+                t[:] = [loc[0], loc[1], size[0], size[1], scale, 1.0]
+                break
+        else:
+            self.tracks.append([loc[0], loc[1], size[0], size[1], scale, 1.0])
+        self.tracks.sort(key=lambda t: -t[5])
+        del self.tracks[self.max_tracks:]
+
+    def miss(self):
+        """추적 창에서 못 찾음 → 가중치 감소, 약해진 추적 제거"""
+        for t in self.tracks:
+            t[5] *= self.decay
+        self.tracks = [t for t in self.tracks if t[5] >= self.min_weight]
+
+
+class TemplateMatcher:
+    """TemplateCache의 스케일별 템플릿을 한 프레임에 대해 매칭"""
+
+    def __init__(self, cache, scales, threshold, grayscale=False, mode=MATCH_EXHAUSTIVE,
+                 coarse_min=16, candidates=3, executor=None, roi_window=0, roi_decay=0.8, prefilter=False,
+                 timer=None, fft=FFT_OFF):
+        if mode not in MATCH_MODES:
+            raise ValueError(f"알 수 없는 매칭 모드: {mode}")
+        if fft not in FFT_MODES:
+            raise ValueError(f"알 수 없는 FFT 모드: {fft}")
+        self.cache = cache
+        self.scales = scales
+        self.threshold = threshold
+        self.grayscale = grayscale
+        self.mode = mode
+        self.coarse_min = coarse_min # 축소 템플릿의 최소 변 길이(px)
+        self.candidates = candidates # 원본 해상도로 확인할 후보 수
+        self.executor = executor # 스케일 병렬 평가용 ThreadPoolExecutor (None이면 순차)
+        self.last_scale = None # 직전에 감지된 스케일 (다음 프레임에서 먼저 시도)
+        self.best_score = -1.0 # 마지막 match_frame에서 평가한 최고 점수 (미감지여도 기록)
+        # roi_window>0이면 최근 감지 위치 주변 창을 먼저 탐색
+        self.roi = RoiTracker(roi_window, roi_decay) if roi_window > 0 else None
+        # prefilter=True면 색 마스크로 후보 영역을 먼저 고름 (템플릿이 다시 캡처되면 색 범위도 다시 계산)
+        self.prefilter = prefilter
+        self._color = None
+        self._color_digest = None
+        self._small = None # match_frame 동안 재사용하는 축소 화면 {(영역 주소, 크기, factor): ndarray}
+        self.timer = timer # StageTimer가 있으면 resize/match 단계 시간을 기록
+        self.fft = fft
+        self._fft = FftMatcher() if fft != FFT_OFF else None
+        self._chooser = CostChooser() if fft == FFT_AUTO else None
+        self._fft_frames = None # match_frame 동안 재사용하는 화면 스펙트럼 {(영역 주소, 크기): frame_data}
+
+    def pyramid_factor(self, tpl):
+        """템플릿 최소 변이 coarse_min 이상 남도록 하는 2의 거듭제곱 축소 배율 (1이면 축소 불가)"""
+        factor = 1
+        while min(tpl.shape[:2]) // (factor * 2) >= self.coarse_min:
+            factor *= 2
+        return factor
+
+    def _small_screen(self, screen, factor):
+        key = (screen.__array_interface__["data"][0], screen.shape, factor) # 같은 프레임 안에서 영역을 구분
+        cache = self._small # 병렬 작업 중 None으로 바뀔 수 있으므로 지역 변수로 고정
+        small = cache.get(key) if cache is not None else None
+        if small is None:
+            t = self.timer.now() if self.timer is not None else 0
+            small = cv2.resize(screen, (screen.shape[1] // factor, screen.shape[0] // factor), interpolation=cv2.INTER_AREA)
+            if self.timer is not None:
+                self.timer.lap("resize", t)
+            if cache is not None:
+                cache[key] = small
+        return small
+
+    def _fft_match(self, screen, scale, tpl):
+        size = FftMatcher.dft_size(screen)
+        key = (screen.__array_interface__["data"][0], screen.shape, size)
+        cache = self._fft_frames # 병렬 작업 중 None으로 바뀔 수 있으므로 지역 변수로 고정
+        frame = cache.get(key) if cache is not None else None
+        if frame is None:
+            frame = self._fft.frame_data(screen, size)
+            if cache is not None:
+                cache[key] = frame
+        return self._fft.match(screen, tpl, (self.cache.digest, scale, self.grayscale), frame)
+
+    def _match_full(self, screen, scale, tpl):
+        """영역 전체 매칭 (fft 설정에 따라 공간/FFT 경로 선택)"""
+        if self.fft == FFT_OFF:
+            return match_exhaustive(screen, tpl)
+        if self.fft == FFT_ON:
+            return self._fft_match(screen, scale, tpl)
+        # 영역 크기는 DFT 크기로 묶어 비슷한 크기(변경 영역/ROI/색 후보)끼리 측정값을 공유
+        key = (FftMatcher.dft_size(screen), tpl.shape)
+        if self._chooser.choose(key) == CostChooser.FFT:
+            return self._chooser.timed(key, CostChooser.FFT, self._fft_match, screen, scale, tpl)
+        return self._chooser.timed(key, CostChooser.SPATIAL, match_exhaustive, screen, tpl)
+
+    def fft_choices(self):
+        """fft="auto"에서 크기 조합별로 고른 경로 {"DFT 크기HxW/템플릿HxW": "spatial"|"fft"}"""
+        if self._chooser is None:
+            return {}
+        return {f"{area[0]}x{area[1]}/{tpl[0]}x{tpl[1]}": best for (area, tpl), best in self._chooser.choices().items()}
+
+    def match_scale(self, screen, scale, tpl):
+        """한 스케일 매칭 → (점수, (x, y))"""
+        if self.mode == MATCH_PYRAMID:
+            factor = self.pyramid_factor(tpl)
+            if factor > 1:
+                small_tpl = self.cache.get(scale, self.grayscale, factor)
+                small = self._small_screen(screen, factor)
+                if small.shape[0] >= small_tpl.shape[0] and small.shape[1] >= small_tpl.shape[1]:
+                    t = self.timer.now() if self.timer is not None else 0
+                    res = cv2.matchTemplate(small, small_tpl, cv2.TM_CCOEFF_NORMED)
+                    cands = top_candidates(res, self.candidates, small_tpl.shape[1] // 2, small_tpl.shape[0] // 2)
+                    hit = refine(screen, tpl, cands, factor)
+                    if self.timer is not None:
+                        self.timer.lap("match", t)
+                    return hit
+        if self.timer is None:
+            return self._match_full(screen, scale, tpl)
+        t = self.timer.now()
+        hit = self._match_full(screen, scale, tpl)
+        self.timer.lap("match", t)
+        return hit
+
+    def max_template_size(self):
+        """현재 스케일 목록 중 가장 큰 템플릿의 (w, h) - 변경 영역 여유폭 계산용"""
+        sizes = [tpl.shape[:2] for _, tpl in self.cache.variants(self.scales, self.grayscale)]
+        if not sizes:
+            return 0, 0
+        return max(w for _, w in sizes), max(h for h, _ in sizes)
+
+    def ordered_variants(self):
+        """직전 감지 스케일을 맨 앞으로 옮긴 [(scale, 템플릿), ...]"""
+        variants = self.cache.variants(self.scales, self.grayscale)
+        for i, (scale, _) in enumerate(variants):
+            if scale == self.last_scale and i > 0:
+                variants.insert(0, variants.pop(i))
+                break
+        return variants
+
+    def _match_areas(self, areas, scale, tpl, stop=None):
+        """한 스케일을 영역들에 대해 평가 → (최고 점수, threshold 이상인 결과 또는 None)
+
+        stop(threading.Event)이 설정되면 남은 영역은 건너뜀
+        """
+        best = -1.0
+        for x, y, area in areas:
+            if stop is not None and stop.is_set():
+                break
+            max_val, max_loc = self.match_scale(area, scale, tpl)
+            best = max(best, max_val)
+            if max_val >= self.threshold:
+                return best, (max_val, scale, (x + max_loc[0], y + max_loc[1]))
+        return best, None
+
+    def _match_parallel(self, areas, variants):
+        """스케일별 작업을 스레드 풀에 제출하고 먼저 threshold를 넘은 결과를 반환 → (최고 점수, 결과 또는 None)
+
+        결과가 나오면 대기 중인 작업은 취소하고, 실행 중인 작업은 현재 영역까지만 마치게 한 뒤 끝날 때까지 기다림
+        """
+        stop = threading.Event()
+        futures = [self.executor.submit(self._match_areas, areas, scale, tpl, stop) for scale, tpl in variants]
+        best, hit = -1.0, None
+        try:
+            for fut in as_completed(futures):
+                score, hit = fut.result()
+                best = max(best, score)
+                if hit is not None:
+                    break
+        finally:
+            stop.set()
+            for fut in futures:
+                fut.cancel()
+            wait(futures)
+        return best, hit
+
+    def _search(self, areas, variants):
+        """스케일 목록을 영역들에 대해 평가 (직전 감지 스케일 우선, executor가 있으면 병렬)
+
+        → (최고 점수, threshold 이상인 결과 또는 None)
+        """
+        best, hit = -1.0, None
+        if self.executor is not None and len(variants) > 1:
+            # 직전 감지 스케일은 바로 시도, 나머지는 병렬
+            first = variants[0][0] == self.last_scale
+            if first:
+                best, hit = self._match_areas(areas, *variants[0])
+            if hit is None:
+                score, hit = self._match_parallel(areas, variants[1:] if first else variants)
+                best = max(best, score)
+            return best, hit
+        for scale, tpl in variants:
+            score, hit = self._match_areas(areas, scale, tpl)
+            best = max(best, score)
+            if hit is not None:
+                break
+        return best, hit
+
+    def color_candidates(self, color_img):
+        """색 전처리 후보 영역. None이면 전처리 불가(전체 탐색)"""
+        if self._color_digest != self.cache.digest:
+            self._color = ColorPrefilter(self.cache.template)
+            self._color_digest = self.cache.digest
+        w_t, h_t = self.max_template_size()
+        return self._color.candidates(color_img, w_t, h_t, min(self.scales), max(self.scales))
+
+    def match_frame(self, screen, rects=None, color_img=None):
+        """스케일 순서대로 매칭해 threshold 이상이면 즉시 반환 → (점수, 스케일, (x, y)) 또는 None
+
+        rects가 주어지면 [(x, y, w, h), ...] 영역만 매칭하고 좌표는 화면 기준으로 되돌림
+        color_img는 색 전처리에 쓸 컬러 프레임 (screen이 그레이일 때 전달, 없으면 screen 사용)
+        """
+        bounds = (0, 0, screen.shape[1], screen.shape[0])
+        if rects is None:
+            rects = [bounds]
+
+        if self.prefilter:
+            color_img = screen if color_img is None else color_img
+            if color_img.ndim == 3:
+                t = self.timer.now() if self.timer is not None else 0
+                cands = self.color_candidates(color_img)
+                if self.timer is not None:
+                    self.timer.lap("prefilter", t)
+                if cands is not None:
+                    # 후보 영역과 매칭 대상 영역의 교집합만 남김 (후보가 없으면 매칭할 곳도 없음)
+                    rects = [r for c in cands for r in (intersect(c, rc) for rc in rects) if r]
+                    if not rects:
+                        self.best_score = -1.0
+                        return None
+
+        self._small = {} # 스케일이 달라도 같은 영역의 축소 화면은 한 번만 생성
+        self._fft_frames = {} # 같은 영역의 화면 스펙트럼도 한 번만 계산
+        self.best_score = -1.0
+        try:
+            variants = self.ordered_variants()
+            hit = None
+            tried_roi = False
+            if self.roi is not None and self.roi.tracks:
+                # 1차: 최근 감지 위치 주변 창 (매칭 대상 영역과 겹치는 부분만)
+                windows = [r for w in self.roi.windows(bounds) for r in (intersect(w, rc) for rc in rects) if r]
+                if windows:
+                    tried_roi = True
+                    self.best_score, hit = self._search(self._areas(screen, windows), variants)
+            if hit is None:
+                if tried_roi:
+                    self.roi.miss()
+                # 2차: 전체 영역
+                best, hit = self._search(self._areas(screen, rects), variants)
+                self.best_score = max(self.best_score, best)
+            if hit is not None:
+                self.last_scale = hit[1]
+                if self.roi is not None:
+                    tpl = self.cache.get(hit[1], self.grayscale)
+                    self.roi.hit(hit[2], (tpl.shape[1], tpl.shape[0]), hit[1])
+            return hit
+        finally:
+            self._small = None
+            self._fft_frames = None
+
+    @staticmethod
+    def _areas(screen, rects):
+        if len(rects) == 1 and rects[0] == (0, 0, screen.shape[1], screen.shape[0]):
+            return [(0, 0, screen)]
+        return [(x, y, screen[y:y + h, x:x + w]) for x, y, w, h in rects]
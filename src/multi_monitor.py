@@ -0,0 +1,168 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from detection_engine import DetectionEngine
+from frame_source import FrameSource, MssFrameSource
+from matcher import intersect
+
+# 여러 모니터 감시
+# - 모니터마다 따로 캡처하고(가상 데스크톱 전체를 한 장으로 잡지 않음) 모니터별 DetectionEngine을 스레드 풀에서
+#   병렬로 평가 (OpenCV는 연산 중 GIL을 놓음)
+# - 감지 좌표는 모니터 원점을 더해 가상 데스크톱(전역) 좌표로 되돌림
+# - 모니터별 캡처/처리 시간을 StageTimer에 "grab@모니터", "process@모니터" 단계로 기록
+# - MultiMonitorFrameSource.grab()은 [(모니터 번호, (원점 x, y), 프레임), ...]을 반환하고
+#   MultiMonitorEngine.process()가 이를 받으므로 둘은 함께 사용
+
+
+def monitor_rects(mss_monitors, monitors="all", region=None):
+    """감시할 모니터 영역 [(모니터 번호, (x, y, w, h)), ...] - 전역 좌표
+
+    mss_monitors: mss.mss().monitors ([0]은 가상 데스크톱 전체, [1:]이 개별 모니터)
+    monitors: "all" 또는 모니터 번호 목록 (예: [1, 2])
+    region: 가상 데스크톱 좌표의 (x, y, w, h). 주면 각 모니터를 이 영역으로 자르고 겹치지 않는 모니터는 제외
+    """
+    indices = range(1, len(mss_monitors)) if monitors == "all" else monitors
+    out = []
+    for i in indices:
+        if not 1 <= i < len(mss_monitors):
+            raise ValueError(f"없는 모니터: {i} (모니터 {len(mss_monitors) - 1}개)")
+        m = mss_monitors[i]
+        rect = (m["left"], m["top"], m["width"], m["height"])
+        if region is not None:
+            rect = intersect(rect, tuple(region))
+            if rect is None:
+                continue
+        out.append((i, rect))
+    return out
+
+
+def parse_monitors(text):
+    """"all" 또는 "1,2" → "all" 또는 [1, 2]"""
+    text = text.strip()
+    return "all" if text == "all" else [int(v) for v in text.split(",") if v]
+
+
+class MultiMonitorFrameSource(FrameSource):
+    """모니터별로 따로 캡처 (grab() → [(모니터 번호, (x, y), 프레임), ...])"""
+
+    def __init__(self, monitors="all", region=None, output="bgra"):
+        super().__init__()
+        self.monitors = monitors
+        self.region = region
+        self.output = output
+        self.rects = [] # open() 후 [(모니터 번호, (x, y, w, h)), ...]
+        self.sources = []
+
+    def open(self):
+        import mss
+        with mss.mss() as sct:
+            self.rects = monitor_rects(sct.monitors, self.monitors, self.region)
+        if not self.rects:
+            raise IOError(f"캡처할 모니터 없음: monitors={self.monitors} region={self.region}")
+        self.sources = [MssFrameSource(rect, output=self.output) for _, rect in self.rects]
+        for source in self.sources:
+            source.open()
+
+    def grab(self):
+        timer = self.timer
+        tiles = []
+        for (index, rect), source in zip(self.rects, self.sources):
+            t = timer.now() if timer is not None else 0
+            frame = source.grab()
+            if timer is not None:
+                timer.lap(f"grab@{index}", t)
+            tiles.append((index, rect[:2], frame))
+        self.frame_time = self.sources[0].frame_time # 가장 먼저 잡은 모니터 기준 (지연을 작게 보지 않도록)
+        self.frame_index += 1
+        return tiles
+
+    def close(self):
+        for source in self.sources:
+            source.close()
+        self.sources = []
+
+
+class MultiMonitorEngine:
+    """모니터별 DetectionEngine을 병렬로 평가하고 결과를 템플릿별로 합침 (DetectionEngine과 같은 사용법)"""
+
+    def __init__(self, specs, timer=None, **engine_opts):
+        self.timer = timer
+        self.engine_opts = engine_opts
+        self.engines = {} # {모니터 번호: DetectionEngine} - 모니터마다 ROI/변경 감지 상태를 따로 가짐
+        self._spare = DetectionEngine(specs, timer=timer, **engine_opts) # 템플릿 로드 확인용, 첫 모니터가 사용
+        self.specs = self._spare.specs
+        self.failed = self._spare.failed
+        self.executor = None # 모니터 병렬 평가용 스레드 풀 (모니터 2개 이상일 때 생성)
+        self._workers = 0
+        self.reloaded = []
+        self.closeness = 0.0
+
+    def _engine(self, index):
+        engine = self.engines.get(index)
+        if engine is None:
+            if self._spare is not None:
+                engine, self._spare = self._spare, None
+            else:
+                engine = DetectionEngine(self.specs, timer=self.timer, **self.engine_opts)
+            self.engines[index] = engine
+        return engine
+
+    def _process_one(self, index, origin, frame, now):
+        engine = self._engine(index)
+        t = self.timer.now() if self.timer is not None else 0
+        results = engine.process(frame, now)
+        if self.timer is not None:
+            self.timer.lap(f"process@{index}", t)
+        for r in results or []:
+            r["monitor"] = index
+            if r["loc"] is not None:
+                r["loc"] = (origin[0] + r["loc"][0], origin[1] + r["loc"][1])
+        return results
+
+    def process(self, tiles, now=None):
+        """[(모니터 번호, (x, y), 프레임), ...] → 템플릿별 결과 목록 (DetectionEngine.process와 같은 형식 + "monitor")
+
+        모든 모니터가 변경 없음으로 생략되면 None
+        """
+        now = time.time() if now is None else now
+        for index, _, _ in tiles:
+            self._engine(index) # 엔진 생성은 풀에 넣기 전에 (생성 순서를 모니터 순서로 고정)
+        if len(tiles) == 1:
+            per_monitor = [self._process_one(*tiles[0], now)]
+        else:
+            if self.executor is None or self._workers < len(tiles):
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                self.executor = ThreadPoolExecutor(len(tiles), thread_name_prefix="monitor")
+                self._workers = len(tiles)
+            futures = [self.executor.submit(self._process_one, index, origin, frame, now) for index, origin, frame in tiles]
+            per_monitor = [f.result() for f in futures]
+
+        engines = [self.engines[index] for index, _, _ in tiles]
+        self.reloaded = sorted({p for e in engines for p in e.reloaded})
+        self.closeness = max(e.closeness for e in engines)
+        if all(results is None for results in per_monitor):
+            return None
+        merged = []
+        for spec in self.specs:
+            cands = [r for results in per_monitor for r in results or [] if r["name"] == spec.name]
+            # 발사 > 감지 > 최고 점수 순으로 대표 결과 선택
+            best = max(cands, key=lambda r: (r["fire"], r["hit"], r["score"] or -1.0, r["best"]))
+            best = dict(best, best=max(r["best"] for r in cands))
+            if best["fire"]:
+                # 다른 모니터에서 같은 템플릿이 곧바로 다시 발사되지 않도록 쿨다운 공유
+                for e in self.engines.values():
+                    e.last_trigger[spec.name] = now
+            merged.append(best)
+        return merged
+
+    def reset(self):
+        for e in self.engines.values():
+            e.reset()
+
+    def close(self):
+        for e in list(self.engines.values()) + ([self._spare] if self._spare is not None else []):
+            e.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+
+from stage_timer import StageTimer
+
+# 주문(단축키) 전송 전담 스레드
+# - 감지 루프는 submit()으로 큐에 넣고 바로 다음 프레임으로 넘어감 (키 입력/창 전환 대기가 감지를 막지 않음)
+# - (전략, 템플릿)별로 중복 제거: 같은 주문이 큐에 이미 있거나 전송 중이면 버림
+#   (쿨다운은 감지 엔진이 템플릿별로 적용하므로 여기서는 다시 적용하지 않음)
+# - 전송 백엔드는 교체 가능: PyAutoGuiSender(실제 키 입력, PAUSE=0) / StubSender(기록만, 테스트용)
+# - 창 전환(WindowFocuser)은 선택 사항이며, 창 핸들을 캐시해 매번 FindWindow를 하지 않음
+# - 감지→전송 시작 지연("detect_to_dispatch")과 전송 소요 시간("dispatch")을 StageTimer로 기록
+
+try:
+    import win32gui, win32con
+except ImportError:
+    win32gui = win32con = None
+
+
+class PyAutoGuiSender:
+    """pyautogui로 단축키 전송. 호출마다 붙는 기본 대기(pyautogui.PAUSE)는 pause로 대체"""
+
+    def __init__(self, pause=0.0):
+        self.pause = pause
+        self._pyautogui = None
+
+    def __call__(self, *keys):
+        if self._pyautogui is None:
+            import pyautogui # 화면이 없는 환경에서도 모듈을 불러올 수 있도록 첫 전송 때 import
+            pyautogui.PAUSE = self.pause
+            self._pyautogui = pyautogui
+        self._pyautogui.hotkey(*keys)
+
+
+class StubSender:
+    """키를 누르지 않고 (키, 시각)만 기록하는 백엔드 (테스트/리눅스용)"""
+
+    def __init__(self):
+        self.sent = [] # [(keys, perf_counter), ...]
+
+    def __call__(self, *keys):
+        self.sent.append((keys, time.perf_counter()))
+
+
+class WindowFocuser:
+    """주문 창을 맨 앞으로 (창 핸들 캐시, 이미 앞에 있으면 아무것도 안 함)"""
+
+    def __init__(self, window_name, settle=0.05):
+        self.window_name = window_name
+        self.settle = settle # 창을 실제로 전환했을 때만 기다리는 시간
+        self.hwnd = None
+
+    def focus(self):
+        if win32gui is None:
+            return False
+        if not self.hwnd or not win32gui.IsWindow(self.hwnd):
+            self.hwnd = win32gui.FindWindow(None, self.window_name) # 정확한 창 이름 필요
+            if not self.hwnd:
+                return False
+        if win32gui.GetForegroundWindow() == self.hwnd:
+            return True
+        try:
+            if win32gui.IsIconic(self.hwnd): # 최소화 되어있으면 복구
+                win32gui.ShowWindow(self.hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(self.hwnd)
+            time.sleep(self.settle)
+            return True
+        except Exception:
+            self.hwnd = None
+            return False
+
+
+class OrderDispatcher:
+    """감지 이벤트를 받아 별도 스레드에서 단축키를 보내는 주문 전송기"""
+
+    def __init__(self, sender=None, focuser=None, log=None, queue_size=64, threaded=True):
+        self.sender = sender if sender is not None else PyAutoGuiSender()
+        self.focuser = focuser # WindowFocuser 또는 None(창 전환 없이 전송)
+        self.log = log # 로그 dict를 받는 함수 (예: log_signal.emit)
+        self.threaded = threaded # False면 submit()에서 바로 전송 (벤치마크처럼 순서가 중요한 경우)
+        self.timer = StageTimer()
+        self.sent = 0
+        self.deduped = 0 # 같은 주문이 이미 대기 중이라 버린 수
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(queue_size)
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._loop, name="OrderDispatcher", daemon=True)
+            self._thread.start()
+
+    def submit(self, strategy, name, keys, detected_at=None, info=None):
+        """주문 요청. 큐에 넣었으면(또는 바로 보냈으면) True
+
+        detected_at: 감지한 프레임의 캡처 시각 (time.perf_counter 기준, 지연 계측용)
+        """
+        if not keys:
+            return False
+        key = (strategy, name)
+        order = (key, tuple(keys), time.perf_counter() if detected_at is None else detected_at, info)
+        with self._lock:
+            if key in self._pending:
+                self.deduped += 1
+                return False
+            if self.threaded:
+                self._pending.add(key)
+        if not self.threaded:
+            self._dispatch(order)
+            return True
+        try:
+            self._queue.put_nowait(order)
+        except queue.Full:
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _dispatch(self, order):
+        key, keys, detected_at, info = order
+        start = time.perf_counter()
+        try:
+            if self.focuser is not None:
+                self.focuser.focus()
+            self.sender(*keys)
+        except Exception as e:
+            if self.log:
+                self.log({"time": "에러", "strat": key[0], "prog": "주문", "result": "전송 실패", "note": str(e)})
+            return
+        end = time.perf_counter()
+        with self._lock:
+            self.sent += 1
+        self.timer.add("detect_to_dispatch", int((start - detected_at) * 1e9))
+        self.timer.add("dispatch", int((end - start) * 1e9))
+        if self.log:
+            self.log({"time": "주문", "strat": key[0], "prog": "+".join(keys), "result": f"전송:{key[1]}",
+                      "note": f"지연 {(start - detected_at) * 1000:.1f}ms / 전송 {(end - start) * 1000:.1f}ms"})
+
+    def _loop(self):
+        while True:
+            order = self._queue.get()
+            if order is None:
+                break
+            self._dispatch(order)
+            with self._lock:
+                self._pending.discard(order[0]) # 전송이 끝날 때까지는 같은 주문을 중복으로 취급
+
+    def stats(self):
+        """{"stages": 지연 스냅샷, "sent", "deduped"}"""
+        return {"stages": self.timer.snapshot(), "sent": self.sent, "deduped": self.deduped}
+
+    def close(self):
+        """대기 중인 주문까지 보낸 뒤 스레드 종료"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=2.0)
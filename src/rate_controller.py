@@ -0,0 +1,67 @@
+import time
+from collections import deque
+
+# 적응형 폴링 스케줄러 (감지 루프의 고정 time.sleep(0.2)/sleep(1) 대체)
+# - 목표 프레임 간격에서 실제 처리 시간을 빼고 남은 만큼만 대기
+# - 화면 변화가 없으면 간격을 점점 늘리고(최대 max_interval), 점수가 threshold에 가까워지면 min_interval로 조임
+# - 처리 시간이 간격을 넘어 CPU가 포화되면 max_duty 비율을 넘지 않도록 쉬는 시간을 확보
+# - 예외가 나면 error_delay부터 두 배씩 늘려 대기(최대 max_error_delay), 정상 프레임이 오면 초기화
+# - 최근 프레임 기준 실제 달성 fps / 바쁜 비율을 stats()로 제공
+
+
+class RateController:
+    """감지 루프의 프레임 간격 제어기"""
+
+    def __init__(self, interval=0.2, min_interval=0.02, max_interval=1.0, near_ratio=0.9,
+                 idle_backoff=1.5, max_duty=0.8, error_delay=1.0, max_error_delay=8.0, window=50):
+        self.base_interval = interval # 평상시 목표 프레임 간격(초). 0이면 대기 없이 최대 속도
+        self.min_interval = min(min_interval, interval)
+        self.max_interval = max(max_interval, interval)
+        self.near_ratio = near_ratio # 최고 점수/threshold가 이 비율 이상이면 간격을 조임
+        self.idle_backoff = idle_backoff # 변화 없는 프레임마다 간격에 곱하는 배율
+        self.max_duty = max_duty # 처리 시간이 차지할 수 있는 최대 비율 (None이면 제한 없음)
+        self.error_delay = error_delay
+        self.max_error_delay = max_error_delay
+        self.current = interval
+        self._errors = 0
+        self._ends = deque(maxlen=window) # 최근 프레임 완료 시각
+        self._busy = deque(maxlen=window) # 최근 프레임 처리 시간
+
+    def next_delay(self, elapsed, changed=True, near=False):
+        """프레임 처리(elapsed초)를 마친 뒤 다음 캡처까지 대기할 시간"""
+        self._errors = 0
+        self._ends.append(time.perf_counter())
+        self._busy.append(elapsed)
+        if self.base_interval <= 0:
+            return 0.0
+
+        if near:
+            self.current = self.min_interval # 신호가 나타나려는 중 → 빠르게
+        elif not changed:
+            self.current = min(self.max_interval, max(self.current, self.min_interval) * self.idle_backoff)
+        else:
+            self.current = self.base_interval
+
+        delay = self.current - elapsed
+        if self.max_duty:
+            # CPU 포화 방지: 처리 시간 대비 최소 휴식 확보
+            delay = max(delay, elapsed * (1.0 - self.max_duty) / self.max_duty)
+        return max(0.0, delay)
+
+    def error_wait(self):
+        """예외 발생 후 대기 시간 (연속 오류 시 지수 증가)"""
+        delay = min(self.max_error_delay, self.error_delay * (2 ** self._errors))
+        self._errors += 1
+        return delay
+
+    def achieved_fps(self):
+        if len(self._ends) < 2:
+            return 0.0
+        span = self._ends[-1] - self._ends[0]
+        return (len(self._ends) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        """{"fps": 달성 fps, "interval": 현재 목표 간격, "busy": 처리 시간 비율}"""
+        fps = self.achieved_fps()
+        busy = sum(self._busy) / len(self._busy) if self._busy else 0.0
+        return {"fps": fps, "interval": self.current, "busy": busy * fps if fps else 0.0}
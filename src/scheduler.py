@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import threading
+import time
+import datetime
+
+from stage_timer import StageTimer
+
+# 예약 실행 엔진 (Qt와 무관)
+# - 작업을 (실행 예정 monotonic 시각) 힙으로 관리하고, 가장 이른 작업까지 Condition.wait로 잠들었다가 깨어남
+#   (매초 폴링하지 않음). 작업이 추가/수정되면 notify로 바로 다시 계산
+# - 벽시계 시각(HH:MM:SS)은 등록 시점에 monotonic 기준으로 환산하고, 오래 기다리는 동안 시계가 보정될 수 있으므로
+#   resync초마다 다시 환산
+# - OS 타이머 해상도(Windows 약 15ms)를 보정하려고 마지막 spin초는 짧게 양보하며 대기 → 밀리초 단위 정확도
+# - 작업은 매일 반복되며, 실행 후 다음 날 같은 시각으로 다시 등록
+# - 작업별 실제 실행 오차(ms)를 last_jitter와 StageTimer("jitter")에 기록
+
+
+def parse_clock(text):
+    """"HHMMSS" 또는 "HHMM" → datetime.time. 형식이 틀리면 None"""
+    text = (text or "").strip()
+    if not text.isdigit() or len(text) not in (4, 6):
+        return None
+    h, m, s = int(text[0:2]), int(text[2:4]), int(text[4:6] or 0)
+    if h > 23 or m > 59 or s > 59:
+        return None
+    return datetime.time(h, m, s)
+
+
+def next_wall_time(clock, now=None):
+    """오늘(지났으면 내일) clock 시각의 epoch 초"""
+    now = datetime.datetime.now() if now is None else now
+    target = datetime.datetime.combine(now.date(), clock)
+    if target <= now:
+        target += datetime.timedelta(days=1)
+    return target.timestamp()
+
+
+class Scheduler:
+    """매일 정해진 시각에 콜백을 실행하는 스케줄러 스레드"""
+
+    def __init__(self, spin=0.02, resync=60.0, on_fire=None):
+        self.spin = spin # 마지막 대기 구간(초) - 이 구간은 OS 타이머 대신 짧게 양보하며 시각 확인
+        self.resync = resync # 벽시계 → monotonic 재환산 주기(초)
+        self.on_fire = on_fire # 실행 후 호출되는 함수 (key, 실행 오차 ms)
+        self.jobs = {} # {key: (clock, callback, 세대)}
+        self.last_jitter = {} # {key: 마지막 실행 오차(ms)}
+        self.timer = StageTimer()
+        self._heap = [] # [(예정 monotonic, 벽시계 epoch, 순번, key, 세대), ...]
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="Scheduler", daemon=True)
+        self._thread.start()
+
+    def set_job(self, key, clock, callback):
+        """작업 등록/수정 (clock이 None이면 삭제). 이전 등록은 힙에서 지연 삭제"""
+        with self._cond:
+            if clock is None:
+                self.jobs.pop(key, None)
+            else:
+                gen = next(self._seq)
+                self.jobs[key] = (clock, callback, gen)
+                self._push(key, clock, gen)
+            self._cond.notify()
+
+    def remove(self, key):
+        self.set_job(key, None, None)
+
+    def _push(self, key, clock, gen, now=None):
+        wall = next_wall_time(clock, now)
+        due = time.monotonic() + (wall - time.time())
+        heapq.heappush(self._heap, (due, wall, next(self._seq), key, gen))
+
+    def _current(self, entry):
+        job = self.jobs.get(entry[3])
+        return job is not None and job[2] == entry[4]
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                # 수정/삭제로 무효가 된 항목 제거
+                while self._heap and not self._current(self._heap[0]):
+                    heapq.heappop(self._heap)
+                if not self._running:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, wall, _, key, gen = self._heap[0]
+                # 시계 보정 반영: 벽시계 목표 시각으로 다시 환산
+                due = time.monotonic() + (wall - time.time())
+                remaining = due - time.monotonic()
+                if remaining > self.spin:
+                    self._cond.wait(min(remaining - self.spin, self.resync))
+                    continue
+                heapq.heappop(self._heap)
+                clock, callback, _ = self.jobs[key]
+
+            # 마지막 구간: 짧게 양보하며 정확한 시각까지 대기
+            while time.monotonic() < due:
+                time.sleep(0)
+            jitter_ms = (time.monotonic() - due) * 1000.0
+            try:
+                callback()
+            except Exception as e:
+                print(f"예약 작업 실패 {key}: {e}")
+            self.last_jitter[key] = jitter_ms
+            self.timer.add("jitter", int(jitter_ms * 1e6))
+            if self.on_fire:
+                self.on_fire(key, jitter_ms)
+
+            with self._cond:
+                # 수정되지 않았으면 다음 날 같은 시각으로 재등록
+                job = self.jobs.get(key)
+                if job is not None and job[2] == gen:
+                    self._push(key, clock, gen, datetime.datetime.fromtimestamp(wall + 1))
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
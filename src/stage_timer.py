@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+import numpy as np
+
+# 감지 루프 단계별 소요 시간 계측 (운영 중에도 켜 둘 수 있도록 가볍게)
+# - 단계마다 최근 window개의 소요 시간(ns)을 고정 크기 링 배열에 기록 (할당 없음)
+# - 누적 횟수/최대값과 함께 스냅샷 시점에만 평균/p50/p99를 계산
+# 사용법:
+#     t = timer.now()
+#     ... 캡처 ...
+#     t = timer.lap("capture", t)   # 경과 시간을 기록하고 현재 시각을 돌려줌
+
+
+def summary_text(snapshot, stages=None):
+    """상태 표시줄용 짧은 요약 (예: "capture 3.1/7.9ms match 12.0/20.3ms" = p50/p99)"""
+    names = stages or list(snapshot)
+    return " ".join(f"{n} {snapshot[n]['p50_ms']:.1f}/{snapshot[n]['p99_ms']:.1f}ms" for n in names if n in snapshot)
+
+
+class StageStats:
+    """한 단계의 롤링 기록"""
+
+    def __init__(self, window):
+        self.samples = np.zeros(window, np.int64)
+        self.count = 0
+        self.max_ns = 0
+
+    def add(self, ns):
+        self.samples[self.count % len(self.samples)] = ns
+        self.count += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def summary(self):
+        n = min(self.count, len(self.samples))
+        if n == 0:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        recent = self.samples[:n] / 1e6
+        p50, p99 = np.percentile(recent, (50, 99))
+        return {"count": self.count, "mean_ms": float(recent.mean()), "p50_ms": float(p50),
+                "p99_ms": float(p99), "max_ms": self.max_ns / 1e6}
+
+
+class StageTimer:
+    """단계별 소요 시간 집계기 (여러 스레드에서 기록 가능)"""
+
+    def __init__(self, window=512, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now():
+        return time.perf_counter_ns()
+
+    def add(self, name, ns):
+        if not self.enabled:
+            return
+        with self._lock:
+            st = self.stages.get(name)
+            if st is None:
+                st = self.stages[name] = StageStats(self.window)
+            st.add(ns)
+
+    def lap(self, name, start_ns):
+        """start_ns 이후 경과 시간을 name 단계로 기록하고 현재 시각(ns)을 반환"""
+        now = time.perf_counter_ns()
+        self.add(name, now - start_ns)
+        return now
+
+    def snapshot(self):
+        """{단계: {"count", "mean_ms", "p50_ms", "p99_ms", "max_ms"}}"""
+        with self._lock:
+            return {name: st.summary() for name, st in self.stages.items()}
+
+    def dump(self, path, extra=None):
+        """스냅샷을 JSON 파일로 저장"""
+        data = {"saved": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": self.snapshot()}
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+import hashlib
+import cv2
+import numpy as np
+
+# 템플릿 스케일 피라미드 캐시
+# - 매 프레임마다 cv2.resize를 반복하지 않도록 스케일별(선택적으로 그레이스케일) 템플릿을 한 번만 만들어 둠
+# - 캐시 키는 (파일 내용 해시, 스케일, 그레이 여부, 축소 배율) → 같은 파일을 쓰는 감지기끼리 공유
+# - capture_tool.py가 buy_signal.png / sell_signal.png를 다시 저장하면 파일 변경을 감지해 자동으로 다시 읽음
+# - 저장소는 여러 감지 스레드/스케일 작업이 함께 쓰므로 읽기/쓰기는 _lock 안에서 (resize는 잠금 밖에서 수행)
+
+
+class TemplateCache:
+    """템플릿 파일 하나에 대한 스케일별 변형 캐시"""
+
+    MIN_SIZE = 10 # 이보다 작은 스케일 템플릿은 매칭에서 제외
+
+    # 모든 인스턴스가 공유하는 변형 저장소: {(sha1, scale, gray, downsample): ndarray}
+    _variants = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval # 파일 변경 확인 주기(초)
+        self.template = None # 원본 BGR 템플릿
+        self.digest = None
+        self._stat = None
+        self._last_check = 0.0
+        self._load()
+
+    def _load(self):
+        """파일을 읽어 해시/이미지를 갱신. 내용이 바뀌었으면 True"""
+        try:
+            st = os.stat(self.path)
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        self._stat = (st.st_mtime_ns, st.st_size)
+
+        digest = hashlib.sha1(data).hexdigest()
+        if digest == self.digest:
+            return False
+        # 캡처 도구가 저장 중인(불완전한) 파일이면 디코딩 실패 → 기존 템플릿 유지
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            return False
+
+        old = self.digest
+        self.digest = digest
+        self.template = img
+        if old is not None:
+            self._drop(old)
+        return True
+
+    @classmethod
+    def _drop(cls, digest):
+        with cls._lock:
+            for key in [k for k in cls._variants if k[0] == digest]:
+                del cls._variants[key]
+
+    def reload_if_changed(self):
+        """check_interval마다 파일 mtime/크기를 확인해 바뀌었으면 다시 읽음. 다시 읽었으면 True"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == self._stat:
+            return False
+        return self._load()
+
+    def get(self, scale, gray=False, downsample=1):
+        """스케일(및 그레이) 변형 템플릿. downsample>1이면 피라미드 매칭용 축소본. 너무 작으면 None"""
+        key = (self.digest, scale, gray, downsample)
+        with self._lock:
+            if key in self._variants:
+                return self._variants[key]
+
+        if downsample > 1:
+            base = self.get(scale, gray)
+            tpl = None
+            if base is not None:
+                size = (base.shape[1] // downsample, base.shape[0] // downsample)
+                tpl = cv2.resize(base, size, interpolation=cv2.INTER_AREA)
+        else:
+            h_t, w_t = self.template.shape[:2]
+            curr_w, curr_h = int(w_t * scale), int(h_t * scale)
+            if curr_w < self.MIN_SIZE or curr_h < self.MIN_SIZE:
+                tpl = None
+            else:
+                tpl = self.template if scale == 1.0 else cv2.resize(self.template, (curr_w, curr_h))
+                if gray:
+                    tpl = cv2.cvtColor(tpl, cv2.COLOR_BGR2GRAY)
+        with self._lock:
+            # 다른 스레드가 먼저 만들었으면 그쪽을 사용 (같은 키는 같은 배열을 공유)
+            return self._variants.setdefault(key, tpl)
+
+    def variants(self, scales, gray=False):
+        """[(scale, 템플릿), ...] - 너무 작은 스케일은 제외"""
+        out = []
+        for scale in scales:
+            tpl = self.get(scale, gray)
+            if tpl is not None:
+                out.append((scale, tpl))
+        return out
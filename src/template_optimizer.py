@@ -0,0 +1,226 @@
+"""
+template_optimizer.py
+- 캡처한 신호 영역(스닙)에서, 현재 화면에 대해 여전히 유일하게 높은 점수를 내는 가장 작은 부분 패치를 찾는 도구
+  (차트 배경이 많이 섞인 큰 템플릿은 matchTemplate이 느리고 변별력도 떨어짐)
+- 유일성 = 화면 전체 점수 맵에서 1등 봉우리와 2등 봉우리의 차이(margin). 1등이 원래 위치여야 하고 margin이
+  min_margin 이상이어야 통과
+- 후보는 크기(스닙의 20~100%) x 위치 격자에서 고르되, 크기마다 밝기 변화(표준편차)가 큰 위치 top_k개만 실제로 매칭
+  (평평한 배경 조각은 유일할 수 없음). 면적이 작은 크기부터 평가해 처음 통과한 크기에서 margin이 가장 큰 패치를 선택
+- 후보 선별은 그레이 화면으로(채널 1개라 빠름) 하고, 통과한 후보만 실제 매칭 방식(컬러/그레이)과 감지기 스케일 전부로
+  다시 확인 (어느 스케일에서든 2등 봉우리가 가까우면 오탐 위험이므로 탈락)
+- 스케일별 점수와 예상 스케일(expected_scale)을 메타데이터로 남김
+- capture_tool.py가 캡처 직후 호출하며, 저장한 화면 PNG로 따로 실행할 수도 있음
+- Usage:
+    python template_optimizer.py screen.png --rect 812,430,120,64 --out buy_signal.png
+    python template_optimizer.py screen.png --rect 812,430,120,64 --out sell_signal.png --grayscale --min-margin 0.2
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from matcher import top_candidates
+from template_cache import TemplateCache
+
+FRACTIONS = (0.2, 0.3, 0.4, 0.5, 0.65, 0.8, 1.0) # 스닙 대비 후보 패치 변 길이 비율
+
+
+def peak_margin(screen, patch):
+    """화면 전체 매칭 → (1등 점수, 1등 위치, 2등 점수). 2등은 1등 주변(패치 절반 크기)을 제외한 최고 봉우리"""
+    res = cv2.matchTemplate(screen, patch, cv2.TM_CCOEFF_NORMED)
+    peaks = top_candidates(res, 2, patch.shape[1] // 2, patch.shape[0] // 2)
+    best, loc = peaks[0]
+    second = peaks[1][0] if len(peaks) > 1 else -1.0
+    return best, loc, second
+
+
+def candidate_sizes(w, h, min_side):
+    """후보 패치 크기 [(w, h), ...] - 면적 오름차순"""
+    sizes = set()
+    for fx in FRACTIONS:
+        for fy in FRACTIONS:
+            cw = min(w, max(min_side, round(w * fx)))
+            ch = min(h, max(min_side, round(h * fy)))
+            sizes.add((cw, ch))
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s))
+
+
+def textured_positions(gray, size, top_k, min_std):
+    """size 크기 창 중 표준편차가 큰 위치 top_k개 [(x, y), ...] (적분 영상으로 모든 격자 위치를 한 번에 계산)"""
+    w, h = size
+    H, W = gray.shape
+    s1, s2 = cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    xs = sorted(set(range(0, W - w + 1, max(1, w // 4))) | {W - w})
+    ys = sorted(set(range(0, H - h + 1, max(1, h // 4))) | {H - h})
+    X, Y = np.meshgrid(np.array(xs), np.array(ys))
+    box1 = s1[Y + h, X + w] - s1[Y, X + w] - s1[Y + h, X] + s1[Y, X]
+    box2 = s2[Y + h, X + w] - s2[Y, X + w] - s2[Y + h, X] + s2[Y, X]
+    n = float(w * h)
+    std = np.sqrt(np.maximum(box2 / n - (box1 / n) ** 2, 0.0)).ravel()
+    order = np.argsort(-std)[:top_k]
+    return [(int(X.ravel()[i]), int(Y.ravel()[i])) for i in order if std[i] >= min_std]
+
+
+def match_ms(screen, patch, repeat=1):
+    """화면 전체 matchTemplate 1회 소요 시간(ms, repeat번 중 중앙값)"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cv2.matchTemplate(screen, patch, cv2.TM_CCOEFF_NORMED)
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(times))
+
+
+def scale_scores(screen, patch, origin, scales):
+    """감지기 스케일별 {스케일: {"score", "margin", "at_origin"}} - TemplateCache와 같은 방식으로 크기 변경"""
+    out = {}
+    for scale in scales:
+        w, h = int(patch.shape[1] * scale), int(patch.shape[0] * scale)
+        if w < TemplateCache.MIN_SIZE or h < TemplateCache.MIN_SIZE:
+            continue
+        tpl = patch if scale == 1.0 else cv2.resize(patch, (w, h))
+        best, loc, second = peak_margin(screen, tpl)
+        near = abs(loc[0] - origin[0]) <= max(2, w // 10) and abs(loc[1] - origin[1]) <= max(2, h // 10)
+        out[str(scale)] = {"score": round(best, 4), "margin": round(best - second, 4), "at_origin": near}
+    return out
+
+
+def optimize_template(screen, rect, grayscale=False, min_margin=0.15, min_score=0.95, min_side=16,
+                      scales=(0.9, 1.0, 1.1), top_k=3, min_std=6.0, max_evals=80, progress=None):
+    """화면(BGR)과 스닙 영역 rect=(x, y, w, h) → 결과 dict
+
+    progress(평가한 후보 수, max_evals)는 후보를 하나 평가할 때마다 호출 (capture_tool 진행 표시용)
+
+    {"ok", "patch"(ndarray), "rect"(스닙 기준), "screen_rect", "score", "second", "margin",
+     "baseline": 스닙 전체의 {"score", "second", "margin"}, "expected_scale", "scale_scores", "match_ms", "evaluated"}
+    ok=False면 통과한 패치가 없어 patch는 스닙 전체
+    """
+    x0, y0, w, h = rect
+    snip = screen[y0:y0 + h, x0:x0 + w]
+    gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+    target = gray if grayscale else screen
+    gray_snip = gray[y0:y0 + h, x0:x0 + w]
+    # 가장 작은 감지 스케일에서도 TemplateCache.MIN_SIZE 이상 남도록
+    min_side = max(min_side, int(np.ceil(TemplateCache.MIN_SIZE / min(scales))) + 1)
+
+    def evaluate(img, px, py, cw, ch):
+        patch = img[y0 + py:y0 + py + ch, x0 + px:x0 + px + cw]
+        best, loc, second = peak_margin(img, patch)
+        unique = loc == (x0 + px, y0 + py) and best >= min_score
+        return {"rect": [px, py, cw, ch], "score": best, "second": second, "margin": best - second, "unique": unique}
+
+    def verify(r):
+        # 실제 매칭 방식으로 다시 평가하고, 모든 감지 스케일에서 원래 위치가 1등이며 margin이 충분한지 확인
+        px, py, cw, ch = r["rect"]
+        r = evaluate(target, px, py, cw, ch) if target is not gray else r
+        patch = target[y0 + py:y0 + py + ch, x0 + px:x0 + px + cw]
+        r["scale_scores"] = scale_scores(target, patch, (x0 + px, y0 + py), scales)
+        r["unique"] = r["unique"] and r["margin"] >= min_margin and all(
+            v["at_origin"] and v["margin"] >= min_margin for v in r["scale_scores"].values())
+        return r
+
+    base = evaluate(target, 0, 0, w, h)
+    chosen = None
+    evaluated = 1
+    if w >= min_side and h >= min_side:
+        for cw, ch in candidate_sizes(w, h, min_side):
+            if (cw, ch) == (w, h) or evaluated >= max_evals:
+                break
+            passed = []
+            for px, py in textured_positions(gray_snip, (cw, ch), top_k, min_std):
+                r = evaluate(gray, px, py, cw, ch)
+                evaluated += 1
+                if progress is not None:
+                    progress(evaluated, max_evals)
+                if r["unique"] and r["margin"] >= min_margin:
+                    r = verify(r)
+                    if r["unique"]:
+                        passed.append(r)
+            if passed:
+                chosen = max(passed, key=lambda r: r["margin"])
+                break
+    ok = chosen is not None
+    if chosen is None:
+        chosen = verify(dict(base))
+
+    px, py, cw, ch = chosen["rect"]
+    patch = snip[py:py + ch, px:px + cw].copy()
+    origin = (x0 + px, y0 + py)
+    target_patch = target[origin[1]:origin[1] + ch, origin[0]:origin[0] + cw]
+    per_scale = chosen["scale_scores"]
+    usable = {s: v for s, v in per_scale.items() if v["at_origin"]} or per_scale
+    return {
+        "ok": ok,
+        "patch": patch,
+        "rect": chosen["rect"],
+        "screen_rect": [origin[0], origin[1], cw, ch],
+        "score": round(chosen["score"], 4),
+        "second": round(chosen["second"], 4),
+        "margin": round(chosen["margin"], 4),
+        "baseline": {"size": [w, h], "score": round(base["score"], 4), "second": round(base["second"], 4),
+                     "margin": round(base["margin"], 4)},
+        "expected_scale": float(max(usable, key=lambda s: usable[s]["score"])) if usable else 1.0,
+        "scale_scores": per_scale,
+        "match_ms": {"snip": round(match_ms(target, target[y0:y0 + h, x0:x0 + w]), 3),
+                     "patch": round(match_ms(target, target_patch), 3)},
+        "evaluated": evaluated,
+        "grayscale": grayscale,
+        "min_margin": min_margin,
+    }
+
+
+def save_result(result, path, snip=None, screen_size=None):
+    """패치를 path(예: buy_signal.png)에, 메타데이터를 같은 이름의 .json에 저장. snip이 있으면 *_full.png로 보관"""
+    stem = os.path.splitext(path)[0]
+    meta = {k: v for k, v in result.items() if k != "patch"}
+    meta.update(created=time.strftime("%Y-%m-%dT%H:%M:%S"), template=os.path.basename(path),
+                size=[int(result["patch"].shape[1]), int(result["patch"].shape[0])])
+    if screen_size is not None:
+        meta["screen_size"] = list(screen_size)
+    if snip is not None:
+        cv2.imwrite(stem + "_full.png", snip)
+        meta["full"] = os.path.basename(stem + "_full.png")
+    cv2.imwrite(path, result["patch"])
+    with open(stem + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def summary(result):
+    """한 줄 요약 (capture_tool 상태 표시/콘솔용)"""
+    b = result["baseline"]
+    w, h = result["patch"].shape[1], result["patch"].shape[0]
+    if not result["ok"]:
+        return f"최적화 실패: 유일한 부분 패치 없음 (원본 {b['size'][0]}x{b['size'][1]}, margin {b['margin']:.2f})"
+    return (f"{b['size'][0]}x{b['size'][1]} → {w}x{h}, margin {b['margin']:.2f} → {result['margin']:.2f}, "
+            f"매칭 {result['match_ms']['snip']:.1f} → {result['match_ms']['patch']:.1f}ms, 예상 스케일 {result['expected_scale']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("screen", help="전체 화면 이미지 (PNG)")
+    parser.add_argument("--rect", required=True, help='스닙 영역 "x,y,w,h" (화면 좌표)')
+    parser.add_argument("--out", default="buy_signal.png", help="패치 저장 경로 (메타데이터는 같은 이름의 .json)")
+    parser.add_argument("--grayscale", action="store_true", help="그레이스케일 매칭 기준으로 유일성 평가")
+    parser.add_argument("--min-margin", type=float, default=0.15, help="1등/2등 점수 차이 하한")
+    parser.add_argument("--scales", default="0.9,1.0,1.1", help="감지기 스케일 목록")
+    args = parser.parse_args()
+
+    screen = cv2.imread(args.screen, cv2.IMREAD_COLOR)
+    if screen is None:
+        sys.exit(f"이미지 로드 실패: {args.screen}")
+    rect = tuple(int(v) for v in args.rect.split(","))
+    t0 = time.perf_counter()
+    result = optimize_template(screen, rect, args.grayscale, args.min_margin,
+                               scales=[float(v) for v in args.scales.split(",") if v])
+    print(f"[optimize] {summary(result)} ({result['evaluated']} candidates, {time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    x, y, w, h = rect
+    save_result(result, args.out, screen[y:y + h, x:x + w], (screen.shape[1], screen.shape[0]))
+
+
+if __name__ == "__main__":
+    main()
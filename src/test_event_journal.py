@@ -0,0 +1,71 @@
+import datetime
+import os
+
+import event_journal
+from event_journal import EventJournal, read_events
+
+
+def _ts(day, hour, minute=0):
+    return datetime.datetime(2026, 3, day, hour, minute).timestamp()
+
+
+class _Clock:
+    """event_journal이 보는 time.time을 대신하는 고정 시계"""
+
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _write(directory, monkeypatch, events, **kw):
+    """events [(epoch 초, 이벤트), ...]를 그 시각에 기록한 것처럼 저널에 씀"""
+    clock = _Clock(0)
+    monkeypatch.setattr(event_journal.time, "time", clock)
+    journal = EventJournal(str(directory), flush_interval=0.01, **kw)
+    for t, event in events:
+        clock.t = t
+        journal.write(event)
+    journal.close()
+    monkeypatch.undo()
+    return journal
+
+
+def test_rotates_by_size_and_reads_back_in_order(tmp_path, monkeypatch):
+    events = [(_ts(2, 9, i), {"strat": "1전략", "n": i, "note": "x" * 40}) for i in range(20)]
+    journal = _write(tmp_path, monkeypatch, events, max_bytes=200)
+    assert journal.written == 20
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) > 1
+    assert all(f.startswith("events-20260302-") for f in files)
+    assert [e["n"] for _, e in read_events(str(tmp_path), day="20260302")] == list(range(20))
+
+
+def test_rotates_on_day_change(tmp_path, monkeypatch):
+    events = [(_ts(2, 23, 59), {"strat": "1전략", "n": 0}), (_ts(3, 0, 1), {"strat": "1전략", "n": 1})]
+    _write(tmp_path, monkeypatch, events)
+    assert sorted(os.listdir(tmp_path)) == ["events-20260302-000.log", "events-20260303-000.log"]
+    assert [e["n"] for _, e in read_events(str(tmp_path), start=_ts(3, 0))] == [1]
+
+
+def test_reopen_appends_to_last_part(tmp_path, monkeypatch):
+    _write(tmp_path, monkeypatch, [(_ts(2, 9), {"n": 0})])
+    _write(tmp_path, monkeypatch, [(_ts(2, 10), {"n": 1})])
+    assert os.listdir(tmp_path) == ["events-20260302-000.log"]
+    assert [e["n"] for _, e in read_events(str(tmp_path), day="20260302")] == [0, 1]
+
+
+def test_read_events_filters_by_strategy_and_time(tmp_path, monkeypatch):
+    events = [(_ts(2, 9, i), {"strat": "1전략" if i % 2 else "2전략", "n": i}) for i in range(6)]
+    _write(tmp_path, monkeypatch, events)
+    got = read_events(str(tmp_path), strat="1전략", start=_ts(2, 9, 2), end=_ts(2, 9, 5))
+    assert [(ts, e["n"]) for ts, e in got] == [(int(_ts(2, 9, 3) * 1000), 3)]
+
+
+def test_read_events_skips_truncated_line(tmp_path):
+    ts_ms = int(_ts(2, 9) * 1000)
+    with open(tmp_path / "events-20260302-000.log", "wb") as f:
+        f.write(f'{ts_ms}\t1전략\t{{"n": 0}}\n'.encode("utf-8"))
+        f.write(f'{ts_ms + 1}\t1전략\t{{"n": '.encode("utf-8")) # 비정상 종료로 잘린 줄
+    assert [e["n"] for _, e in read_events(str(tmp_path), day="20260302")] == [0]
@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+import pytest
+
+from fft_match import FftMatcher, CostChooser
+
+# FFT 정규화 상호상관이 cv2.matchTemplate(TM_CCOEFF_NORMED)와 같은 결과를 내는지 확인
+
+
+def _scene(channels, seed=0):
+    rng = np.random.default_rng(seed)
+    shape = (120, 160) if channels == 1 else (120, 160, channels)
+    screen = rng.integers(0, 256, shape, dtype=np.uint8)
+    tpl = screen[37:37 + 24, 51:51 + 33].copy()
+    return screen, tpl
+
+
+@pytest.mark.parametrize("channels", [1, 3])
+def test_match_equals_matchtemplate(channels):
+    screen, tpl = _scene(channels)
+    score, loc = FftMatcher().match(screen, tpl, "tpl")
+    ref = cv2.matchTemplate(screen, tpl, cv2.TM_CCOEFF_NORMED)
+    _, ref_score, _, ref_loc = cv2.minMaxLoc(ref)
+    assert loc == ref_loc == (51, 37)
+    assert score == pytest.approx(ref_score, abs=1e-3)
+
+
+def test_match_surface_equals_matchtemplate():
+    # 밝기/대비가 바뀐 사본이 있어도 두 방식의 최고 점수가 같은지
+    screen, tpl = _scene(3, seed=1)
+    screen[80:80 + 24, 100:100 + 33] = (tpl * 0.5 + 40).astype(np.uint8) # 밝기/대비만 바꾼 사본
+    ref = cv2.matchTemplate(screen, tpl, cv2.TM_CCOEFF_NORMED)
+    matcher = FftMatcher()
+    score, _ = matcher.match(screen, tpl, "tpl")
+    assert score == pytest.approx(float(ref.max()), abs=1e-3)
+    # 사본 위치도 정규화 덕분에 거의 1.0 (FFT 쪽도 같은 캐시 스펙트럼으로 다시 확인)
+    assert matcher.match(screen[70:, 90:], tpl, "tpl")[0] > 0.99
+
+
+def test_template_larger_than_screen():
+    screen = np.zeros((10, 10), np.uint8)
+    tpl = np.zeros((20, 5), np.uint8)
+    assert FftMatcher().match(screen, tpl, "big") == (-1.0, (0, 0))
+
+
+def test_template_cache_is_bounded():
+    matcher = FftMatcher(max_templates=2)
+    screen, tpl = _scene(1)
+    for key in ("a", "b", "c"):
+        matcher.match(screen, tpl, key)
+    size = FftMatcher.dft_size(screen)
+    assert list(matcher._templates) == [("b", size), ("c", size)]
+
+
+def test_cost_chooser_probes_then_picks_faster():
+    chooser = CostChooser(probes=2, reprobe=0)
+    key = ((128, 160), (24, 33))
+    picks = []
+    for _ in range(4):
+        path = chooser.choose(key)
+        picks.append(path)
+        chooser.record(key, path, 1.0 if path == CostChooser.FFT else 5.0)
+    assert picks == [CostChooser.SPATIAL] * 2 + [CostChooser.FFT] * 2
+    assert chooser.choose(key) == CostChooser.FFT
+    assert chooser.choices() == {key: CostChooser.FFT}
+
+
+def test_cost_chooser_keys_are_bounded():
+    chooser = CostChooser(max_keys=3)
+    for i in range(10):
+        chooser.choose(i)
+    chooser.record(0, CostChooser.SPATIAL, 1.0) # 밀려난 키 기록은 무시
+    assert list(chooser._costs) == [7, 8, 9]
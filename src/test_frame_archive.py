@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from frame_archive import FrameRecorder, FrameArchive, ArchiveFrameSource, INDEX_DTYPE
+
+
+def _frames():
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (24, 40, 4), dtype=np.uint8),
+            rng.integers(0, 256, (24, 40, 3), dtype=np.uint8),
+            rng.integers(0, 256, (30, 20), dtype=np.uint8)]
+
+
+def _record(path, frames, start_ts=1000.0):
+    recorder = FrameRecorder(str(path))
+    for i, frame in enumerate(frames):
+        recorder.add(frame, ts=start_ts + i)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip_is_lossless(tmp_path):
+    frames = _frames()
+    recorder = _record(tmp_path, frames)
+    assert (recorder.count, recorder.dropped, recorder.lost) == (3, 0, 0)
+    archive = FrameArchive(str(tmp_path))
+    assert len(archive) == 3
+    assert list(archive.timestamps) == [1000.0, 1001.0, 1002.0]
+    for i, frame in enumerate(frames):
+        np.testing.assert_array_equal(archive.read(i), frame)
+
+
+def test_recording_again_appends(tmp_path):
+    frames = _frames()
+    _record(tmp_path, frames[:1])
+    _record(tmp_path, frames[1:], start_ts=2000.0)
+    archive = FrameArchive(str(tmp_path))
+    assert list(archive.timestamps) == [1000.0, 2000.0, 2001.0]
+    np.testing.assert_array_equal(archive.read(2), frames[2])
+
+
+def test_truncated_records_are_ignored(tmp_path):
+    frames = _frames()
+    _record(tmp_path, frames)
+    # 비정상 종료: 인덱스 마지막 레코드 일부와 데이터 끝부분이 잘림
+    index = tmp_path / "index.bin"
+    index.write_bytes(index.read_bytes()[:-INDEX_DTYPE.itemsize // 2])
+    assert len(FrameArchive(str(tmp_path))) == 2
+    # 두 번째 프레임 데이터가 끝까지 기록되지 않은 경우
+    rec = FrameArchive(str(tmp_path)).index[1]
+    end = int(rec["offset"]) + int(rec["length"])
+    del rec # 메모리 맵을 놓아야 파일을 다시 쓸 수 있음 (Windows)
+    data = tmp_path / "frames.bin"
+    data.write_bytes(data.read_bytes()[:end - 1])
+    archive = FrameArchive(str(tmp_path))
+    assert len(archive) == 1
+    np.testing.assert_array_equal(archive.read(0), frames[0])
+
+
+def test_missing_session_raises(tmp_path):
+    with pytest.raises(IOError):
+        FrameArchive(str(tmp_path / "none"))
+
+
+def test_archive_source_replays_range(tmp_path):
+    frames = _frames()
+    _record(tmp_path, frames)
+    source = ArchiveFrameSource(str(tmp_path), start=1, stop=3)
+    source.open()
+    got = []
+    while (frame := source.grab()) is not None:
+        got.append((source.ts, frame))
+    assert [ts for ts, _ in got] == [1001.0, 1002.0]
+    np.testing.assert_array_equal(got[1][1], frames[2])
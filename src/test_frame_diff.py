@@ -0,0 +1,71 @@
+import numpy as np
+
+from frame_diff import FrameDiffGate
+
+
+def _frame():
+    return np.zeros((128, 256, 3), np.uint8)
+
+
+def test_first_frame_and_shape_change_need_full_match():
+    gate = FrameDiffGate(tile=32)
+    assert gate.update(_frame()) is None
+    assert gate.update(np.zeros((64, 64, 3), np.uint8)) is None
+
+
+def test_unchanged_frame_is_skipped():
+    gate = FrameDiffGate(tile=32)
+    gate.update(_frame())
+    assert gate.update(_frame()) == []
+
+
+def test_changed_pixel_marks_its_tile():
+    gate = FrameDiffGate(tile=32)
+    gate.update(_frame())
+    frame = _frame()
+    frame[40, 70] = 255 # 타일 (열 2, 행 1)
+    assert gate.update(frame) == [(64, 32, 32, 32)]
+
+
+def test_margin_dilates_and_clips_to_frame():
+    gate = FrameDiffGate(tile=32)
+    gate.update(_frame())
+    frame = _frame()
+    frame[5, 250] = 255 # 오른쪽 위 모서리 타일
+    # 템플릿 40x20 → 좌우 2타일, 상하 1타일 팽창 (프레임 밖 타일은 없음)
+    assert gate.update(frame, 40, 20) == [(160, 0, 96, 64)]
+
+
+def test_separate_changes_stay_separate():
+    gate = FrameDiffGate(tile=32)
+    gate.update(_frame())
+    frame = _frame()
+    frame[0, 0] = 255
+    frame[127, 255] = 255
+    assert sorted(gate.update(frame)) == [(0, 0, 32, 32), (224, 96, 32, 32)]
+
+
+def test_tolerance_ignores_small_differences():
+    gate = FrameDiffGate(tile=32, tolerance=3)
+    gate.update(_frame())
+    frame = _frame()
+    frame[10, 10] = 3
+    assert gate.update(frame) == []
+    frame[10, 10] = 4
+    assert gate.update(frame) == [(0, 0, 32, 32)]
+
+
+def test_reset_forces_full_match():
+    gate = FrameDiffGate(tile=32)
+    gate.update(_frame())
+    gate.reset()
+    assert gate.update(_frame()) is None
+
+
+def test_edge_tile_is_clipped_to_frame():
+    gate = FrameDiffGate(tile=32)
+    frame = np.zeros((100, 70), np.uint8)
+    gate.update(frame)
+    frame = frame.copy()
+    frame[99, 69] = 1
+    assert gate.update(frame) == [(64, 96, 6, 4)]
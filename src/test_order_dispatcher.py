@@ -0,0 +1,78 @@
+import threading
+
+import cv2
+import numpy as np
+
+from order_dispatcher import OrderDispatcher, StubSender
+from detection_engine import DetectionEngine, TemplateSpec
+
+
+class _BlockingSender(StubSender):
+    """release될 때까지 첫 전송을 붙잡아 두는 백엔드 (전송 중 중복 확인용)"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, *keys):
+        self.started.set()
+        self.release.wait(2.0)
+        super().__call__(*keys)
+
+
+def test_duplicate_order_is_dropped_while_pending():
+    sender = _BlockingSender()
+    dispatcher = OrderDispatcher(sender)
+    try:
+        assert dispatcher.submit("1전략", "buy", ["f1"])
+        assert sender.started.wait(2.0)
+        # 전송 중인 주문과 같은 (전략, 템플릿)은 버리고, 다른 템플릿은 받음
+        assert not dispatcher.submit("1전략", "buy", ["f1"])
+        assert dispatcher.submit("1전략", "sell", ["f2"])
+        assert not dispatcher.submit("1전략", "sell", ["f2"])
+        sender.release.set()
+    finally:
+        dispatcher.close()
+    assert [keys for keys, _ in sender.sent] == [("f1",), ("f2",)]
+    stats = dispatcher.stats()
+    assert (stats["sent"], stats["deduped"]) == (2, 2)
+    # 전송이 끝나면 같은 주문을 다시 받음
+    dispatcher = OrderDispatcher(sender, threaded=False)
+    assert dispatcher.submit("1전략", "buy", ["f1"])
+    assert dispatcher.submit("1전략", "buy", ["f1"])
+    assert dispatcher.deduped == 0
+
+
+def test_empty_keys_are_rejected():
+    dispatcher = OrderDispatcher(StubSender(), threaded=False)
+    assert not dispatcher.submit("1전략", "buy", [])
+    assert dispatcher.sent == 0
+
+
+def test_send_failure_is_logged():
+    logs = []
+
+    def broken(*keys):
+        raise RuntimeError("no window")
+
+    dispatcher = OrderDispatcher(broken, log=logs.append, threaded=False)
+    dispatcher.submit("1전략", "buy", ["f1"])
+    assert dispatcher.sent == 0
+    assert logs[0]["result"] == "전송 실패" and logs[0]["note"] == "no window"
+
+
+def test_engine_cooldown_limits_fires(tmp_path):
+    # 쿨다운은 감지 엔진이 템플릿별로 적용 (디스패처는 중복만 거름)
+    rng = np.random.default_rng(0)
+    screen = rng.integers(0, 256, (80, 120, 3), dtype=np.uint8)
+    path = str(tmp_path / "buy.png")
+    cv2.imwrite(path, screen[20:44, 30:70])
+    engine = DetectionEngine([TemplateSpec("buy", path, ["f1"], scales=(1.0,))], cooldown=1.0)
+    try:
+        fires = [engine.process(screen, now=t)[0]["fire"] for t in (100.0, 100.5, 101.0, 101.2, 102.5)]
+    finally:
+        engine.close()
+    # 100.0 발사 → 101.0까지는 차단(경계 포함) → 101.2 발사 → 102.5 발사
+    assert fires == [True, False, False, True, True]
+    assert engine.last_trigger["buy"] == 102.5
@@ -0,0 +1,41 @@
+import pytest
+
+from rate_controller import RateController
+
+
+def test_waits_for_rest_of_interval():
+    rate = RateController(interval=0.2, max_duty=None)
+    assert rate.next_delay(0.05) == pytest.approx(0.15)
+    assert rate.next_delay(0.5) == 0.0
+
+
+def test_idle_frames_back_off_up_to_max():
+    rate = RateController(interval=0.2, max_interval=1.0, idle_backoff=2.0, max_duty=None)
+    delays = [rate.next_delay(0.0, changed=False) for _ in range(4)]
+    assert delays == pytest.approx([0.4, 0.8, 1.0, 1.0])
+    # 변화가 생기면 평상시 간격으로 복귀
+    assert rate.next_delay(0.0, changed=True) == pytest.approx(0.2)
+
+
+def test_near_threshold_tightens_interval():
+    rate = RateController(interval=0.2, min_interval=0.02, max_duty=None)
+    rate.next_delay(0.0, changed=False)
+    assert rate.next_delay(0.0, near=True) == pytest.approx(0.02)
+
+
+def test_duty_limit_keeps_rest_time():
+    rate = RateController(interval=0.2, max_duty=0.8)
+    # 처리 0.4초 → 0.4 * 0.2 / 0.8 = 0.1초는 쉼
+    assert rate.next_delay(0.4) == pytest.approx(0.1)
+
+
+def test_zero_interval_never_waits():
+    rate = RateController(interval=0)
+    assert rate.next_delay(0.0, changed=False) == 0.0
+
+
+def test_error_wait_doubles_and_resets():
+    rate = RateController(error_delay=1.0, max_error_delay=8.0)
+    assert [rate.error_wait() for _ in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+    rate.next_delay(0.0)
+    assert rate.error_wait() == 1.0
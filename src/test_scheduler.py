@@ -0,0 +1,69 @@
+import datetime
+import threading
+import time
+
+from scheduler import Scheduler, parse_clock, next_wall_time
+
+
+def test_parse_clock():
+    assert parse_clock("0930") == datetime.time(9, 30)
+    assert parse_clock(" 153005 ") == datetime.time(15, 30, 5)
+    for bad in ("", None, "930", "09300", "2400", "1260", "120060", "12:30"):
+        assert parse_clock(bad) is None
+
+
+def test_next_wall_time_rolls_to_tomorrow():
+    now = datetime.datetime(2026, 1, 5, 10, 0, 0)
+    assert next_wall_time(datetime.time(11, 0), now) == datetime.datetime(2026, 1, 5, 11, 0).timestamp()
+    assert next_wall_time(datetime.time(10, 0), now) == datetime.datetime(2026, 1, 6, 10, 0).timestamp()
+    assert next_wall_time(datetime.time(9, 0), now) == datetime.datetime(2026, 1, 6, 9, 0).timestamp()
+
+
+def _clock_in(seconds):
+    return (datetime.datetime.now() + datetime.timedelta(seconds=seconds)).time()
+
+
+def test_jobs_fire_in_time_order():
+    fired = []
+    done = threading.Event()
+    sched = Scheduler()
+    try:
+        # 등록 순서와 반대로 실행 시각이 빠른 작업부터 실행
+        sched.set_job("late", _clock_in(0.4), lambda: (fired.append("late"), done.set()))
+        sched.set_job("early", _clock_in(0.2), lambda: fired.append("early"))
+        assert done.wait(3.0)
+    finally:
+        sched.stop()
+    assert fired == ["early", "late"]
+    assert abs(sched.last_jitter["early"]) < 100
+
+
+def test_replaced_and_removed_jobs_do_not_fire():
+    fired = []
+    done = threading.Event()
+    sched = Scheduler()
+    try:
+        sched.set_job("a", _clock_in(0.2), lambda: fired.append("old"))
+        sched.set_job("a", _clock_in(0.3), lambda: fired.append("new"))
+        sched.set_job("b", _clock_in(0.2), lambda: fired.append("removed"))
+        sched.remove("b")
+        sched.set_job("end", _clock_in(0.5), done.set)
+        assert done.wait(3.0)
+    finally:
+        sched.stop()
+    assert fired == ["new"]
+
+
+def test_fired_job_is_rescheduled_for_next_day():
+    done = threading.Event()
+    sched = Scheduler()
+    try:
+        sched.set_job("a", _clock_in(0.2), done.set)
+        assert done.wait(3.0)
+        time.sleep(0.05) # 재등록은 콜백 직후
+        with sched._cond:
+            entries = [e for e in sched._heap if sched._current(e)]
+    finally:
+        sched.stop()
+    assert len(entries) == 1
+    assert 86000 < entries[0][1] - time.time() < 86400
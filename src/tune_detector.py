@@ -0,0 +1,235 @@
+"""
+tune_detector.py
+- 신호/비신호로 나눈 프레임 폴더로 threshold, scales, 템플릿 크기를 자동 추천하는 도구
+- 프레임 x 스케일 격자마다 matchTemplate 점수 맵을 한 번만 계산해 최고 점수와 소요 시간만 남기고,
+  결과는 폴더 안 캐시 파일(.tune_cache_*.npz)에 저장해 다음 실행에서 재사용 (새로 추가된 프레임만 계산)
+- 스케일 조합(최대 --max-scales개) x threshold 격자를 numpy 브로드캐스트로 한 번에 평가해
+  목표 precision/recall을 만족하는 조합 중 프레임당 비용이 가장 낮은 설정을 추천
+  (비용 = 색변환 + 조합에 든 스케일들의 matchTemplate 시간 합, 즉 신호가 없는 프레임에서 감지기가 쓰는 시간)
+- --crops로 템플릿 가운데를 잘라 낸 작은 템플릿(원본 대비 비율)도 같은 격자로 평가
+  (작은 템플릿은 매칭이 빠르지만 구별력이 떨어질 수 있음). --save-template으로 추천 크기의 템플릿을 저장
+- 폴더 구조:
+    frames/signal/*.png     신호가 있는 프레임
+    frames/nosignal/*.png   신호가 없는 프레임
+- Usage:
+    python tune_detector.py frames --template buy_signal.png --precision 1.0 --recall 0.95
+    python tune_detector.py frames --template buy_signal.png --grayscale --scales 0.8,0.9,1.0,1.1,1.2 --out tune.json
+    python tune_detector.py frames --template buy_signal.png --crops 1.0,0.75,0.5 --save-template buy_signal_small.png
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import to_bgr
+from matcher import match_exhaustive
+from template_cache import TemplateCache
+
+LABEL_DIRS = {"signal": True, "nosignal": False, "no_signal": False}
+
+
+def list_frames(root):
+    """[(경로, 신호 여부), ...]"""
+    frames = []
+    for sub, label in LABEL_DIRS.items():
+        for path in sorted(glob.glob(os.path.join(root, sub, "*.png"))):
+            frames.append((path, label))
+    return frames
+
+
+def crop_rect(w, h, crop):
+    """(w, h) 템플릿의 가운데 crop 비율 영역 (x, y, w, h)"""
+    cw, ch = max(1, round(w * crop)), max(1, round(h * crop))
+    return (w - cw) // 2, (h - ch) // 2, cw, ch
+
+
+def crop_variant(tpl, crop):
+    """스케일 변형 템플릿의 가운데 crop 비율만 남김. 너무 작아지면 None"""
+    if tpl is None or crop >= 1.0:
+        return tpl
+    x, y, cw, ch = crop_rect(tpl.shape[1], tpl.shape[0], crop)
+    if cw < TemplateCache.MIN_SIZE or ch < TemplateCache.MIN_SIZE:
+        return None
+    return tpl[y:y + ch, x:x + cw]
+
+
+def score_grid(frames, cache, scales, gray, cache_path=None, crop=1.0):
+    """프레임 x 스케일 최고 점수 행렬과 matchTemplate 소요 시간(ms) 행렬, 색변환 시간(ms) 배열
+
+    crop<1이면 템플릿 가운데 crop 비율만 잘라 매칭
+    cache_path가 있으면 (경로, mtime)이 같은 프레임의 결과를 재사용
+    """
+    known = {}
+    if cache_path and os.path.exists(cache_path):
+        data = np.load(cache_path, allow_pickle=False)
+        if data["digest"].item() == cache.digest and np.array_equal(data["scales"], scales):
+            for i, (name, mtime) in enumerate(zip(data["names"], data["mtimes"])):
+                known[(str(name), int(mtime))] = (data["scores"][i], data["costs"][i], data["convert"][i])
+
+    n, k = len(frames), len(scales)
+    scores = np.full((n, k), -1.0)
+    costs = np.zeros((n, k))
+    convert = np.zeros(n)
+    names, mtimes = [], []
+    variants = [crop_variant(cache.get(s, gray), crop) for s in scales]
+    computed = 0
+    for i, (path, _) in enumerate(frames):
+        key = (os.path.relpath(path, os.path.dirname(os.path.dirname(path))), os.stat(path).st_mtime_ns)
+        names.append(key[0])
+        mtimes.append(key[1])
+        if key in known:
+            scores[i], costs[i], convert[i] = known[key]
+            continue
+        frame = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if frame is None:
+            continue
+        t0 = time.perf_counter()
+        screen = to_bgr(frame)
+        if gray:
+            screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        convert[i] = (time.perf_counter() - t0) * 1000.0
+        for j, tpl in enumerate(variants):
+            if tpl is None:
+                continue # 너무 작은 스케일
+            t0 = time.perf_counter()
+            scores[i, j] = match_exhaustive(screen, tpl)[0]
+            costs[i, j] = (time.perf_counter() - t0) * 1000.0
+        computed += 1
+
+    if cache_path and computed:
+        np.savez(cache_path, digest=np.array(cache.digest), scales=np.asarray(scales), names=np.array(names),
+                 mtimes=np.array(mtimes, np.int64), scores=scores, costs=costs, convert=convert)
+    return scores, costs, convert, computed
+
+
+def sweep(frame_scores, labels, thresholds):
+    """threshold 격자 전체의 (precision, recall) 배열 - 프레임 x threshold 비교를 한 번에 계산"""
+    pred = frame_scores[:, None] >= thresholds[None, :]
+    tp = (pred & labels[:, None]).sum(0)
+    fp = (pred & ~labels[:, None]).sum(0)
+    positives = max(1, int(labels.sum()))
+    precision = np.where(tp + fp > 0, tp / np.maximum(tp + fp, 1), 1.0)
+    recall = tp / positives
+    return precision, recall
+
+
+def evaluate(scores, costs, convert, labels, scales, thresholds, target_precision, target_recall, max_scales):
+    """스케일 조합별 평가 결과 목록 (비용 오름차순)"""
+    cost_per_scale = np.median(costs, axis=0)
+    base_cost = float(np.median(convert))
+    out = []
+    usable = [j for j in range(len(scales)) if (scores[:, j] > -1.0).any()]
+    for size in range(1, max_scales + 1):
+        for combo in itertools.combinations(usable, size):
+            frame_scores = scores[:, combo].max(axis=1)
+            precision, recall = sweep(frame_scores, labels, thresholds)
+            ok = (precision >= target_precision) & (recall >= target_recall)
+            entry = {"scales": [scales[j] for j in combo],
+                     "cost_ms": base_cost + float(cost_per_scale[list(combo)].sum()),
+                     "feasible": bool(ok.any())}
+            if ok.any():
+                # 조건을 만족하는 threshold 구간의 가운데 값 (양쪽 여유가 가장 큼)
+                idx = np.nonzero(ok)[0]
+                mid = idx[len(idx) // 2]
+                entry.update(threshold=float(thresholds[mid]), threshold_range=[float(thresholds[idx[0]]), float(thresholds[idx[-1]])],
+                             precision=float(precision[mid]), recall=float(recall[mid]))
+            else:
+                # 만족하지 못하면 F1이 가장 높은 지점을 참고용으로 기록
+                f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-9)
+                best = int(np.argmax(f1))
+                entry.update(threshold=float(thresholds[best]), precision=float(precision[best]), recall=float(recall[best]))
+            # 신호/비신호 점수 간격 (클수록 threshold 선택이 안전)
+            pos, neg = frame_scores[labels], frame_scores[~labels]
+            entry["margin"] = float(pos.min() - neg.max()) if len(pos) and len(neg) else None
+            out.append(entry)
+    out.sort(key=lambda e: (not e["feasible"], e["cost_ms"], len(e["scales"])))
+    return out
+
+
+def parse_list(text, conv):
+    return [conv(v) for v in text.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("frames", help="signal/, nosignal/ 하위 폴더가 있는 프레임 폴더")
+    parser.add_argument("--template", default="buy_signal.png")
+    parser.add_argument("--scales", default="0.7,0.8,0.9,1.0,1.1,1.2,1.3", help="평가할 스케일 격자")
+    parser.add_argument("--max-scales", type=int, default=3, help="추천 조합에 넣을 최대 스케일 수")
+    parser.add_argument("--grayscale", action="store_true", help="그레이스케일 매칭도 함께 평가")
+    parser.add_argument("--crops", default="1.0", help="평가할 템플릿 크기 (원본 대비 가운데 자르기 비율 목록, 예: 1.0,0.75,0.5)")
+    parser.add_argument("--save-template", default=None, help="추천된 크기로 자른 템플릿을 저장할 경로")
+    parser.add_argument("--precision", type=float, default=1.0, help="목표 precision")
+    parser.add_argument("--recall", type=float, default=0.95, help="목표 recall")
+    parser.add_argument("--thresholds", default="0.7:0.995:0.005", help="threshold 격자 start:stop:step (너무 낮은 threshold는 실화면에서 오탐 위험)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 후보 수")
+    parser.add_argument("--no-cache", action="store_true", help="점수 캐시를 읽거나 쓰지 않음")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (없으면 stdout)")
+    args = parser.parse_args()
+
+    frames = list_frames(args.frames)
+    if not frames:
+        sys.exit(f"프레임 없음: {args.frames}/signal, {args.frames}/nosignal")
+    labels = np.array([label for _, label in frames])
+    cache = TemplateCache(args.template)
+    if cache.template is None:
+        sys.exit(f"이미지 로드 실패: {args.template}")
+    scales = parse_list(args.scales, float)
+    crops = parse_list(args.crops, float)
+    tpl_h, tpl_w = cache.template.shape[:2]
+    start, stop, step = (float(v) for v in args.thresholds.split(":"))
+    thresholds = np.arange(start, stop + step / 2, step)
+
+    candidates = []
+    for gray, crop in itertools.product([False, True] if args.grayscale else [False], crops):
+        tag = f"{'gray' if gray else 'bgr'}" + (f"_crop{crop:g}" if crop < 1.0 else "")
+        cache_path = None if args.no_cache else os.path.join(args.frames, f".tune_cache_{cache.digest[:12]}_{tag}.npz")
+        t0 = time.perf_counter()
+        scores, costs, convert, computed = score_grid(frames, cache, scales, gray, cache_path, crop)
+        print(f"[tune] {tag}: {len(frames)} frames x {len(scales)} scales "
+              f"({computed} computed, {len(frames) - computed} cached) in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+        for e in evaluate(scores, costs, convert, labels, scales, thresholds, args.precision, args.recall, args.max_scales):
+            e["grayscale"] = gray
+            e["crop"] = crop
+            e["template_rect"] = list(crop_rect(tpl_w, tpl_h, crop)) # 원본 템플릿 기준 (x, y, w, h)
+            candidates.append(e)
+    candidates.sort(key=lambda e: (not e["feasible"], e["cost_ms"], len(e["scales"])))
+
+    best = candidates[0] if candidates and candidates[0]["feasible"] else None
+    for e in candidates[:args.top]:
+        print(f"[tune] {'OK ' if e['feasible'] else '-- '} scales={e['scales']} gray={e['grayscale']} "
+              f"size={e['template_rect'][2]}x{e['template_rect'][3]} "
+              f"th={e['threshold']:.3f} P={e['precision']:.3f} R={e['recall']:.3f} cost={e['cost_ms']:.2f}ms "
+              f"margin={e['margin']}", file=sys.stderr)
+    if best is None:
+        print("[tune] 목표 precision/recall을 만족하는 설정 없음 (--max-scales, --scales 격자를 넓혀 보세요)", file=sys.stderr)
+    elif args.save_template:
+        x, y, w, h = best["template_rect"]
+        cv2.imwrite(args.save_template, cache.template[y:y + h, x:x + w])
+        print(f"[tune] 템플릿 저장: {args.save_template} ({w}x{h})", file=sys.stderr)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "template": args.template,
+        "frames": len(frames),
+        "signals": int(labels.sum()),
+        "target": {"precision": args.precision, "recall": args.recall},
+        "recommended": best,
+        "candidates": candidates[:args.top],
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()